@@ -0,0 +1,277 @@
+"""
+ADF Converter - Iterative conversion of Atlassian Document Format to plain text or Markdown.
+"""
+from typing import Optional, Any, Iterator, NamedTuple, Tuple
+from collections import OrderedDict
+from datetime import datetime, timezone
+import threading
+
+
+# Converted descriptions/comments remembered by (issue key, updated, ...)
+MEMO_SIZE = 4096
+
+
+class _Context(NamedTuple):
+    """How blocks are laid out at one nesting level."""
+    prefix: str       # Written at the start of every block line (indentation, '> ')
+    block_end: str    # Written after every block ('\n\n' top level, '\n' in lists, ' ' in table cells)
+    code: bool        # Inside a code block: text is written verbatim
+
+
+_ROOT = _Context('', '\n\n', False)
+
+
+class _Output:
+    """Collects output pieces up to an optional character budget."""
+
+    def __init__(self, max_chars: Optional[int]):
+        self.parts = []
+        self.length = 0
+        self.max_chars = max_chars
+        self.full = False
+
+    def write(self, text: str):
+        if not text or self.full:
+            return
+        if self.max_chars is not None and self.length + len(text) > self.max_chars:
+            text = text[:max(self.max_chars - self.length - 1, 0)] + '…'
+            self.full = True
+        self.parts.append(text)
+        self.length += len(text)
+
+
+def _marked(text: str, marks: Any) -> str:
+    """Apply ADF text marks as Markdown."""
+    link = None
+    for mark in marks or []:
+        mark_type = mark.get('type') if isinstance(mark, dict) else None
+        if mark_type == 'code':
+            text = f"`{text}`"
+        elif mark_type == 'strong':
+            text = f"**{text}**"
+        elif mark_type == 'em':
+            text = f"*{text}*"
+        elif mark_type == 'strike':
+            text = f"~~{text}~~"
+        elif mark_type == 'link':
+            link = (mark.get('attrs') or {}).get('href')
+    return f"[{text}]({link})" if link else text
+
+
+def _date_text(timestamp: Any) -> str:
+    """ADF date nodes carry a millisecond epoch timestamp."""
+    try:
+        return datetime.fromtimestamp(int(timestamp) / 1000, tz=timezone.utc).strftime('%Y-%m-%d')
+    except (TypeError, ValueError, OverflowError):
+        return str(timestamp or '')
+
+
+def _with_context(children: list, ctx: _Context) -> Iterator[Tuple[Any, _Context]]:
+    return ((child, ctx) for child in children)
+
+
+def _list_items(node_type: str, items: list, start: Optional[int],
+                ctx: _Context) -> Iterator[Tuple[Any, _Context]]:
+    """Marker strings and item blocks of a list, with list-item indentation."""
+    for index, list_item in enumerate(items):
+        if not isinstance(list_item, dict):
+            yield list_item, ctx
+            continue
+        if start is not None:
+            marker = f"{start + index}. "
+        elif node_type == 'taskList':
+            marker = '- [x] ' if (list_item.get('attrs') or {}).get('state') == 'DONE' else '- [ ] '
+        else:
+            marker = '- '
+        item_ctx = _Context(ctx.prefix + ' ' * len(marker), '\n', ctx.code)
+        content = list_item.get('content') or []
+        yield ctx.prefix + marker, ctx
+        if list_item.get('type') in ('taskItem', 'decisionItem'):
+            # Task and decision items hold inline content directly
+            yield content, item_ctx
+            yield '\n', ctx
+        elif content:
+            # The first block continues the marker line, later blocks are indented
+            yield content[0], item_ctx._replace(prefix='')
+            for block in content[1:]:
+                yield block, item_ctx
+
+
+def _convert(content: Any, markdown: bool, max_chars: Optional[int]) -> str:
+    """
+    Walk an ADF tree with an explicit stack, writing text as it goes.
+
+    Stack entries are (item, context); an item is a node, a list of nodes, a
+    literal string queued to be written after a node's children, or an
+    iterator of (child, context) pairs that is advanced one child at a time.
+    Children are never copied or reversed up front, and the walk stops as soon
+    as the budget is reached, so the rest of a huge document is never visited.
+    """
+    out = _Output(max_chars)
+    stack = [(content, _ROOT)]
+
+    while stack and not out.full:
+        item, ctx = stack.pop()
+        if item is None:
+            continue
+        if isinstance(item, str):
+            out.write(item)
+            continue
+        if isinstance(item, list):
+            stack.append((_with_context(item, ctx), ctx))
+            continue
+        if isinstance(item, Iterator):
+            pair = next(item, None)
+            if pair is not None:
+                stack.append((item, ctx))
+                stack.append(pair)
+            continue
+        if not isinstance(item, dict):
+            out.write(str(item))
+            continue
+
+        node_type = item.get('type')
+        attrs = item.get('attrs') or {}
+        children = item.get('content') or []
+        before = ''
+        after = ''
+        child_ctx = ctx
+
+        if node_type == 'text':
+            text = item.get('text', '')
+            out.write(_marked(text, item.get('marks')) if markdown and not ctx.code else text)
+            continue
+        elif node_type == 'hardBreak':
+            out.write(' ' if ctx.block_end == ' ' else '\n' + ctx.prefix)
+            continue
+        elif node_type == 'mention':
+            out.write(attrs.get('text') or f"@{attrs.get('id', 'user')}")
+            continue
+        elif node_type == 'emoji':
+            out.write(attrs.get('text') or attrs.get('shortName', ''))
+            continue
+        elif node_type in ('inlineCard', 'blockCard', 'embedCard'):
+            url = attrs.get('url', '')
+            out.write(f"<{url}>" if markdown and url else url)
+            if node_type != 'inlineCard':
+                out.write(ctx.block_end)
+            continue
+        elif node_type == 'date':
+            out.write(_date_text(attrs.get('timestamp')))
+            continue
+        elif node_type == 'status':
+            text = attrs.get('text', '')
+            out.write(f"[{text}]" if markdown else text)
+            continue
+        elif node_type == 'rule':
+            out.write(ctx.prefix + '---' + ctx.block_end if markdown else ctx.block_end)
+            continue
+        elif node_type in ('media', 'mediaInline'):
+            out.write('[attachment]')
+            continue
+        elif node_type == 'paragraph':
+            before = ctx.prefix if ctx.block_end != ' ' else ''
+            after = ctx.block_end
+        elif node_type == 'heading':
+            level = attrs.get('level', 1)
+            before = ctx.prefix + ('#' * level + ' ' if markdown else '')
+            after = ctx.block_end
+        elif node_type == 'codeBlock':
+            if markdown:
+                before = f"{ctx.prefix}```{attrs.get('language') or ''}\n"
+                after = f"\n{ctx.prefix}```{ctx.block_end}"
+            else:
+                before = ctx.prefix
+                after = ctx.block_end
+            child_ctx = ctx._replace(code=True)
+        elif node_type in ('blockquote', 'panel'):
+            child_ctx = ctx._replace(prefix=ctx.prefix + ('> ' if markdown else ''))
+        elif node_type in ('expand', 'nestedExpand'):
+            title = attrs.get('title')
+            if title:
+                before = ctx.prefix + (f"**{title}**" if markdown else title) + ctx.block_end
+        elif node_type in ('bulletList', 'orderedList', 'taskList', 'decisionList'):
+            start = attrs.get('order', 1) if node_type == 'orderedList' else None
+            stack.append(('\n' if ctx.block_end == '\n\n' else '', ctx))
+            stack.append((_list_items(node_type, children, start, ctx), ctx))
+            continue
+        elif node_type == 'table':
+            after = '\n' if ctx.block_end == '\n\n' else ''
+        elif node_type == 'tableRow':
+            cells = [cell for cell in children if isinstance(cell, dict)]
+            before = ctx.prefix + '|'
+            after = '\n'
+            if markdown and cells and all(cell.get('type') == 'tableHeader' for cell in cells):
+                after += ctx.prefix + '|' + ' --- |' * len(cells) + '\n'
+        elif node_type in ('tableCell', 'tableHeader'):
+            before = ' '
+            after = '|'
+            child_ctx = _Context('', ' ', ctx.code)
+        elif 'text' in item and not children:
+            out.write(str(item.get('text') or ''))
+            continue
+
+        out.write(before)
+        stack.append((after, ctx))
+        stack.append((_with_context(children, child_ctx), child_ctx))
+
+    return ''.join(out.parts).strip()
+
+
+_memo: "OrderedDict[Tuple, str]" = OrderedDict()
+_memo_lock = threading.Lock()
+
+
+def _cached_convert(content: Any, markdown: bool, max_chars: Optional[int],
+                    cache_key: Optional[Tuple]) -> str:
+    if not content:
+        return ""
+    if isinstance(content, str):
+        return content if max_chars is None or len(content) <= max_chars else content[:max_chars - 1] + '…'
+    if cache_key is None or not all(cache_key):
+        # Without a complete key (e.g. no `updated` timestamp) a stale memo entry could be served
+        return _convert(content, markdown, max_chars)
+    memo_key = cache_key + (markdown, max_chars)
+    with _memo_lock:
+        text = _memo.get(memo_key)
+        if text is not None:
+            _memo.move_to_end(memo_key)
+            return text
+    text = _convert(content, markdown, max_chars)
+    with _memo_lock:
+        _memo[memo_key] = text
+        if len(_memo) > MEMO_SIZE:
+            _memo.popitem(last=False)
+    return text
+
+
+def adf_to_text(content: Any, max_chars: Optional[int] = None, cache_key: Optional[Tuple] = None) -> str:
+    """
+    Convert Jira rich text (an ADF document, a node list or a plain string) to plain text.
+
+    Args:
+        content: ADF content
+        max_chars: Stop converting once this many characters are produced
+        cache_key: Identifies this exact content, e.g. (issue key, updated) or
+            (issue key, comment id, updated); repeated conversions are served from a memo
+
+    Returns:
+        Plain text with one line per block and '- '/'1. ' list markers
+    """
+    return _cached_convert(content, False, max_chars, cache_key)
+
+
+def adf_to_markdown(content: Any, max_chars: Optional[int] = None, cache_key: Optional[Tuple] = None) -> str:
+    """
+    Convert Jira rich text to Markdown (headings, lists, code blocks, tables, links, marks).
+
+    Args:
+        content: ADF content
+        max_chars: Stop converting once this many characters are produced
+        cache_key: Identifies this exact content (see adf_to_text)
+
+    Returns:
+        Markdown text
+    """
+    return _cached_convert(content, True, max_chars, cache_key)
+
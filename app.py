@@ -8,11 +8,14 @@ from helios_chat import HeliosChat
 from jira_client import JiraClient
 from google_docs_reader import GoogleDocsReader
 from llm_service import LLMService
+from llm_cache import LLMCache
+from issue_store import IssueStore
+from rate_limiter import configure_rate_limiters, rate_limiter_stats
 from config import load_config
 import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 
 # Page configuration
@@ -32,12 +35,21 @@ if 'current_context' not in st.session_state:
     st.session_state.current_context = None
 
 
+@st.cache_resource
+def get_llm_cache(db_path: Optional[str], max_disk_bytes: int) -> LLMCache:
+    """LLM response cache shared by every session in the process, so its size bounds hold across sessions."""
+    return LLMCache(db_path=db_path, max_disk_bytes=max_disk_bytes)
+
+
 def initialize_helios():
     """Initialize Helios chat engine."""
     if st.session_state.helios_chat is None:
         try:
             config = load_config()
             
+            # Per-provider token buckets shared by every client in this process
+            limiters = configure_rate_limiters(config.get('rate_limits', {}))
+            
             # Initialize Jira client
             jira_config = config.get('jira', {})
             base_url = jira_config.get('base_url', '')
@@ -61,14 +73,19 @@ def initialize_helios():
             jira_client = JiraClient(
                 base_url=jira_config['base_url'],
                 email=jira_config['email'],
-                api_token=jira_config['api_token']
+                api_token=jira_config['api_token'],
+                pool_size=jira_config.get('pool_size', 10),
+                max_retries=jira_config.get('max_retries', 3),
+                rate_limiter=limiters.get('jira'),
+                cache_bytes=jira_config.get('cache_bytes', 32 * 1024 * 1024)
             )
             
             # Initialize Google Docs reader
             drive_config = config.get('google_drive', {})
             docs_reader = GoogleDocsReader(
                 credentials_file=drive_config.get('credentials_file', 'credentials.json'),
-                token_file=drive_config.get('token_file', 'token.pickle')
+                token_file=drive_config.get('token_file', 'token.pickle'),
+                rate_limiter=limiters.get('google_drive')
             )
             
             # Initialize LLM service with Gemini 2.0
@@ -77,11 +94,22 @@ def initialize_helios():
                 st.warning("LLM not configured. Some features may be limited. Set GEMINI_API_KEY for Gemini 2.0.")
                 llm_service = None
             else:
+                # Repeated summaries and extractions are served from the response cache
+                cache_config = config.get('llm_cache', {})
+                llm_cache = None
+                if cache_config.get('max_disk_bytes', 64 * 1024 * 1024):
+                    llm_cache = get_llm_cache(
+                        cache_config.get('path') or None,
+                        cache_config.get('max_disk_bytes', 64 * 1024 * 1024)
+                    )
+                
                 # Use Gemini 2.0 (gemini-2.0-flash) as default
                 llm_service = LLMService(
                     provider=llm_config.get('provider', 'gemini'),
                     api_key=llm_config.get('api_key'),
-                    model=llm_config.get('model', 'gemini-2.0-flash')  # Gemini 2.0
+                    model=llm_config.get('model', 'gemini-2.0-flash'),  # Gemini 2.0
+                    rate_limiter=limiters.get('llm'),
+                    cache=llm_cache
                 )
                 st.success(f"✅ Using {llm_service.model} (Gemini 2.0) for AI-powered responses and summarization")
             
@@ -96,7 +124,16 @@ def initialize_helios():
                 llm_service = DummyLLM()
                 st.warning("LLM not configured. Responses will be basic summaries without AI enhancement.")
             
-            st.session_state.helios_chat = HeliosChat(jira_client, docs_reader, llm_service)
+            # Local issue store so repeat queries only pull Jira deltas
+            store_config = config.get('issue_store', {})
+            issue_store = None
+            if store_config.get('path'):
+                issue_store = IssueStore(
+                    db_path=store_config['path'],
+                    sweep_interval=store_config.get('sweep_interval', 3600)
+                )
+            
+            st.session_state.helios_chat = HeliosChat(jira_client, docs_reader, llm_service, issue_store)
             return True
         except Exception as e:
             st.error(f"Failed to initialize Helios: {str(e)}")
@@ -149,45 +186,52 @@ def create_charts(charts_data: Dict[str, Any]):
             fig.update_xaxes(tickangle=-45)
             st.plotly_chart(fig, use_container_width=True)
     
+    # Flow charts: weekly throughput and WIP over time
+    if charts_data.get('weekly_throughput'):
+        st.subheader("🚚 Weekly Throughput")
+        throughput = charts_data['weekly_throughput']
+        fig = px.bar(
+            x=list(throughput.keys()),
+            y=list(throughput.values()),
+            title="Issues Completed per Week",
+            labels={'x': 'Week', 'y': 'Completed'}
+        )
+        st.plotly_chart(fig, use_container_width=True)
+    
+    if charts_data.get('wip_over_time'):
+        st.subheader("📉 Work in Progress")
+        wip = charts_data['wip_over_time']
+        fig = px.line(
+            x=list(wip.keys()),
+            y=list(wip.values()),
+            title="Issues in Progress per Day",
+            labels={'x': 'Date', 'y': 'In Progress'}
+        )
+        st.plotly_chart(fig, use_container_width=True)
+    
     # Chart 4: Issues by Assignee and Status (Heatmap)
     if 'by_assignee_and_status' in charts_data:
         st.subheader("🔥 Issues by Assignee and Status")
         assignee_status_data = charts_data['by_assignee_and_status']
-        if assignee_status_data:
-            # Prepare data for heatmap
-            assignees = []
-            statuses = []
-            counts = []
-            
-            for assignee, status_dict in assignee_status_data.items():
-                for status, count in status_dict.items():
-                    assignees.append(assignee)
-                    statuses.append(status)
-                    counts.append(count)
+        if isinstance(assignee_status_data, pd.DataFrame):
+            # Assignee x status crosstab from the issue frame, busiest assignees first
+            pivot = assignee_status_data
+        else:
+            pivot = pd.DataFrame.from_dict(assignee_status_data, orient='index').fillna(0).astype(int)
+        if not pivot.empty:
+            # Limit to top 10 assignees
+            if len(pivot) > 10:
+                pivot = pivot.head(10)
             
-            if assignees:
-                df = pd.DataFrame({
-                    'Assignee': assignees,
-                    'Status': statuses,
-                    'Count': counts
-                })
-                
-                # Create pivot table
-                pivot = df.pivot_table(values='Count', index='Assignee', columns='Status', fill_value=0)
-                
-                # Limit to top 10 assignees
-                if len(pivot) > 10:
-                    pivot = pivot.head(10)
-                
-                fig = px.imshow(
-                    pivot.values,
-                    labels=dict(x="Status", y="Assignee", color="Count"),
-                    x=pivot.columns,
-                    y=pivot.index,
-                    title="Issue Distribution: Assignee vs Status",
-                    color_continuous_scale='Viridis'
-                )
-                st.plotly_chart(fig, use_container_width=True)
+            fig = px.imshow(
+                pivot.values,
+                labels=dict(x="Status", y="Assignee", color="Count"),
+                x=pivot.columns,
+                y=pivot.index,
+                title="Issue Distribution: Assignee vs Status",
+                color_continuous_scale='Viridis'
+            )
+            st.plotly_chart(fig, use_container_width=True)
 
 
 def main():
@@ -227,6 +271,21 @@ def main():
                     jira_data = st.session_state.current_context.get('jira_data', {})
                     st.write(f"**Last Project:** {st.session_state.current_context.get('project_key', 'N/A')}")
                     st.write(f"**Last Total Issues:** {jira_data.get('total_issues', 0) if jira_data else 0}")
+                    fetch_stats = jira_data.get('fetch_stats') if jira_data else None
+                    if fetch_stats:
+                        sync_mode = fetch_stats['sync']['mode'] if fetch_stats.get('sync') else 'no store'
+                        st.write(f"**Last Fetch:** {len(fetch_stats['shards'])} shard(s), "
+                                 f"{fetch_stats['bytes_transferred'] / 1024:.0f} KB in {fetch_stats['seconds']}s "
+                                 f"({sync_mode} sync)")
+                llm_cache = getattr(st.session_state.helios_chat.llm, 'cache', None)
+                if llm_cache is not None:
+                    cache_stats = llm_cache.stats()
+                    st.write(f"**LLM cache:** {cache_stats['memory_hits']} memory / {cache_stats['disk_hits']} disk hits, "
+                             f"{cache_stats['misses']} misses")
+                for provider, stats in rate_limiter_stats().items():
+                    if stats['requests']:
+                        st.write(f"**{provider} rate limit:** {stats['waited_requests']}/{stats['requests']} "
+                                 f"requests waited, max {stats['max_wait_seconds']}s")
         
         st.markdown("---")
         st.markdown("### 📝 Instructions")
@@ -271,9 +330,17 @@ def main():
             'response': 'Processing...'
         })
         
+        with st.chat_message("user"):
+            st.write(user_query)
+        
         with st.spinner("🔍 Analyzing project and fetching data..."):
             try:
-                result = st.session_state.helios_chat.process_query(user_query)
+                result = st.session_state.helios_chat.process_query(user_query, stream=True)
+                
+                # LLM answers are shown token by token as they are generated
+                if 'response_stream' in result:
+                    with st.chat_message("assistant"):
+                        st.write_stream(result.pop('response_stream'))
                 
                 # Debug: Check what we got
                 jira_data = result.get('jira_data', {})
@@ -291,13 +358,14 @@ def main():
                         # Show debug info
                         with st.expander("🐛 Debug Info", expanded=True):
                             st.write("**Raw Result Data:**")
+                            type_counts = jira_data.get('metrics', {}).get('type_counts', {}) if jira_data else {}
                             st.json({
                                 'project_key': result.get('project_key'),
                                 'jira_data_keys': list(jira_data.keys()) if jira_data else [],
                                 'total_issues': total_issues,
-                                'epics_count': len(jira_data.get('epics', [])) if jira_data else 0,
-                                'stories_count': len(jira_data.get('stories', [])) if jira_data else 0,
-                                'tasks_count': len(jira_data.get('tasks', [])) if jira_data else 0,
+                                'epics_count': type_counts.get('epics', 0),
+                                'stories_count': type_counts.get('stories', 0),
+                                'tasks_count': type_counts.get('tasks', 0),
                             })
                 
                 # Update conversation history
@@ -333,11 +401,12 @@ def main():
         if jira_data and jira_data.get('total_issues', 0) == 0:
             with st.expander("🐛 Debug Info", expanded=True):
                 st.write("**Raw Jira Data:**")
+                type_counts = jira_data.get('metrics', {}).get('type_counts', {})
                 st.json({
                     'total_issues': jira_data.get('total_issues'),
-                    'epics_count': len(jira_data.get('epics', [])),
-                    'stories_count': len(jira_data.get('stories', [])),
-                    'tasks_count': len(jira_data.get('tasks', [])),
+                    'epics_count': type_counts.get('epics', 0),
+                    'stories_count': type_counts.get('stories', 0),
+                    'tasks_count': type_counts.get('tasks', 0),
                     'metrics': jira_data.get('metrics', {})
                 })
                 st.warning("⚠️ If you see 0 issues here, there may be a data fetching issue. Try re-initializing Helios.")
@@ -355,6 +424,32 @@ def main():
                     st.markdown(f"*Last modified: {note.get('modified_time', 'Unknown')}*")
                     st.markdown(note.get('content', '')[:500] + "...")
                     st.markdown("---")
+                
+                # Turn a note's action items into Jira tickets (re-running reuses created tickets)
+                llm = st.session_state.helios_chat.llm
+                if getattr(llm, 'provider', 'dummy') != "dummy":
+                    notes = context['meeting_notes'][:5]
+                    selected = st.selectbox("Create tickets from:", range(len(notes)),
+                                            format_func=lambda i: notes[i].get('name', 'Untitled'))
+                    if st.button("🎫 Create Jira tickets from action items"):
+                        progress = st.progress(0.0, text="Extracting action items...")
+                        
+                        def report(done, total, message):
+                            progress.progress(done / total if total else 1.0, text=message)
+                        
+                        try:
+                            result = st.session_state.helios_chat.create_tickets_from_notes(
+                                context['project_key'], notes[selected], progress_callback=report
+                            )
+                            progress.progress(1.0, text="Done")
+                            st.success(f"✅ Created {len(result['created'])} ticket(s), "
+                                       f"{len(result['existing'])} already existed")
+                            for ticket in result['created'] + result['existing']:
+                                st.markdown(f"- **{ticket['key']}**: {ticket['summary']}")
+                            for error in result['errors']:
+                                st.error(f"{error['summary']}: {error['error']}")
+                        except Exception as e:
+                            st.error(f"Ticket creation failed: {str(e)}")
         
         # Charts
         if context.get('charts_data'):
@@ -370,15 +465,16 @@ def main():
         if followup_query:
             with st.spinner("Thinking..."):
                 try:
-                    followup_answer = st.session_state.helios_chat.answer_followup(
-                        followup_query,
-                        context
-                    )
+                    with st.chat_message("assistant"):
+                        followup_answer = st.write_stream(st.session_state.helios_chat.answer_followup(
+                            followup_query,
+                            context,
+                            stream=True
+                        ))
                     st.session_state.conversation_history.append({
                         'query': followup_query,
                         'response': followup_answer
                     })
-                    st.info(followup_answer)
                     st.rerun()
                 except Exception as e:
                     st.error(f"Error processing follow-up: {str(e)}")
@@ -13,6 +13,15 @@ except ImportError:
     pass  # python-dotenv not installed, use environment variables only
 
 
+def _rate_limit(prefix: str, default_rate: str) -> Dict:
+    """Read a provider's token-bucket settings from <PREFIX>_RATE_LIMIT and <PREFIX>_RATE_BURST."""
+    burst = os.getenv(f'{prefix}_RATE_BURST')
+    return {
+        'rate': float(os.getenv(f'{prefix}_RATE_LIMIT', default_rate)),
+        'burst': float(burst) if burst else None
+    }
+
+
 def load_config() -> Dict:
     """
     Load configuration from environment variables.
@@ -21,22 +30,51 @@ def load_config() -> Dict:
     - JIRA_BASE_URL: Jira instance URL
     - JIRA_EMAIL: Jira email address
     - JIRA_API_TOKEN: Jira API token
+    - JIRA_POOL_SIZE: Keep-alive connections kept open to Jira (default: 10)
+    - JIRA_MAX_RETRIES: Retries for GET requests on 429/5xx responses (default: 3)
+    - JIRA_CACHE_MB: Memory for conditionally revalidated Jira GET responses (default: 32; 0 disables)
     - GOOGLE_DRIVE_CREDENTIALS_FILE: Path to OAuth2 credentials JSON
     - GOOGLE_DRIVE_TOKEN_FILE: Path to store authentication token
+    - HELIOS_ISSUE_STORE: SQLite file caching Jira issues between queries
+      (default: 'helios_issues.db'; set to an empty value to disable)
+    - HELIOS_SWEEP_INTERVAL: Seconds between deleted-issue sweeps of the store (default: 3600)
+    - HELIOS_LLM_CACHE: SQLite file caching LLM responses between runs
+      (default: 'helios_llm_cache.db'; set to an empty value for a memory-only cache)
+    - HELIOS_LLM_CACHE_MB: Disk bound of the LLM response cache (default: 64; 0 disables the cache)
     - GEMINI_API_KEY: Google Gemini API key for LLM features (Gemini 2.0)
     - OPENAI_API_KEY: OpenAI API key for LLM features (alternative)
     - LLM_PROVIDER: LLM provider ('gemini' default, or 'openai')
     - LLM_MODEL: LLM model name (default: 'gemini-2.0-flash' for Gemini 2.0, 'gpt-4o-mini' for OpenAI)
+    - JIRA_RATE_LIMIT / DRIVE_RATE_LIMIT / LLM_RATE_LIMIT: Requests per second shared by
+      all clients of that provider (defaults: 10, 10, 2; 0 disables limiting)
+    - JIRA_RATE_BURST / DRIVE_RATE_BURST / LLM_RATE_BURST: Burst size for each provider
+      (default: one second worth of requests)
     """
     config = {
         'jira': {
             'base_url': os.getenv('JIRA_BASE_URL', ''),
             'email': os.getenv('JIRA_EMAIL', ''),
-            'api_token': os.getenv('JIRA_API_TOKEN', '')
+            'api_token': os.getenv('JIRA_API_TOKEN', ''),
+            'pool_size': int(os.getenv('JIRA_POOL_SIZE', '10')),
+            'max_retries': int(os.getenv('JIRA_MAX_RETRIES', '3')),
+            'cache_bytes': int(float(os.getenv('JIRA_CACHE_MB', '32')) * 1024 * 1024)
         },
         'google_drive': {
             'credentials_file': os.getenv('GOOGLE_DRIVE_CREDENTIALS_FILE', 'credentials.json'),
             'token_file': os.getenv('GOOGLE_DRIVE_TOKEN_FILE', 'token.pickle')
+        },
+        'rate_limits': {
+            'jira': _rate_limit('JIRA', '10'),
+            'google_drive': _rate_limit('DRIVE', '10'),
+            'llm': _rate_limit('LLM', '2')
+        },
+        'issue_store': {
+            'path': os.getenv('HELIOS_ISSUE_STORE', 'helios_issues.db'),
+            'sweep_interval': float(os.getenv('HELIOS_SWEEP_INTERVAL', '3600'))
+        },
+        'llm_cache': {
+            'path': os.getenv('HELIOS_LLM_CACHE', 'helios_llm_cache.db'),
+            'max_disk_bytes': int(float(os.getenv('HELIOS_LLM_CACHE_MB', '64')) * 1024 * 1024)
         }
     }
     
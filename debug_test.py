@@ -79,9 +79,10 @@ jira_data = result.get('jira_data', {})
 print(f"Jira data keys: {jira_data.keys() if jira_data else 'None'}")
 if jira_data:
     print(f"Total Issues: {jira_data.get('total_issues', 'N/A')}")
-    print(f"Epics: {len(jira_data.get('epics', []))}")
-    print(f"Stories: {len(jira_data.get('stories', []))}")
-    print(f"Tasks: {len(jira_data.get('tasks', []))}")
+    type_counts = jira_data.get('metrics', {}).get('type_counts', {})
+    print(f"Epics: {type_counts.get('epics', 0)}")
+    print(f"Stories: {type_counts.get('stories', 0)}")
+    print(f"Tasks: {type_counts.get('tasks', 0)}")
     print(f"Metrics: {jira_data.get('metrics', {})}")
 
 print(f"\n=== Status Summary ===")
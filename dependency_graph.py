@@ -0,0 +1,289 @@
+"""
+Dependency Graph - Blocker analysis over Jira issue links.
+"""
+from typing import Dict, List, Optional, Any, Iterable, Tuple
+from datetime import date, datetime
+
+from project_metrics import DONE_STATUSES, parse_due_date
+
+
+# Assumed working days per open issue when turning a dependency chain into a schedule
+DEFAULT_DAYS_PER_ISSUE = 2.0
+
+
+def blocked_by_keys(issue_links: Optional[List[Dict]]) -> Tuple[str, ...]:
+    """
+    Keys of the issues that block an issue, from its Jira `issuelinks` field.
+
+    'Blocks'-style links (outward 'blocks') block through their inward issue;
+    'Dependency'-style links (outward 'depends on') through their outward issue.
+    """
+    blockers = []
+    for link in issue_links or []:
+        outward = ((link.get('type') or {}).get('outward') or '').lower()
+        if 'block' in outward and 'inwardIssue' in link:
+            blockers.append(link['inwardIssue'].get('key'))
+        elif 'depend' in outward and 'outwardIssue' in link:
+            blockers.append(link['outwardIssue'].get('key'))
+    return tuple(key for key in blockers if key)
+
+
+class DependencyGraph:
+    """
+    Adjacency-list graph of "X blocks Y" edges between a project's issues.
+
+    Issues are added one at a time (add()) and can later be replaced or
+    removed (apply_delta()); the analysis runs lazily on the first query
+    after a change and is linear in issues plus links:
+
+    - strongly connected components (iterative Tarjan) expose dependency cycles;
+    - a longest-path pass over the component DAG in topological order gives,
+      for every issue, the longest chain of open issues that must finish
+      before it (its critical path); a done issue ends any chain through it;
+    - direct blockers that are open and past due are reported per issue.
+
+    Blockers outside the added issues (e.g. in other projects) are treated as
+    open with no due date.
+    """
+
+    def __init__(self, today: Optional[date] = None, days_per_issue: float = DEFAULT_DAYS_PER_ISSUE):
+        """
+        Initialize empty graph.
+
+        Args:
+            today: Reference date for overdue and slack calculations (default: today)
+            days_per_issue: Assumed days per open issue on a chain, used for slack
+        """
+        self.today = today or datetime.now().date()
+        self.days_per_issue = days_per_issue
+        self.keys: List[str] = []
+        self.index: Dict[str, int] = {}
+        # node -> nodes it blocks / nodes blocking it
+        self.blocks: List[List[int]] = []
+        self.blocked_by: List[List[int]] = []
+        self._open: List[bool] = []
+        self._overdue: List[bool] = []
+        self._analyzed = False
+
+    def _node(self, key: str) -> int:
+        node = self.index.get(key)
+        if node is None:
+            node = self.index[key] = len(self.keys)
+            self.keys.append(key)
+            self.blocks.append([])
+            self.blocked_by.append([])
+            self._open.append(True)
+            self._overdue.append(False)
+        return node
+
+    def copy(self) -> 'DependencyGraph':
+        """Independent copy of the issues and links (the analysis re-runs on first query)."""
+        graph = DependencyGraph(self.today, self.days_per_issue)
+        graph.keys = list(self.keys)
+        graph.index = dict(self.index)
+        graph.blocks = [list(nodes) for nodes in self.blocks]
+        graph.blocked_by = [list(nodes) for nodes in self.blocked_by]
+        graph._open = list(self._open)
+        graph._overdue = list(self._overdue)
+        return graph
+
+    def add(self, issue: Any):
+        """Add an Issue record and its blocked-by links."""
+        node = self._node(issue.get('key'))
+        done = issue.get('status') in DONE_STATUSES
+        due_date = parse_due_date(issue.get('due_date')) if issue.get('due_date') and not done else None
+        self._open[node] = not done
+        self._overdue[node] = due_date is not None and due_date < self.today
+        for blocker_key in issue.get('blocked_by') or ():
+            blocker = self._node(blocker_key)
+            self.blocks[blocker].append(node)
+            self.blocked_by[node].append(blocker)
+        self._analyzed = False
+
+    def remove(self, issue: Any):
+        """
+        Drop an issue's blocked-by links and state. Its node stays while other
+        issues may still name it as a blocker, and counts as an open outside issue.
+        """
+        node = self.index.get(issue.get('key'))
+        if node is None:
+            return
+        for blocker in self.blocked_by[node]:
+            self.blocks[blocker].remove(node)
+        self.blocked_by[node] = []
+        self._open[node] = True
+        self._overdue[node] = False
+        self._analyzed = False
+
+    def apply_delta(self, old: Optional[Any], new: Optional[Any]):
+        """
+        Replace one changed issue (O(its links)); the next query re-runs the analysis.
+
+        Args:
+            old: The issue as previously added, or None for a newly created issue
+            new: The issue as it is now, or None for a deleted issue
+        """
+        if old is not None:
+            self.remove(old)
+        if new is not None:
+            self.add(new)
+
+    def _analyze(self):
+        """Components, cycles and longest open chains, O(issues + links)."""
+        if self._analyzed:
+            return
+        count = len(self.keys)
+        component = [-1] * count
+        components: List[List[int]] = []
+
+        # Iterative Tarjan: components are emitted in reverse topological order
+        order = [-1] * count
+        low = [0] * count
+        on_stack = [False] * count
+        stack: List[int] = []
+        counter = 0
+        for root in range(count):
+            if order[root] != -1:
+                continue
+            work = [(root, 0)]
+            while work:
+                node, edge = work.pop()
+                if edge == 0:
+                    order[node] = low[node] = counter
+                    counter += 1
+                    stack.append(node)
+                    on_stack[node] = True
+                successors = self.blocks[node]
+                while edge < len(successors):
+                    successor = successors[edge]
+                    edge += 1
+                    if order[successor] == -1:
+                        work.append((node, edge))
+                        work.append((successor, 0))
+                        break
+                    if on_stack[successor]:
+                        low[node] = min(low[node], order[successor])
+                else:
+                    if low[node] == order[node]:
+                        members = []
+                        while True:
+                            member = stack.pop()
+                            on_stack[member] = False
+                            component[member] = len(components)
+                            members.append(member)
+                            if member == node:
+                                break
+                        components.append(members)
+                    if work:
+                        parent = work[-1][0]
+                        low[parent] = min(low[parent], low[node])
+
+        # Longest chain of open issues ending at each component, walking blockers first
+        weight = [sum(self._open[member] for member in members) for members in components]
+        chain = [0] * len(components)
+        previous = [-1] * len(components)
+        for comp in range(len(components) - 1, -1, -1):
+            best, best_prev = 0, -1
+            for member in components[comp]:
+                for blocker in self.blocked_by[member]:
+                    blocker_comp = component[blocker]
+                    if blocker_comp != comp and chain[blocker_comp] > best:
+                        best, best_prev = chain[blocker_comp], blocker_comp
+            if weight[comp]:
+                chain[comp] = best + weight[comp]
+                previous[comp] = best_prev
+            else:
+                # A finished issue no longer waits on its blockers, so their chain ends here
+                chain[comp] = 0
+                previous[comp] = -1
+
+        self._component = component
+        self._components = components
+        self._chain = chain
+        self._previous = previous
+        self._cycles = [sorted(self.keys[member] for member in members)
+                        for members in components
+                        if len(members) > 1 or members[0] in self.blocks[members[0]]]
+        self._analyzed = True
+
+    def cycles(self) -> List[List[str]]:
+        """Groups of issues that (transitively) block each other."""
+        self._analyze()
+        return list(self._cycles)
+
+    def open_blockers(self, key: str) -> List[str]:
+        """Open issues directly blocking an issue."""
+        node = self.index.get(key)
+        if node is None:
+            return []
+        return [self.keys[blocker] for blocker in self.blocked_by[node] if self._open[blocker]]
+
+    def overdue_blockers(self, key: str) -> List[str]:
+        """Open, past-due issues directly blocking an issue."""
+        node = self.index.get(key)
+        if node is None:
+            return []
+        return [self.keys[blocker] for blocker in self.blocked_by[node]
+                if self._open[blocker] and self._overdue[blocker]]
+
+    def chain_length(self, key: str) -> int:
+        """Open issues on the longest blocking chain ending at an issue (including it)."""
+        node = self.index.get(key)
+        if node is None:
+            return 0
+        self._analyze()
+        return self._chain[self._component[node]]
+
+    def critical_path(self, key: str) -> List[str]:
+        """Open issues on the longest blocking chain ending at an issue, first blocker first."""
+        node = self.index.get(key)
+        if node is None:
+            return []
+        self._analyze()
+        path = []
+        comp = self._component[node]
+        while comp != -1:
+            path.extend(sorted((self.keys[member] for member in self._components[comp] if self._open[member]),
+                               reverse=True))
+            comp = self._previous[comp]
+        path.reverse()
+        return path
+
+    def epic_analysis(self, epic_key: str, child_keys: Iterable[str],
+                      due_date: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Dependency risk of an epic through its children.
+
+        Args:
+            epic_key: Epic issue key
+            child_keys: Keys of the epic's children (see EpicIndex.children)
+            due_date: Epic due date, for slack
+
+        Returns:
+            Dictionary with critical_path (keys), chain_length, slack_days (None
+            without a due date), blocked_by_overdue (keys) and cycles touching the epic
+        """
+        self._analyze()
+        members = [epic_key] + list(child_keys)
+        member_set = set(members)
+        end = max(members, key=self.chain_length)
+        chain_length = self.chain_length(end)
+
+        blocked_by_overdue = []
+        for key in members:
+            for blocker in self.overdue_blockers(key):
+                if blocker not in member_set and blocker not in blocked_by_overdue:
+                    blocked_by_overdue.append(blocker)
+
+        slack_days = None
+        due = parse_due_date(due_date) if due_date else None
+        if due is not None:
+            slack_days = int((due - self.today).days - chain_length * self.days_per_issue)
+
+        return {
+            'critical_path': self.critical_path(end) if chain_length else [],
+            'chain_length': chain_length,
+            'slack_days': slack_days,
+            'blocked_by_overdue': blocked_by_overdue,
+            'cycles': [cycle for cycle in self.cycles() if member_set.intersection(cycle)]
+        }
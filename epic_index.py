@@ -0,0 +1,115 @@
+"""
+Epic Index - Epic to child issue index with rolled-up progress per epic.
+"""
+from typing import Dict, List, Optional, Any
+from datetime import date, datetime
+
+from project_metrics import DONE_STATUSES, parse_due_date
+
+
+class EpicIndex:
+    """
+    Maps each parent (epic) key to the keys of its child issues and keeps
+    per-parent roll-ups (children, done, overdue) current as children are
+    added, changed or removed.
+
+    Children are linked through the `parent_key` of each Issue record (the
+    parent field, or the Epic Link field on company-managed projects), so the
+    index also holds story -> sub-task links; callers look up epics by key.
+    Like ProjectMetrics, overdue flags are relative to `today`.
+    """
+
+    def __init__(self, today: Optional[date] = None):
+        """
+        Initialize empty index.
+
+        Args:
+            today: Reference date for overdue checks (default: today)
+        """
+        self.today = today or datetime.now().date()
+        # parent key -> child keys
+        self.children: Dict[str, List[str]] = {}
+        # child key -> (parent key, done, overdue) as counted
+        self._counted: Dict[str, tuple] = {}
+        # parent key -> [children, done, overdue]
+        self._rollups: Dict[str, List[int]] = {}
+
+    @classmethod
+    def from_issues(cls, issues: List[Any], today: Optional[date] = None) -> 'EpicIndex':
+        """Index for a list of Issue records."""
+        index = cls(today)
+        for issue in issues:
+            index.add(issue)
+        return index
+
+    def copy(self) -> 'EpicIndex':
+        """Independent copy, so one version can be updated while another is being read."""
+        index = EpicIndex(self.today)
+        index.children = {parent_key: list(keys) for parent_key, keys in self.children.items()}
+        index._counted = dict(self._counted)
+        index._rollups = {parent_key: list(rollup) for parent_key, rollup in self._rollups.items()}
+        return index
+
+    def add(self, issue: Any):
+        """Index one issue under its parent; issues without a parent are ignored."""
+        parent_key = issue.get('parent_key')
+        if not parent_key:
+            return
+        key = issue.get('key')
+        if key in self._counted:
+            self.remove(issue)
+        status = issue.get('status')
+        done = status in DONE_STATUSES
+        due_date = parse_due_date(issue.get('due_date')) if issue.get('due_date') and not done else None
+        overdue = due_date is not None and due_date < self.today
+        self._counted[key] = (parent_key, done, overdue)
+        self.children.setdefault(parent_key, []).append(key)
+        rollup = self._rollups.setdefault(parent_key, [0, 0, 0])
+        rollup[0] += 1
+        rollup[1] += done
+        rollup[2] += overdue
+
+    def remove(self, issue: Any):
+        """Drop an issue from the index, using the state it was counted with."""
+        counted = self._counted.pop(issue.get('key'), None)
+        if counted is None:
+            return
+        parent_key, done, overdue = counted
+        self.children[parent_key].remove(issue.get('key'))
+        rollup = self._rollups[parent_key]
+        rollup[0] -= 1
+        rollup[1] -= done
+        rollup[2] -= overdue
+        if not rollup[0]:
+            del self.children[parent_key]
+            del self._rollups[parent_key]
+
+    def apply_delta(self, old: Optional[Any], new: Optional[Any]):
+        """
+        Update the roll-ups for one changed issue (O(children of the affected epics)).
+
+        Args:
+            old: The issue as previously indexed, or None for a newly created issue
+            new: The issue as it is now, or None for a deleted issue
+        """
+        if old is not None:
+            self.remove(old)
+        if new is not None:
+            self.add(new)
+
+    def progress(self, epic_key: str) -> Dict[str, Any]:
+        """
+        Rolled-up progress of an epic.
+
+        Returns:
+            Dictionary with children, done, open and overdue counts and completion
+            (percent of children done, None for an epic without children)
+        """
+        children, done, overdue = self._rollups.get(epic_key, (0, 0, 0))
+        return {
+            'children': children,
+            'done': done,
+            'open': children - done,
+            'overdue': overdue,
+            'completion': round(100 * done / children) if children else None
+        }
@@ -0,0 +1,227 @@
+"""
+Flow Analytics - Cycle time, lead time, WIP and throughput from Jira status changelogs.
+"""
+from typing import Dict, List, Optional, Any, Iterable
+from array import array
+from datetime import datetime, timedelta, timezone
+import threading
+import numpy as np
+import pandas as pd
+
+from jira_client import JiraClient
+from project_metrics import DONE_STATUSES
+
+
+# Statuses that mean work has not started; any other non-done status counts as in progress
+TODO_STATUSES = frozenset(('To Do', 'Backlog', 'Open', 'New', 'Selected for Development'))
+TODO, IN_PROGRESS, DONE = 0, 1, 2
+DAY_SECONDS = 86400.0
+
+
+def _epoch(timestamp: Optional[str]) -> float:
+    """Jira timestamp ('2024-02-01T10:00:00.000+0100') as UTC epoch seconds (NaN if missing)."""
+    if not timestamp:
+        return float('nan')
+    try:
+        return datetime.strptime(timestamp, '%Y-%m-%dT%H:%M:%S.%f%z').timestamp()
+    except ValueError:
+        try:
+            return datetime.fromisoformat(timestamp.replace('Z', '+00:00')).timestamp()
+        except ValueError:
+            return float('nan')
+
+
+def _status_category(status: str) -> int:
+    if status in DONE_STATUSES:
+        return DONE
+    if status in TODO_STATUSES:
+        return TODO
+    return IN_PROGRESS
+
+
+def _summary(days: np.ndarray) -> Dict[str, Optional[float]]:
+    """Median, 85th percentile and mean of a duration sample, in days."""
+    if not len(days):
+        return {'count': 0, 'median': None, 'p85': None, 'mean': None}
+    return {
+        'count': int(len(days)),
+        'median': round(float(np.median(days)), 1),
+        'p85': round(float(np.percentile(days, 85)), 1),
+        'mean': round(float(days.mean()), 1)
+    }
+
+
+class _ProjectFlow:
+    """Status-transition events of one project in parallel typed arrays."""
+
+    def __init__(self):
+        self.keys: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.id_index: Dict[str, int] = {}
+        self.created = array('d')
+        # Issue `updated` timestamp when its changelog was last pulled, and the last history seen
+        self.synced_updated: List[Optional[str]] = []
+        self.last_history = array('q')
+        # One entry per status transition
+        self.event_issue = array('i')
+        self.event_time = array('d')
+        self.event_to = array('b')
+
+    def issue(self, issue_id: str, key: str, created: Optional[str]) -> int:
+        position = self.index.get(key)
+        if position is None:
+            position = self.index[key] = len(self.keys)
+            self.keys.append(key)
+            self.created.append(_epoch(created))
+            self.synced_updated.append(None)
+            self.last_history.append(-1)
+        self.id_index[issue_id] = position
+        return position
+
+
+class FlowAnalytics:
+    """
+    Flow metrics per project from status changelogs.
+
+    refresh() lists a project's issues (ids, created and updated only) and
+    pulls changelogs with the bulk changelog endpoint for the issues that
+    changed since the previous refresh; transitions already seen are skipped by
+    history id, so each refresh only appends new events. Events live in
+    compact typed arrays (about 13 bytes per transition) and metrics are
+    computed with vectorized NumPy/pandas operations over them.
+
+    Cycle time runs from an issue first leaving a to-do status to it last
+    entering a done status; lead time from creation to that same point.
+    """
+
+    def __init__(self, jira_client: JiraClient):
+        """
+        Initialize flow analytics.
+
+        Args:
+            jira_client: Initialized JiraClient instance
+        """
+        self.jira = jira_client
+        self._projects: Dict[str, _ProjectFlow] = {}
+        self._lock = threading.Lock()
+
+    def refresh(self, project_key: str) -> Dict[str, int]:
+        """
+        Pull new status transitions for a project.
+
+        Returns:
+            Dictionary with the number of issues, issues whose changelog was
+            fetched and new transitions recorded
+        """
+        with self._lock:
+            flow = self._projects.setdefault(project_key, _ProjectFlow())
+            stale = []
+            for issue in self.jira.iter_issues(f"project = {project_key}",
+                                               fields=['created', 'updated'], page_size=1000):
+                fields = issue.get('fields', {})
+                position = flow.issue(issue.get('id'), issue.get('key'), fields.get('created'))
+                if flow.synced_updated[position] != fields.get('updated'):
+                    stale.append((issue.get('id'), position, fields.get('updated')))
+
+            new_events = 0
+            if stale:
+                for entry in self.jira.iter_changelogs([issue_id for issue_id, _, _ in stale]):
+                    position = flow.id_index.get(str(entry.get('issueId')))
+                    if position is None:
+                        continue
+                    new_events += self._record(flow, position, entry.get('changeHistories', []))
+                for _, position, updated in stale:
+                    flow.synced_updated[position] = updated
+            return {'issues': len(flow.keys), 'changelogs_fetched': len(stale), 'new_transitions': new_events}
+
+    def _record(self, flow: _ProjectFlow, position: int, histories: Iterable[Dict]) -> int:
+        """Append unseen status transitions of one issue; returns how many were added."""
+        added = 0
+        last_seen = flow.last_history[position]
+        newest = last_seen
+        for history in histories:
+            try:
+                history_id = int(history.get('id'))
+            except (TypeError, ValueError):
+                continue
+            if history_id <= last_seen:
+                continue
+            newest = max(newest, history_id)
+            for item in history.get('items', []):
+                if item.get('fieldId', item.get('field')) != 'status':
+                    continue
+                flow.event_issue.append(position)
+                flow.event_time.append(_epoch(history.get('created')))
+                flow.event_to.append(_status_category(item.get('toString') or ''))
+                added += 1
+        flow.last_history[position] = newest
+        return added
+
+    def metrics(self, project_key: str, weeks: int = 12, refresh: bool = True) -> Dict[str, Any]:
+        """
+        Flow metrics for a project.
+
+        Args:
+            project_key: Jira project key
+            weeks: Window for throughput and WIP series
+            refresh: Pull new transitions first
+
+        Returns:
+            Dictionary with cycle_time_days and lead_time_days summaries (count,
+            median, p85, mean), weekly_throughput [{'week', 'completed'}] for weeks
+            with completions, wip [{'date', 'wip'}] per day, current_wip and the
+            window length in weeks
+        """
+        if refresh:
+            self.refresh(project_key)
+        with self._lock:
+            flow = self._projects.get(project_key) or _ProjectFlow()
+            # Copy out of the typed arrays so no buffer export blocks later appends
+            events = pd.DataFrame({
+                'issue': np.frombuffer(flow.event_issue, dtype=np.int32).copy(),
+                'time': np.frombuffer(flow.event_time, dtype=np.float64).copy(),
+                'to': np.frombuffer(flow.event_to, dtype=np.int8).copy()
+            })
+            created = np.frombuffer(flow.created, dtype=np.float64).copy()
+
+        events = events.dropna(subset=['time']).sort_values(['issue', 'time'], kind='stable')
+        per_issue = events.groupby('issue')
+        started = events[events['to'] != TODO].groupby('issue')['time'].min()
+        last = per_issue.tail(1).set_index('issue')
+        done_at = last.loc[last['to'] == DONE, 'time']
+        # Issues are done when their latest transition was into a done status
+        finished = events[(events['to'] == DONE) & events['issue'].isin(done_at.index)]
+        finished_at = finished.groupby('issue')['time'].max()
+
+        cycle = (finished_at - started.reindex(finished_at.index)).dropna() / DAY_SECONDS
+        lead = (finished_at - pd.Series(created, dtype='float64').reindex(finished_at.index)).dropna() / DAY_SECONDS
+
+        now = datetime.now(timezone.utc)
+        window_start = (now - timedelta(weeks=weeks)).date()
+        finished_dates = pd.to_datetime(finished_at, unit='s', utc=True)
+        week_starts = (finished_dates.dt.tz_localize(None).dt.normalize()
+                       - pd.to_timedelta(finished_dates.dt.weekday, unit='D'))
+        throughput = week_starts[week_starts.dt.date >= window_start].value_counts().sort_index()
+
+        # WIP at the end of each day: issues in an in-progress status. Each issue adds
+        # one interval per stay in progress, so moves back to to-do or reopens count right
+        previous = per_issue['to'].shift(fill_value=TODO)
+        entered = (events['to'] == IN_PROGRESS) & (previous != IN_PROGRESS)
+        left = (events['to'] != IN_PROGRESS) & (previous == IN_PROGRESS)
+        start_times = np.sort(events.loc[entered, 'time'].values)
+        end_times = np.sort(events.loc[left, 'time'].values)
+        days = pd.date_range(window_start, now.date(), freq='D', tz='UTC')
+        day_ends = np.array([(day + pd.Timedelta(days=1)).timestamp() for day in days])
+        wip = np.searchsorted(start_times, day_ends) - np.searchsorted(end_times, day_ends)
+
+        return {
+            'issues': len(created),
+            'weeks': weeks,
+            'completed': int(len(finished_at)),
+            'cycle_time_days': _summary(cycle.values),
+            'lead_time_days': _summary(lead.values),
+            'weekly_throughput': [{'week': week.strftime('%Y-%m-%d'), 'completed': int(count)}
+                                  for week, count in throughput.items()],
+            'wip': [{'date': day.strftime('%Y-%m-%d'), 'wip': int(count)} for day, count in zip(days, wip)],
+            'current_wip': int(wip[-1]) if len(wip) else 0
+        }
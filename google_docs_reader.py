@@ -6,6 +6,7 @@ from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
 from googleapiclient.discovery import build
 from typing import Dict, List, Optional
+from rate_limiter import TokenBucket
 import os
 import pickle
 
@@ -19,16 +20,19 @@ class GoogleDocsReader:
     ]
     
     def __init__(self, credentials_file: str = 'credentials.json', 
-                 token_file: str = 'token.pickle'):
+                 token_file: str = 'token.pickle',
+                 rate_limiter: Optional[TokenBucket] = None):
         """
         Initialize Google Docs reader.
         
         Args:
             credentials_file: Path to OAuth2 credentials JSON file
             token_file: Path to store/load authentication token
+            rate_limiter: Shared token bucket taken from before every Drive/Docs API call
         """
         self.credentials_file = credentials_file
         self.token_file = token_file
+        self.rate_limiter = rate_limiter
         self.drive_service = None
         self.docs_service = None
         self._authenticate()
@@ -63,6 +67,12 @@ class GoogleDocsReader:
         self.drive_service = build('drive', 'v3', credentials=creds)
         self.docs_service = build('docs', 'v1', credentials=creds)
     
+    def _execute(self, request):
+        """Execute a Google API request after taking a rate-limit token."""
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        return request.execute()
+    
     def read_document(self, file_id: str) -> str:
         """
         Read text content from a Google Doc.
@@ -74,7 +84,7 @@ class GoogleDocsReader:
             Extracted text content
         """
         try:
-            doc = self.docs_service.documents().get(documentId=file_id).execute()
+            doc = self._execute(self.docs_service.documents().get(documentId=file_id))
             content = doc.get('body', {}).get('content', [])
             text_parts = []
             
@@ -112,11 +122,11 @@ class GoogleDocsReader:
         """
         try:
             search_query = f"name contains '{query}' and mimeType='{mime_type}'"
-            results = self.drive_service.files().list(
+            results = self._execute(self.drive_service.files().list(
                 q=search_query,
                 pageSize=50,
                 fields="files(id, name, mimeType, createdTime, modifiedTime, owners)"
-            ).execute()
+            ))
             return results.get('files', [])
         except Exception as e:
             raise Exception(f"Failed to search documents: {str(e)}")
@@ -4,14 +4,34 @@ Helios0.1 Chat - Main chat engine that integrates Jira and Google Docs.
 from jira_data_fetcher import JiraDataFetcher
 from google_docs_reader import GoogleDocsReader
 from llm_service import LLMService
-from typing import Dict, List, Optional, Any
+from issue_store import IssueStore
+from flow_analytics import FlowAnalytics
+from ticket_creator import TicketCreator
+from singleflight import SingleFlight
+from typing import Dict, List, Optional, Any, Iterator, Tuple, Union, Callable
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 import re
 
 
+# Seconds each process_query stage may take before the answer goes ahead without it
+STAGE_TIMEOUTS = {'jira': 120.0, 'meeting_notes': 20.0}
+# Phrases (matched as whole words) that make a query count-only
+COUNT_QUERY_PATTERN = re.compile(r'\b(how many|count|number of|total number)\b')
+# Phrases (matched as whole words) that make a query a flow question
+FLOW_QUERY_PATTERN = re.compile(r'\b(cycle time|lead time|throughput|wip|work in progress)\b')
+# Worker threads running process_query stages, shared by all chats in the process (two stages per query)
+STAGE_WORKERS = 16
+# Concurrent meeting-notes stages for the same project, across all chats in the process, share one run
+_meeting_notes_runs = SingleFlight()
+_stage_executor = ThreadPoolExecutor(max_workers=STAGE_WORKERS, thread_name_prefix='helios-stage')
+
+
 class HeliosChat:
     """Main chat engine for Helios0.1."""
     
-    def __init__(self, jira_client, google_docs_reader: GoogleDocsReader, llm_service: LLMService):
+    def __init__(self, jira_client, google_docs_reader: GoogleDocsReader, llm_service: LLMService,
+                 issue_store: Optional[IssueStore] = None,
+                 stage_timeouts: Optional[Dict[str, float]] = None):
         """
         Initialize Helios chat.
         
@@ -19,11 +39,17 @@ class HeliosChat:
             jira_client: Initialized JiraClient instance
             google_docs_reader: Initialized GoogleDocsReader instance
             llm_service: Initialized LLMService instance
+            issue_store: Optional local issue store so repeat queries only fetch deltas
+            stage_timeouts: Per-stage timeouts in seconds overriding STAGE_TIMEOUTS
         """
-        self.jira_fetcher = JiraDataFetcher(jira_client)
+        self.jira_fetcher = JiraDataFetcher(jira_client, issue_store)
+        self.flow = FlowAnalytics(jira_client)
+        # One creator per chat, so retries reuse the tickets it already created
+        self.ticket_creator = TicketCreator(jira_client)
         self.docs_reader = google_docs_reader
         self.llm = llm_service
         self.conversation_history = []
+        self.stage_timeouts = {**STAGE_TIMEOUTS, **(stage_timeouts or {})}
     
     def extract_project_name(self, query: str) -> Optional[str]:
         """
@@ -58,26 +84,42 @@ class HeliosChat:
             r'\b([A-Z]{2,10})\b',           # Any 2-10 capital letters (last resort)
         ]
         
+        # Prefer candidates that are real project keys; fall back to the first
+        # plausible one so the fetcher can report which projects exist
+        catalog = self.jira_fetcher.projects
+        first_candidate = None
         for pattern in patterns:
             matches = re.finditer(pattern, query, re.IGNORECASE)
             for match in matches:
                 potential_project = match.group(1).upper()
                 # Skip if it's a common word
-                if potential_project not in excluded_words:
+                if potential_project in excluded_words:
+                    continue
+                if first_candidate is None:
+                    first_candidate = potential_project
+                    if not catalog.available:
+                        return first_candidate
+                if potential_project in catalog:
                     return potential_project
         
-        return None
+        return first_candidate
     
-    def process_query(self, query: str, project_key: Optional[str] = None) -> Dict[str, Any]:
+    def process_query(self, query: str, project_key: Optional[str] = None,
+                      stream: bool = False) -> Dict[str, Any]:
         """
         Process a user query and generate response.
         
         Args:
             query: User query
             project_key: Optional project key (will be extracted from query if not provided)
+            stream: Stream LLM-generated answers instead of waiting for the whole completion
         
         Returns:
             Dictionary with response data including summary, roadmap, charts data, etc.
+            With stream=True, answers generated by the LLM come as 'response_stream',
+            an iterator of text chunks; 'response' holds the final (validated)
+            answer once the stream is exhausted, and only then is the exchange
+            added to the conversation history.
         """
         # Extract project key if not provided
         if not project_key:
@@ -89,19 +131,41 @@ class HeliosChat:
                 "response": "I couldn't identify which project you're asking about. Please mention the project name in your question."
             }
         
+        # Count questions are answered from approximate counts, without fetching issues
+        if self._is_count_query(query):
+            try:
+                return self._answer_count_query(query, project_key)
+            except Exception:
+                pass  # Fall back to the full fetch below
+        
+        # Flow questions are answered from status changelogs
+        if self._is_flow_query(query):
+            try:
+                return self._answer_flow_query(query, project_key)
+            except Exception:
+                pass  # Fall back to the full fetch below
+        
+        # The Jira fetch and the meeting-notes search don't depend on each other,
+        # so they run concurrently and the query waits for the slower of the two
+        jira_stage = _stage_executor.submit(
+            self.jira_fetcher.get_project_issues, project_key, profile='roadmap'
+        )
+        notes_key = (getattr(self.docs_reader, 'token_file', None), project_key,
+                     getattr(self.llm, 'provider', None), getattr(self.llm, 'model', None))
+        notes_stage = _stage_executor.submit(_meeting_notes_runs.do, notes_key,
+                                             self._meeting_notes_stage, project_key)
+        
         # Fetch Jira data
         try:
-            jira_data = self.jira_fetcher.get_project_issues(project_key)
+            # Summaries, roadmap and charts never read descriptions or the schema
+            jira_data = jira_stage.result(timeout=self.stage_timeouts['jira'])
             # Debug: Check what we got
             total = jira_data.get('total_issues', 0)
-            epics_count = len(jira_data.get('epics', []))
-            stories_count = len(jira_data.get('stories', []))
-            tasks_count = len(jira_data.get('tasks', []))
             
             # If we got 0, try direct API call to debug
             if total == 0:
                 jql = f"project = {project_key}"
-                direct_issues = self.jira_fetcher.jira.search_issues(jql, max_results=10)
+                direct_issues = self.jira_fetcher.jira.search_issues(jql, max_results=10, profile='metrics')
                 if len(direct_issues) > 0:
                     # We have issues from API but they're not being categorized
                     # This suggests a categorization problem
@@ -109,11 +173,22 @@ class HeliosChat:
                     for issue in direct_issues[:10]:
                         issue_type = issue.get('fields', {}).get('issuetype', {}).get('name', 'Unknown')
                         issue_types[issue_type] = issue_types.get(issue_type, 0) + 1
+                    notes_stage.cancel()
                     return {
                         "error": f"Found {len(direct_issues)} issues from API but categorization returned 0. Issue types found: {issue_types}",
                         "response": f"I found {len(direct_issues)} issues from Jira API, but they weren't categorized correctly. Issue types: {list(issue_types.keys())}. This may indicate a problem with issue type matching."
                     }
+        except FutureTimeoutError:
+            # The answer fails without Jira data, so drop the notes stage if it hasn't started;
+            # a running one finishes on the shared pool and its result is ignored
+            notes_stage.cancel()
+            timeout = self.stage_timeouts['jira']
+            return {
+                "error": f"Timed out fetching Jira data after {timeout:g}s",
+                "response": f"Fetching data from Jira for {project_key} took longer than {timeout:g} seconds. Please try again in a moment."
+            }
         except Exception as e:
+            notes_stage.cancel()
             import traceback
             error_details = traceback.format_exc()
             return {
@@ -121,41 +196,17 @@ class HeliosChat:
                 "response": f"I encountered an error while fetching data from Jira: {str(e)}\n\nDetails: {error_details[:500]}"
             }
         
-        # Find meeting notes
-        meeting_notes = []
-        try:
-            meeting_notes = self.docs_reader.find_meeting_notes(project_key)
-        except Exception as e:
-            # Continue even if meeting notes fail
-            pass
-        
-        # Generate summaries
+        # Generate summaries while the meeting-notes stage may still be running
         status_summary = self.jira_fetcher.generate_status_summary(jira_data)
         roadmap = self.jira_fetcher.generate_roadmap(jira_data)
         
-        # Combine meeting notes context with Gemini 2.0 summarization
-        meeting_context = ""
-        if meeting_notes:
-            meeting_context = "\n\n**Recent Meeting Notes:**\n"
-            for note in meeting_notes[:3]:  # Top 3 most relevant
-                note_content = note.get('content', '')
-                note_name = note.get('name', 'Unknown')
-                
-                # Use Gemini 2.0 to summarize meeting notes if LLM is available
-                if hasattr(self.llm, 'provider') and self.llm.provider != "dummy" and hasattr(self.llm, 'generate_summary'):
-                    try:
-                        # Summarize long meeting notes using Gemini 2.0
-                        if len(note_content) > 500:
-                            summary = self.llm.generate_summary(note_content, max_length=150)
-                            meeting_context += f"- {note_name}: {summary}\n"
-                        else:
-                            meeting_context += f"- {note_name}: {note_content[:500]}...\n"
-                    except Exception as e:
-                        # Fallback to truncation if summarization fails
-                        meeting_context += f"- {note_name}: {note_content[:500]}...\n"
-                else:
-                    # Fallback to truncation without LLM
-                    meeting_context += f"- {note_name}: {note_content[:500]}...\n"
+        # Meeting notes are optional: a slow or failing Drive never holds up the answer
+        try:
+            meeting_notes, meeting_context = notes_stage.result(timeout=self.stage_timeouts['meeting_notes'])
+        except Exception:
+            meeting_notes, meeting_context = [], ""
+        
+        answer_stream = None
         
         # Determine if this is a status/overview query (use data-driven response)
         # or a complex analytical query (use LLM enhancement)
@@ -183,12 +234,13 @@ Would you like more details about any specific aspect of this project?"""
             try:
                 if hasattr(self.llm, 'provider') and self.llm.provider != "dummy":
                     # Build a clearer prompt with explicit data
+                    type_counts = jira_data.get('metrics', {}).get('type_counts', {})
                     data_summary = f"""
 Project Key: {project_key}
 Total Issues: {jira_data.get('total_issues', 0)}
-Epics: {len(jira_data.get('epics', []))}
-Stories: {len(jira_data.get('stories', []))}
-Tasks: {len(jira_data.get('tasks', []))}
+Epics: {type_counts.get('epics', 0)}
+Stories: {type_counts.get('stories', 0)}
+Tasks: {type_counts.get('tasks', 0)}
 """
                     
                     llm_prompt = f"""You are Helios, a project management assistant. Answer the user's question about project {project_key}.
@@ -213,30 +265,8 @@ INSTRUCTIONS:
 - Reference the specific numbers from the data above
 - Be accurate and helpful"""
                     
-                    if self.llm.provider == "gemini":
-                        response = self.llm.client.generate_content(llm_prompt)
-                        answer = response.text.strip()
-                    else:  # OpenAI
-                        response = self.llm.client.chat.completions.create(
-                            model=self.llm.model,
-                            messages=[
-                                {"role": "system", "content": "You are Helios, a helpful project management assistant. Always be accurate and reference the data provided."},
-                                {"role": "user", "content": llm_prompt}
-                            ]
-                        )
-                        answer = response.choices[0].message.content.strip()
-                    
-                    # Strong validation - if LLM says no issues when we have issues, override it
-                    if jira_data.get('total_issues', 0) > 0:
-                        no_issues_phrases = [
-                            'no issues', 'no data', 'no information', 'not found', 
-                            'does not exist', 'cannot find', 'unable to find', 
-                            'there are no', 'no issues associated', 'within the what project'
-                        ]
-                        answer_lower = answer.lower()
-                        if any(phrase in answer_lower for phrase in no_issues_phrases):
-                            # LLM gave incorrect response, override with data-driven response
-                            answer = f"""**Project {project_key} Status:**
+                    system_prompt = "You are Helios, a helpful project management assistant. Always be accurate and reference the data provided."
+                    data_answer = f"""**Project {project_key} Status:**
 
 {status_summary}
 
@@ -245,6 +275,12 @@ INSTRUCTIONS:
 {meeting_context if meeting_context else ''}
 
 Would you like more details about any specific aspect of this project?"""
+                    
+                    if stream and hasattr(self.llm, 'generate_text_stream'):
+                        answer_stream = self.llm.generate_text_stream(llm_prompt, system_prompt=system_prompt)
+                    else:
+                        answer = self.llm.generate_text(llm_prompt, system_prompt=system_prompt)
+                        answer = self._validated_answer(answer, jira_data, data_answer)
                 else:
                     # No LLM, use data-driven response
                     answer = f"""**Project {project_key} Status:**
@@ -270,17 +306,33 @@ Is there anything specific you'd like to know more about?"""
         
         # Prepare charts data
         metrics = jira_data.get('metrics', {})
+        type_counts = metrics.get('type_counts', {})
         charts_data = {
             'by_type': {
-                'Epics': len(jira_data.get('epics', [])),
-                'Stories': len(jira_data.get('stories', [])),
-                'Tasks': len(jira_data.get('tasks', []))
+                'Epics': type_counts.get('epics', 0),
+                'Stories': type_counts.get('stories', 0),
+                'Tasks': type_counts.get('tasks', 0)
             },
             'by_status': metrics.get('status_counts', {}),
             'by_assignee': metrics.get('assignee_counts', {}),
-            'by_assignee_and_status': self._prepare_assignee_status_data(jira_data)
+            'by_assignee_and_status': jira_data['frame'].assignee_status_table()
+        }
+        
+        result = {
+            'project_key': project_key,
+            'response': answer if answer_stream is None else '',
+            'status_summary': status_summary,
+            'roadmap': roadmap,
+            'meeting_notes': meeting_notes,
+            'charts_data': charts_data,
+            'jira_data': jira_data
         }
         
+        if answer_stream is not None:
+            result['response_stream'] = self._stream_answer(query, project_key, answer_stream,
+                                                            jira_data, data_answer, result)
+            return result
+        
         # Store in conversation history
         self.conversation_history.append({
             'query': query,
@@ -288,41 +340,227 @@ Is there anything specific you'd like to know more about?"""
             'response': answer
         })
         
+        return result
+    
+    def _validated_answer(self, answer: str, jira_data: Dict[str, Any], data_answer: str) -> str:
+        """Replace an LLM answer that claims there is no data, when there is, with the data-driven answer."""
+        # Strong validation - if LLM says no issues when we have issues, override it
+        if jira_data.get('total_issues', 0) > 0:
+            no_issues_phrases = [
+                'no issues', 'no data', 'no information', 'not found', 
+                'does not exist', 'cannot find', 'unable to find', 
+                'there are no', 'no issues associated', 'within the what project'
+            ]
+            answer_lower = answer.lower()
+            if any(phrase in answer_lower for phrase in no_issues_phrases):
+                # LLM gave incorrect response, override with data-driven response
+                return data_answer
+        return answer
+    
+    def _stream_answer(self, query: str, project_key: str, chunks: Iterator[str],
+                       jira_data: Dict[str, Any], data_answer: str,
+                       result: Dict[str, Any]) -> Iterator[str]:
+        """
+        Yield LLM answer chunks, then validate the full answer into result['response'].
+        
+        Chunks already shown cannot be taken back, so when the answer fails
+        validation (or the stream breaks) the data-driven answer follows it.
+        """
+        parts = []
+        try:
+            for chunk in chunks:
+                parts.append(chunk)
+                yield chunk
+            answer = self._validated_answer(''.join(parts).strip(), jira_data, data_answer)
+        except Exception:
+            # On any error, use data-driven response
+            answer = data_answer
+        if answer is data_answer:
+            yield ("\n\n---\n\n" if parts else "") + data_answer
+        
+        result['response'] = answer
+        self.conversation_history.append({
+            'query': query,
+            'project_key': project_key,
+            'response': answer
+        })
+    
+    def _meeting_notes_stage(self, project_key: str) -> Tuple[List[Dict[str, Any]], str]:
+        """
+        Find a project's meeting notes and summarize the most relevant ones.
+        
+        Returns:
+            Tuple of (meeting notes, meeting context text for the answer)
+        """
+        try:
+            meeting_notes = self.docs_reader.find_meeting_notes(project_key)
+        except Exception:
+            # Continue even if meeting notes fail
+            return [], ""
+        
+        # Combine meeting notes context with Gemini 2.0 summarization
+        meeting_context = ""
+        if meeting_notes:
+            meeting_context = "\n\n**Recent Meeting Notes:**\n"
+            top_notes = meeting_notes[:3]  # Top 3 most relevant
+            
+            # Summarize the long notes in one concurrent batch if LLM is available
+            summaries = {}
+            long_notes = [note for note in top_notes if len(note.get('content', '')) > 500]
+            if long_notes and hasattr(self.llm, 'provider') and self.llm.provider != "dummy" and hasattr(self.llm, 'summarize_documents'):
+                try:
+                    summaries = self.llm.summarize_documents(long_notes, max_length=150)
+                except Exception:
+                    summaries = {}
+            
+            for note in top_notes:
+                note_content = note.get('content', '')
+                note_name = note.get('name', 'Unknown')
+                summary = summaries.get((note.get('id'), note.get('modified_time')))
+                if summary:
+                    meeting_context += f"- {note_name}: {summary}\n"
+                else:
+                    # Short note, no LLM, or summarization failed: use the text itself
+                    meeting_context += f"- {note_name}: {note_content[:500]}...\n"
+        return meeting_notes, meeting_context
+    
+    def create_tickets_from_notes(self, project_key: str, note: Dict[str, Any],
+                                  progress_callback: Optional[Callable[[int, int, str], None]] = None) -> Dict[str, Any]:
+        """
+        Create Jira tickets for the action items of a meeting note.
+        
+        Action items are extracted and structured into parent tickets, subtasks
+        and standalone tickets by the LLM, then created in bulk. Running it again
+        for the same note (e.g. after a partial failure) reuses existing tickets.
+        
+        Args:
+            project_key: Project to create the tickets in
+            note: Meeting note as returned by GoogleDocsReader.find_meeting_notes
+            progress_callback: Called as (done, total, message) while tickets are created
+        
+        Returns:
+            Dictionary with 'created' and 'existing' tickets and 'errors' (see TicketCreator)
+        """
+        action_items = self.llm.extract_action_items(note.get('content', ''))
+        if not action_items:
+            return {'created': [], 'existing': [], 'errors': []}
+        structure = self.llm.suggest_ticket_structure(action_items)
+        return self.ticket_creator.create_from_structure(project_key, structure,
+                                                         source_id=note.get('id') or note.get('name', ''),
+                                                         progress_callback=progress_callback)
+    
+    def _is_count_query(self, query: str) -> bool:
+        """Whether a query only asks for aggregate numbers."""
+        return COUNT_QUERY_PATTERN.search(query.lower()) is not None
+    
+    def _is_flow_query(self, query: str) -> bool:
+        """Whether a query asks about delivery flow (cycle/lead time, throughput, WIP)."""
+        return FLOW_QUERY_PATTERN.search(query.lower()) is not None
+    
+    def _answer_flow_query(self, query: str, project_key: str) -> Dict[str, Any]:
+        """Answer a flow question from changelog-based cycle time, lead time, throughput and WIP."""
+        self.jira_fetcher._check_project(project_key)
+        flow = self.flow.metrics(project_key)
+        
+        def days(summary: Dict[str, Any]) -> str:
+            if not summary['count']:
+                return "n/a (no completed issues)"
+            return (f"median {summary['median']} days, 85th percentile {summary['p85']} days "
+                    f"({summary['count']} issues)")
+        
+        throughput = flow['weekly_throughput']
+        # Weeks without completions are left out of the series but still count
+        average = sum(week['completed'] for week in throughput) / flow['weeks']
+        status_summary = '\n'.join([
+            f"**Project: {project_key}**\n",
+            f"Cycle time: {days(flow['cycle_time_days'])}",
+            f"Lead time: {days(flow['lead_time_days'])}",
+            f"Throughput: {average:.1f} issues/week over the last {flow['weeks']} weeks",
+            f"Work in progress: {flow['current_wip']} issues"
+        ])
+        answer = f"""**Project {project_key} Flow:**
+
+{status_summary}
+
+Would you like more details about any specific aspect of this project?"""
+        
+        self.conversation_history.append({
+            'query': query,
+            'project_key': project_key,
+            'response': answer
+        })
+        
         return {
             'project_key': project_key,
             'response': answer,
             'status_summary': status_summary,
-            'roadmap': roadmap,
-            'meeting_notes': meeting_notes,
-            'charts_data': charts_data,
-            'jira_data': jira_data
+            'roadmap': '',
+            'meeting_notes': [],
+            'charts_data': {
+                'weekly_throughput': {week['week']: week['completed'] for week in throughput},
+                'wip_over_time': {day['date']: day['wip'] for day in flow['wip']}
+            },
+            'jira_data': {'project_key': project_key, 'flow': flow}
         }
     
-    def _prepare_assignee_status_data(self, jira_data: Dict[str, Any]) -> Dict[str, Dict[str, int]]:
-        """Prepare data for assignee vs status chart."""
-        all_issues = jira_data.get('epics', []) + jira_data.get('stories', []) + jira_data.get('tasks', [])
-        
-        assignee_status = {}
-        for issue in all_issues:
-            assignee = issue.get('assignee', 'Unassigned')
-            status = issue.get('status', 'Unknown')
-            
-            if assignee not in assignee_status:
-                assignee_status[assignee] = {}
-            assignee_status[assignee][status] = assignee_status[assignee].get(status, 0) + 1
+    def _answer_count_query(self, query: str, project_key: str) -> Dict[str, Any]:
+        """Answer a count question from approximate counts per status and type."""
+        counts = self.jira_fetcher.count_project_issues(project_key)
+        status_summary = self.jira_fetcher.generate_count_summary(counts)
+        answer = f"""**Project {project_key} Counts:**
+
+{status_summary}
+
+Would you like more details about any specific aspect of this project?"""
+        
+        type_counts = counts['type_counts']
+        charts_data = {
+            'by_type': {
+                'Epics': type_counts['epics'],
+                'Stories': type_counts['stories'],
+                'Tasks': type_counts['tasks']
+            },
+            'by_status': counts['status_counts']
+        }
+        
+        self.conversation_history.append({
+            'query': query,
+            'project_key': project_key,
+            'response': answer
+        })
         
-        return assignee_status
+        return {
+            'project_key': project_key,
+            'response': answer,
+            'status_summary': status_summary,
+            'roadmap': '',
+            'meeting_notes': [],
+            'charts_data': charts_data,
+            'jira_data': {
+                'project_key': project_key,
+                'total_issues': counts['total'],
+                'metrics': {
+                    'status_counts': counts['status_counts'],
+                    'type_counts': type_counts,
+                    'overdue_count': counts['overdue_count'],
+                    'total_issues': counts['total']
+                },
+                'counts': counts
+            }
+        }
     
-    def answer_followup(self, query: str, previous_context: Dict[str, Any]) -> str:
+    def answer_followup(self, query: str, previous_context: Dict[str, Any],
+                        stream: bool = False) -> Union[str, Iterator[str]]:
         """
         Answer a follow-up question using previous context.
         
         Args:
             query: Follow-up question
             previous_context: Previous response context
+            stream: Return an iterator of text chunks instead of the whole answer
         
         Returns:
-            Answer string
+            Answer string, or an iterator of its chunks with stream=True
         """
         context_str = f"""
 Previous Project: {previous_context.get('project_key')}
@@ -341,21 +579,26 @@ Current Question: {query}
 
 Provide a clear, helpful answer."""
                 
-                if self.llm.provider == "gemini":
-                    response = self.llm.client.generate_content(prompt)
-                    return response.text.strip()
-                else:  # OpenAI
-                    response = self.llm.client.chat.completions.create(
-                        model=self.llm.model,
-                        messages=[
-                            {"role": "system", "content": "You are Helios, a helpful project management assistant."},
-                            {"role": "user", "content": prompt}
-                        ]
-                    )
-                    return response.choices[0].message.content.strip()
+                if stream and hasattr(self.llm, 'generate_text_stream'):
+                    return self._stream_followup(self.llm.generate_text_stream(
+                        prompt,
+                        system_prompt="You are Helios, a helpful project management assistant."
+                    ))
+                answer = self.llm.generate_text(
+                    prompt,
+                    system_prompt="You are Helios, a helpful project management assistant."
+                )
             else:
                 # Fallback response
-                return f"Based on the previous context about {previous_context.get('project_key', 'the project')}, I can help you understand the status, roadmap, and progress. What specific aspect would you like to know more about?"
+                answer = f"Based on the previous context about {previous_context.get('project_key', 'the project')}, I can help you understand the status, roadmap, and progress. What specific aspect would you like to know more about?"
+        except Exception as e:
+            answer = f"I encountered an error while processing your question: {str(e)}"
+        return iter([answer]) if stream else answer
+    
+    def _stream_followup(self, chunks: Iterator[str]) -> Iterator[str]:
+        """Yield follow-up answer chunks, ending with an error note if the stream breaks."""
+        try:
+            yield from chunks
         except Exception as e:
-            return f"I encountered an error while processing your question: {str(e)}"
+            yield f"\n\nI encountered an error while processing your question: {str(e)}"
 
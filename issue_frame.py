@@ -0,0 +1,123 @@
+"""
+Issue Frame - Columnar pandas representation of a project's categorized issues.
+"""
+from typing import Dict, List, Optional, Any, Iterable
+import pandas as pd
+
+
+# Low-cardinality columns stored as pandas categoricals (small integer codes plus one copy of each label)
+CATEGORICAL_COLUMNS = ('bucket', 'status', 'assignee', 'priority')
+DATE_COLUMNS = ('created', 'updated', 'due_date')
+BUCKETS = ('epics', 'stories', 'tasks')
+
+
+class IssueFrameBuilder:
+    """Collects categorized issues column by column while they are being fetched."""
+
+    def __init__(self):
+        self._columns: Dict[str, List[Any]] = {
+            column: [] for column in ('key', 'summary', 'epic_name') + CATEGORICAL_COLUMNS + DATE_COLUMNS
+        }
+
+    def add(self, bucket: str, issue: Dict[str, Any]):
+        """Append one issue as produced by JiraDataFetcher._categorize_issue."""
+        columns = self._columns
+        columns['key'].append(issue.get('key'))
+        columns['summary'].append(issue.get('summary', ''))
+        # Only epics carry an Epic Name; other rows hold <NA>
+        columns['epic_name'].append(issue.get('epic_name'))
+        columns['bucket'].append(bucket)
+        columns['status'].append(issue.get('status', 'Unknown'))
+        columns['assignee'].append(issue.get('assignee', 'Unassigned'))
+        columns['priority'].append(issue.get('priority', 'Medium'))
+        for column in DATE_COLUMNS:
+            columns[column].append(issue.get(column) or None)
+
+    def build(self) -> 'IssueFrame':
+        """Convert the collected columns into an IssueFrame."""
+        columns = self._columns
+        data = {
+            'key': pd.Series(columns['key'], dtype='string'),
+            'summary': pd.Series(columns['summary'], dtype='string'),
+            'epic_name': pd.Series(columns['epic_name'], dtype='string')
+        }
+        for column in CATEGORICAL_COLUMNS:
+            data[column] = pd.Series(columns[column], dtype='category')
+        data['bucket'] = data['bucket'].cat.set_categories(BUCKETS)
+        for column in DATE_COLUMNS:
+            # Repeated strings are parsed once (to_datetime caches duplicates); stored as UTC
+            data[column] = pd.to_datetime(pd.Series(columns[column], dtype='object'),
+                                          utc=True, errors='coerce', format='mixed')
+        return IssueFrame(pd.DataFrame(data))
+
+
+class IssueFrame:
+    """
+    A project's issues as one pandas DataFrame with categorical status,
+    assignee, type bucket and priority columns and datetime64 dates.
+
+    Chart inputs (assignee x status) and epic listings are read from the
+    frame with vectorized crosstabs and filters; counts and overdue flags
+    come from ProjectMetrics, which delta syncs keep current incrementally.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        """
+        Initialize issue frame.
+
+        Args:
+            df: DataFrame with the columns produced by IssueFrameBuilder
+        """
+        self.df = df
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+    def apply_delta(self, removed_keys: Iterable[str], added: 'IssueFrame') -> 'IssueFrame':
+        """
+        New frame without the rows of removed_keys and with the rows of added
+        appended (changed issues are passed in both); this frame is left as is.
+        """
+        kept = self.df[~self.df['key'].isin(list(removed_keys))]
+        if not len(added):
+            # An empty frame's categoricals have object categories, which can't be unioned with str ones
+            return IssueFrame(kept.reset_index(drop=True))
+        data = {}
+        for column in kept.columns:
+            if column in CATEGORICAL_COLUMNS:
+                # Concatenating categoricals with different categories would fall back to object
+                combined = pd.api.types.union_categoricals([kept[column], added.df[column]])
+                data[column] = pd.Series(combined).cat.remove_unused_categories()
+            else:
+                data[column] = pd.concat([kept[column], added.df[column]], ignore_index=True)
+        data['bucket'] = data['bucket'].cat.set_categories(BUCKETS)
+        return IssueFrame(pd.DataFrame(data))
+
+    def epics(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Epic rows as plain dicts (key, summary, epic_name, status, assignee,
+        priority and due_date as 'YYYY-MM-DD' or ''), in fetch order.
+
+        Args:
+            limit: Return at most this many epics
+        """
+        df = self.df[self.df['bucket'] == 'epics']
+        if limit is not None:
+            df = df.head(limit)
+        epics = []
+        for row in df.itertuples(index=False):
+            epics.append({
+                'key': row.key,
+                'summary': row.summary,
+                'epic_name': '' if pd.isna(row.epic_name) else row.epic_name,
+                'status': row.status,
+                'assignee': row.assignee,
+                'priority': row.priority,
+                'due_date': '' if pd.isna(row.due_date) else row.due_date.strftime('%Y-%m-%d')
+            })
+        return epics
+
+    def assignee_status_table(self) -> pd.DataFrame:
+        """Assignee x status issue counts, assignees with the most issues first."""
+        table = pd.crosstab(self.df['assignee'], self.df['status'])
+        return table.loc[table.sum(axis=1).sort_values(ascending=False, kind='stable').index]
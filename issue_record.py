@@ -0,0 +1,102 @@
+"""
+Issue Record - Compact, read-only view of one categorized Jira issue.
+"""
+from typing import Dict, List, Optional, Any, Tuple
+import sys
+
+from adf_converter import adf_to_text
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    """Share one string object per distinct status/assignee/priority across all issues."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class Issue:
+    """
+    One issue as produced by JiraDataFetcher._categorize_issue.
+
+    Uses __slots__ instead of a per-issue dict, interns the repetitive
+    status/assignee/priority strings and keeps the description as raw ADF,
+    converting it to text only the first time `description` is read (the
+    summaries, metrics and charts never read it).
+
+    Supports the read-only dict protocol (`issue['key']`, `issue.get(...)`,
+    `'epic_name' in issue`) so code written against the former issue dicts
+    keeps working. `epic_name` is only present on epics; `parent_key` is None
+    for issues without a parent or epic link.
+    """
+
+    __slots__ = ('key', 'summary', 'status', 'assignee', 'created', 'updated',
+                 'priority', 'due_date', 'url', 'parent_key', 'blocked_by', 'epic_name',
+                 '_raw_description', '_description')
+
+    FIELDS = ('key', 'summary', 'status', 'assignee', 'created', 'updated',
+              'priority', 'due_date', 'description', 'url', 'parent_key', 'blocked_by', 'epic_name')
+
+    def __init__(self, key: str, summary: str, status: str, assignee: str, created: str,
+                 updated: str, priority: str, due_date: str, url: str,
+                 raw_description: Any = None, parent_key: Optional[str] = None,
+                 blocked_by: Tuple[str, ...] = (), epic_name: Optional[str] = None):
+        """
+        Initialize issue record.
+
+        Args:
+            raw_description: Description as returned by Jira (ADF document, string or None)
+            parent_key: Key of the parent issue or linked epic, if any
+            blocked_by: Keys of the issues blocking this one (from issue links)
+            epic_name: Epic Name field; pass only for epics
+        """
+        self.key = key
+        self.summary = summary
+        self.status = _intern(status)
+        self.assignee = _intern(assignee)
+        self.created = created
+        self.updated = updated
+        self.priority = _intern(priority)
+        self.due_date = due_date
+        self.url = url
+        self.parent_key = parent_key
+        self.blocked_by = blocked_by
+        if epic_name is not None:
+            self.epic_name = epic_name
+        self._raw_description = raw_description
+        self._description = None
+
+    @property
+    def description(self) -> str:
+        """Plain-text description, converted from ADF on first access."""
+        if self._description is None:
+            self._description = adf_to_text(self._raw_description, cache_key=(self.key, self.updated))
+            # The text replaces the document; nothing else reads the raw ADF
+            self._raw_description = None
+        return self._description
+
+    def __getitem__(self, name: str) -> Any:
+        if name not in self.FIELDS:
+            raise KeyError(name)
+        try:
+            return getattr(self, name)
+        except AttributeError:
+            raise KeyError(name) from None
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """Field value, or default if the field is not present."""
+        try:
+            return self[name]
+        except KeyError:
+            return default
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.FIELDS and (name == 'description' or hasattr(self, name))
+
+    def keys(self) -> List[str]:
+        """Names of the fields present on this issue."""
+        return [name for name in self.FIELDS if name in self]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict copy (decodes the description)."""
+        return {name: self[name] for name in self.keys()}
+
+    def __repr__(self) -> str:
+        return f"Issue({self.key!r}, status={self.status!r}, assignee={self.assignee!r})"
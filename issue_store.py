@@ -0,0 +1,260 @@
+"""
+Issue Store - Persistent local SQLite cache of Jira issues for delta syncs.
+"""
+from typing import Dict, List, Optional, Any, Iterable, Iterator
+from datetime import datetime, timezone
+import json
+import os
+import sqlite3
+import threading
+import uuid
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS issues (
+    key TEXT PRIMARY KEY,
+    project TEXT NOT NULL,
+    issue_type TEXT,
+    status TEXT,
+    assignee TEXT,
+    updated TEXT,
+    raw TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_issues_project ON issues(project);
+CREATE INDEX IF NOT EXISTS idx_issues_type ON issues(project, issue_type);
+CREATE INDEX IF NOT EXISTS idx_issues_status ON issues(project, status);
+CREATE INDEX IF NOT EXISTS idx_issues_assignee ON issues(project, assignee);
+CREATE INDEX IF NOT EXISTS idx_issues_updated ON issues(project, updated);
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    project TEXT PRIMARY KEY,
+    profile TEXT NOT NULL,
+    last_full_sync REAL NOT NULL,
+    last_sweep REAL NOT NULL,
+    watermark REAL,
+    fields_version INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS sync_generation (
+    project TEXT PRIMARY KEY,
+    generation INTEGER NOT NULL
+);
+"""
+
+# Columns added to sync_state after its first release, with their definitions
+SYNC_STATE_MIGRATIONS = {
+    'watermark': 'REAL',
+    'fields_version': 'INTEGER NOT NULL DEFAULT 0'
+}
+
+
+def _to_utc_iso(timestamp: Optional[str]) -> Optional[str]:
+    """Normalize a Jira timestamp ('2024-02-01T10:00:00.000+0100') to sortable UTC ISO text."""
+    if not timestamp:
+        return None
+    try:
+        parsed = datetime.strptime(timestamp, '%Y-%m-%dT%H:%M:%S.%f%z')
+    except ValueError:
+        try:
+            parsed = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%f')
+
+
+class IssueStore:
+    """
+    SQLite-backed store of raw Jira issues, keyed by issue key and indexed by
+    project, type, status, assignee and updated time.
+
+    The store only persists issues and per-project sync bookkeeping; deciding
+    when to run a full load, a delta sync or a key sweep is up to the caller
+    (see JiraDataFetcher).
+
+    Each project also has a sync generation that writers bump after changing
+    its issues. It is never reset (not even by clear_project), so any process
+    holding data derived from the store can tell whether another session has
+    written to the same database since.
+    """
+
+    def __init__(self, db_path: str = 'helios_issues.db', sweep_interval: float = 3600.0):
+        """
+        Initialize issue store.
+
+        Args:
+            db_path: Path to the SQLite database file (':memory:' for a throwaway store)
+            sweep_interval: Seconds between key sweeps that reconcile deleted/moved issues
+        """
+        self.db_path = db_path
+        self.sweep_interval = sweep_interval
+        # Stores opened on the same file share an identity; each in-memory store is unique
+        if db_path and db_path != ':memory:':
+            self.identity = os.path.abspath(db_path)
+        else:
+            self.identity = f':memory:{uuid.uuid4().hex}'
+        # One connection shared by fetch worker threads, serialized by a lock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.executescript(SCHEMA)
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(sync_state)")}
+            for column, definition in SYNC_STATE_MIGRATIONS.items():
+                if column not in columns:
+                    self._conn.execute(f"ALTER TABLE sync_state ADD COLUMN {column} {definition}")
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def get_sync_state(self, project_key: str) -> Optional[Dict[str, Any]]:
+        """Return sync bookkeeping for a project, or None if it was never loaded."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT profile, last_full_sync, last_sweep, watermark, fields_version "
+                "FROM sync_state WHERE project = ?",
+                (project_key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {'profile': row[0], 'last_full_sync': row[1], 'last_sweep': row[2], 'watermark': row[3],
+                'fields_version': row[4]}
+
+    def set_sync_state(self, project_key: str, profile: str, last_full_sync: float, last_sweep: float,
+                       watermark: Optional[float] = None, fields_version: int = 0):
+        """
+        Record sync bookkeeping for a project.
+
+        Args:
+            watermark: Epoch seconds from which the next delta sync fetches updated issues
+            fields_version: Version of the field profiles the stored issues were fetched with
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_state "
+                "(project, profile, last_full_sync, last_sweep, watermark, fields_version) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (project_key, profile, last_full_sync, last_sweep, watermark, fields_version)
+            )
+
+    def get_generation(self, project_key: str) -> int:
+        """Current sync generation of a project (0 if its issues were never written)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT generation FROM sync_generation WHERE project = ?", (project_key,)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def bump_generation(self, project_key: str) -> int:
+        """Mark a project's issues as changed; returns the new sync generation."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO sync_generation (project, generation) VALUES (?, 1) "
+                "ON CONFLICT(project) DO UPDATE SET generation = generation + 1",
+                (project_key,)
+            )
+            return self._conn.execute(
+                "SELECT generation FROM sync_generation WHERE project = ?", (project_key,)
+            ).fetchone()[0]
+
+    def get_watermark(self, project_key: str) -> Optional[datetime]:
+        """
+        Time (UTC) from which the next delta sync must fetch updated issues.
+
+        This is the recorded watermark of the last sync (its start time minus a
+        margin). Stores synced before watermarks were recorded fall back to the
+        latest stored `updated` time.
+        """
+        state = self.get_sync_state(project_key)
+        if state is not None and state['watermark'] is not None:
+            return datetime.fromtimestamp(state['watermark'], tz=timezone.utc)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MAX(updated) FROM issues WHERE project = ?", (project_key,)
+            ).fetchone()
+        if not row or not row[0]:
+            return None
+        return datetime.strptime(row[0], '%Y-%m-%dT%H:%M:%S.%f').replace(tzinfo=timezone.utc)
+
+    def upsert_issues(self, project_key: str, issues: Iterable[Dict]) -> int:
+        """Insert or replace raw Jira issues; returns the number written."""
+        rows = []
+        for issue in issues:
+            fields = issue.get('fields', {})
+            assignee = fields.get('assignee')
+            rows.append((
+                issue.get('key'),
+                project_key,
+                (fields.get('issuetype') or {}).get('name'),
+                (fields.get('status') or {}).get('name'),
+                assignee.get('displayName') if assignee else None,
+                _to_utc_iso(fields.get('updated')),
+                json.dumps(issue, separators=(',', ':'))
+            ))
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO issues (key, project, issue_type, status, assignee, updated, raw) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+        return len(rows)
+
+    def clear_project(self, project_key: str):
+        """Drop all stored issues and sync state for a project."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM issues WHERE project = ?", (project_key,))
+            self._conn.execute("DELETE FROM sync_state WHERE project = ?", (project_key,))
+
+    def delete_missing(self, project_key: str, live_keys: Iterable[str]) -> List[Dict]:
+        """Delete stored issues of a project whose keys are not in live_keys; returns the deleted raw issues."""
+        live = set(live_keys)
+        with self._lock:
+            stored = [row[0] for row in self._conn.execute(
+                "SELECT key FROM issues WHERE project = ?", (project_key,))]
+        stale = [key for key in stored if key not in live]
+        if not stale:
+            return []
+        deleted = list(self.get_issues(project_key, stale).values())
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM issues WHERE key = ?", [(key,) for key in stale])
+        return deleted
+
+    def get_issues(self, project_key: str, keys: Iterable[str], batch_size: int = 500) -> Dict[str, Dict]:
+        """Stored raw issues of a project for the given keys (missing keys are left out)."""
+        keys = list(keys)
+        found = {}
+        for start in range(0, len(keys), batch_size):
+            batch = keys[start:start + batch_size]
+            placeholders = ', '.join('?' * len(batch))
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT key, raw FROM issues WHERE project = ? AND key IN ({placeholders})",
+                    [project_key] + batch
+                ).fetchall()
+            for key, raw in rows:
+                found[key] = json.loads(raw)
+        return found
+
+    def count_issues(self, project_key: str) -> int:
+        """Number of stored issues for a project."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM issues WHERE project = ?", (project_key,)
+            ).fetchone()[0]
+
+    def iter_issues(self, project_key: str, batch_size: int = 500) -> Iterator[Dict]:
+        """Yield stored raw issues of a project in key order, decoding one batch at a time."""
+        last_key = ''
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT key, raw FROM issues WHERE project = ? AND key > ? ORDER BY key LIMIT ?",
+                    (project_key, last_key, batch_size)
+                ).fetchall()
+            if not rows:
+                return
+            for key, raw in rows:
+                yield json.loads(raw)
+            last_key = rows[-1][0]
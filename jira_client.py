@@ -2,15 +2,236 @@
 Jira API Client for interacting with Jira issues, projects, and workflows.
 """
 import requests
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Iterator, AsyncIterator, Iterable, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+import asyncio
 import json
+import re
+import threading
+import time
+import urllib.parse
+import weakref
+from rate_limiter import TokenBucket
+from response_cache import ResponseCache
+
+# Conditional import for the async client
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+# Responses worth retrying: throttling and transient server-side failures
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+# Only methods that are safe to send twice are retried
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS"}
+# Upper bound for a single backoff sleep, even if Retry-After asks for more
+MAX_BACKOFF_SECONDS = 60.0
+# Essential fields requested by issue searches
+SEARCH_FIELDS = "key,summary,issuetype,status,assignee,created,updated,priority,description,duedate"
+# Named field projections for searches, so callers only pay for what they render.
+# 'metrics' covers status summaries and charts, 'roadmap' adds what the roadmap lists,
+# 'full' is everything including ADF descriptions and the names/schema expansion.
+# customfield_10011 is Epic Name; parent and customfield_10014 (Epic Link) tie issues to epics;
+# issuelinks carries the blocks/depends-on links used for dependency analysis.
+FIELD_PROFILES = {
+    'metrics': {
+        'fields': "key,issuetype,status,assignee,duedate,updated",
+        'expand': None
+    },
+    'roadmap': {
+        'fields': "key,summary,issuetype,status,assignee,created,updated,priority,duedate,customfield_10011,"
+                  "parent,customfield_10014,issuelinks",
+        'expand': None
+    },
+    'full': {
+        'fields': SEARCH_FIELDS + ",customfield_10011,parent,customfield_10014,issuelinks",
+        'expand': "names,schema"
+    }
+}
+# Default memory bound for cached GET responses revalidated with ETag/Last-Modified
+DEFAULT_CACHE_BYTES = 32 * 1024 * 1024
+# Page size for /search/jql; Jira clamps larger values when issue fields are requested
+DEFAULT_PAGE_SIZE = 100
+# Keep bulk-fetch search URLs well under common proxy/server URL limits
+MAX_URL_LENGTH = 6000
+# Concurrent batches used by get_issues and create_issues_bulk
+BULK_FETCH_WORKERS = 4
+# Jira accepts at most 50 issues per bulk-create request
+BULK_CREATE_SIZE = 50
+# Issues per bulk changelog request (Jira's limit is 1000)
+CHANGELOG_BATCH_SIZE = 1000
+ISSUE_KEY_PATTERN = re.compile(r'^[A-Z][A-Z0-9_]*-\d+$')
+# Expansions requested by get_issue_with_comments
+ISSUE_DETAIL_EXPAND = "renderedFields,names,schema,transitions,operations,editmeta,changelog,versionedRepresentations"
+
+# Per-event-loop semaphores capping in-flight async requests per Jira host
+_HOST_SEMAPHORES: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = weakref.WeakKeyDictionary()
+
+
+def _retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def _backoff_delay(attempt: int, backoff_factor: float, retry_after: Optional[str] = None) -> float:
+    """Seconds to wait before retry number ``attempt + 1``."""
+    delay = _retry_after_seconds(retry_after)
+    if delay is None:
+        delay = backoff_factor * (2 ** attempt)
+    return min(delay, MAX_BACKOFF_SECONDS)
+
+
+def _resource_marker(endpoint: str) -> Optional[str]:
+    """URL fragment of the resource an endpoint touches ('issue/PROJ-1/comment' -> '/rest/api/3/issue/PROJ-1')."""
+    segments = endpoint.split('?', 1)[0].split('/')
+    if len(segments) < 2:
+        return None
+    return f"/rest/api/3/{segments[0]}/{segments[1]}"
+
+
+def _key_batches(keys: Iterable[str], fields: Any, expand: Optional[str]) -> Tuple[List[List[str]], Dict[str, str]]:
+    """
+    Split issue keys into `key in (...)` batches whose search URL stays under
+    MAX_URL_LENGTH and whose results fit in one page.
+    
+    Returns:
+        (batches, errors for malformed keys)
+    """
+    batches = []
+    errors = {}
+    batch = []
+    seen = set()
+    for key in keys:
+        key = key.strip().upper()
+        if key in seen:
+            continue
+        seen.add(key)
+        if not ISSUE_KEY_PATTERN.match(key):
+            errors[key] = "Malformed issue key"
+            continue
+        candidate = batch + [key]
+        endpoint = _search_endpoint(f"key in ({','.join(candidate)})", len(candidate), expand, None, fields)
+        if batch and (len(endpoint) > MAX_URL_LENGTH or len(candidate) > DEFAULT_PAGE_SIZE):
+            batches.append(batch)
+            candidate = [key]
+        batch = candidate
+    if batch:
+        batches.append(batch)
+    return batches, errors
+
+
+def _bulk_create_result(chunk_start: int, chunk_len: int, response: Dict,
+                        created: List[Optional[Dict]], errors: Dict[int, str]):
+    """Spread one issue/bulk response over the overall result lists (by input index)."""
+    failed = {}
+    for error in response.get('errors', []):
+        element_errors = error.get('elementErrors', {})
+        message = '; '.join(list(element_errors.get('errors', {}).values())
+                            + element_errors.get('errorMessages', [])) or f"HTTP {error.get('status')}"
+        failed[error.get('failedElementNumber')] = message
+    # Created issues are returned in request order, skipping failed elements
+    successes = iter(response.get('issues', []))
+    for offset in range(chunk_len):
+        if offset in failed:
+            errors[chunk_start + offset] = failed[offset]
+        else:
+            created[chunk_start + offset] = next(successes, None)
+
+
+def _issue_query(fields: Any, expand: Optional[str]) -> str:
+    """Query string selecting fields/expansions for a single-issue GET."""
+    params = []
+    if fields:
+        params.append(f"fields={fields if isinstance(fields, str) else ','.join(fields)}")
+    if expand:
+        params.append(f"expand={expand}")
+    return f"?{'&'.join(params)}" if params else ""
+
+
+def _adf_document(text: str) -> Dict:
+    """Wrap plain text in a single-paragraph Atlassian Document Format body."""
+    return {
+        "type": "doc",
+        "version": 1,
+        "content": [
+            {
+                "type": "paragraph",
+                "content": [{"type": "text", "text": text}]
+            }
+        ]
+    }
+
+
+def _issue_payload(project_key: str, summary: str, description: str,
+                   issue_type: str, extra_fields: Dict) -> Dict:
+    """Build the request body for creating an issue."""
+    data = {
+        "fields": {
+            "project": {"key": project_key},
+            "summary": summary,
+            "description": _adf_document(description),
+            "issuetype": {"name": issue_type}
+        }
+    }
+    # Add any additional fields
+    for key, value in extra_fields.items():
+        data["fields"][key] = value
+    return data
+
+
+def _search_endpoint(jql: str, max_results: int, expand: Optional[str] = None,
+                     next_token: Optional[str] = None, fields: Any = None,
+                     profile: Optional[str] = None) -> str:
+    """
+    Build a /search/jql endpoint (required as of Jira API v3) for one page.
+    
+    Explicit fields/expand win over the named profile; with neither given the
+    'full' profile is used.
+    """
+    if profile is None and fields is None:
+        profile = 'full'
+    if profile is not None:
+        if profile not in FIELD_PROFILES:
+            raise ValueError(f"Unknown field profile '{profile}'. Use one of: {', '.join(FIELD_PROFILES)}")
+        fields = fields or FIELD_PROFILES[profile]['fields']
+        expand = expand or FIELD_PROFILES[profile]['expand']
+    if not isinstance(fields, str):
+        fields = ",".join(fields)
+    endpoint = f"search/jql?jql={urllib.parse.quote(jql)}&maxResults={max_results}"
+    if next_token:
+        endpoint += f"&nextPageToken={urllib.parse.quote(next_token)}"
+    endpoint += f"&fields={fields}"
+    if expand:
+        endpoint += f"&expand={expand}"
+    return endpoint
 
 
 class JiraClient:
     """Client for interacting with Jira API."""
     
-    def __init__(self, base_url: str, email: str, api_token: str):
+    def __init__(self, base_url: str, email: str, api_token: str,
+                 pool_size: int = 10, max_retries: int = 3,
+                 backoff_factor: float = 0.5, timeout: float = 30.0,
+                 rate_limiter: Optional[TokenBucket] = None,
+                 cache_bytes: int = DEFAULT_CACHE_BYTES):
         """
         Initialize Jira client.
         
@@ -18,126 +239,303 @@ class JiraClient:
             base_url: Jira instance URL (e.g., 'https://your-domain.atlassian.net')
             email: Your Jira email address
             api_token: Jira API token (generate from https://id.atlassian.com/manage-profile/security/api-tokens)
+            pool_size: Maximum number of keep-alive connections kept open to Jira
+            max_retries: Retries for idempotent requests on 429/5xx and connection errors
+            backoff_factor: Base delay in seconds for exponential backoff (doubled per retry)
+            timeout: Per-request timeout in seconds
+            rate_limiter: Shared token bucket taken from before every request (and retry)
+            cache_bytes: Memory bound for the conditional GET response cache (0 disables it)
         """
         self.base_url = base_url.rstrip('/')
         self.email = email
         self.api_token = api_token
+        self.rate_limiter = rate_limiter
+        self.response_cache = ResponseCache(cache_bytes) if cache_bytes else None
         self.auth = HTTPBasicAuth(email, api_token)
         self.headers = {
             "Accept": "application/json",
             "Content-Type": "application/json"
         }
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.timeout = timeout
+        # Response body bytes received; shared by all threads using this client
+        self.bytes_received = 0
+        self._stats_lock = threading.Lock()
+        
+        # One pooled session per client so paginated calls reuse TCP+TLS connections
+        self.session = requests.Session()
+        self.session.auth = self.auth
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
     
-    def _make_request(self, method: str, endpoint: str, data: Optional[Dict] = None) -> Dict:
-        """Make HTTP request to Jira API."""
+    def close(self):
+        """Close pooled connections."""
+        self.session.close()
+    
+    def _make_request(self, method: str, endpoint: str, data: Optional[Dict] = None,
+                      idempotent: Optional[bool] = None) -> Dict:
+        """
+        Make HTTP request to Jira API, retrying idempotent requests on throttling and 5xx.
+        
+        GETs are revalidated against the response cache; a 304 returns the cached body.
+        Successful writes invalidate cached responses of the resource they touched.
+        Read-only POST endpoints pass idempotent=True to get retries and skip invalidation.
+        """
         # Use API v3 (v2 search endpoint has been deprecated)
         url = f"{self.base_url}/rest/api/3/{endpoint}"
-        try:
-            response = requests.request(
-                method=method,
-                url=url,
-                headers=self.headers,
-                auth=self.auth,
-                json=data
-            )
-            response.raise_for_status()
-            return response.json() if response.content else {}
-        except requests.exceptions.RequestException as e:
-            raise Exception(f"Jira API request failed: {str(e)}")
+        retryable = method.upper() in IDEMPOTENT_METHODS if idempotent is None else idempotent
+        cache = self.response_cache if method.upper() == "GET" else None
+        attempt = 0
+        conditional = True
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            headers = cache.conditional_headers(url) if cache is not None and conditional else None
+            try:
+                response = self.session.request(
+                    method=method,
+                    url=url,
+                    json=data,
+                    headers=headers,
+                    timeout=self.timeout
+                )
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if not retryable or attempt >= self.max_retries:
+                    raise Exception(f"Jira API request failed: {str(e)}")
+                time.sleep(_backoff_delay(attempt, self.backoff_factor))
+                attempt += 1
+                continue
+            except requests.exceptions.RequestException as e:
+                raise Exception(f"Jira API request failed: {str(e)}")
+            
+            if retryable and response.status_code in RETRY_STATUS_CODES and attempt < self.max_retries:
+                time.sleep(_backoff_delay(attempt, self.backoff_factor,
+                                          response.headers.get("Retry-After")))
+                attempt += 1
+                continue
+            
+            if cache is not None and response.status_code == 304:
+                try:
+                    return cache.revalidated(url)
+                except KeyError:
+                    # Evicted by another thread since the validators were sent
+                    conditional = False
+                    continue
+            
+            with self._stats_lock:
+                self.bytes_received += len(response.content)
+            
+            try:
+                response.raise_for_status()
+                body = response.json() if response.content else {}
+            except requests.exceptions.RequestException as e:
+                raise Exception(f"Jira API request failed: {str(e)}")
+            if cache is not None:
+                cache.store(url, response.headers, body, len(response.content))
+            elif not retryable and self.response_cache is not None and _resource_marker(endpoint):
+                self.response_cache.invalidate(_resource_marker(endpoint))
+            return body
     
     def get_issue(self, issue_key: str) -> Dict:
         """Get details of a specific issue."""
         return self._make_request("GET", f"issue/{issue_key}")
     
+    def get_current_user(self) -> Dict:
+        """Get the authenticated user (including their time zone, used to interpret JQL dates)."""
+        return self._make_request("GET", "myself")
+    
     def create_issue(self, project_key: str, summary: str, description: str, 
                      issue_type: str = "Task", **kwargs) -> Dict:
         """Create a new Jira issue."""
-        data = {
-            "fields": {
-                "project": {"key": project_key},
-                "summary": summary,
-                "description": {
-                    "type": "doc",
-                    "version": 1,
-                    "content": [
-                        {
-                            "type": "paragraph",
-                            "content": [{"type": "text", "text": description}]
-                        }
-                    ]
-                },
-                "issuetype": {"name": issue_type}
-            }
-        }
-        # Add any additional fields
-        for key, value in kwargs.items():
-            data["fields"][key] = value
-        
+        data = _issue_payload(project_key, summary, description, issue_type, kwargs)
         return self._make_request("POST", "issue", data=data)
     
+    def create_issues_bulk(self, project_key: str, issues: List[Dict],
+                           max_workers: int = BULK_FETCH_WORKERS) -> Dict[str, Any]:
+        """
+        Create many issues with Jira's bulk-create endpoint, 50 per request, chunks in parallel.
+        
+        Args:
+            project_key: Project to create the issues in
+            issues: Dicts with 'summary', 'description', optional 'issue_type' (default
+                'Task') and optional 'fields' (extra Jira fields, e.g. parent or priority)
+            max_workers: Chunks created concurrently
+        
+        Returns:
+            {'created': [issue ref or None, in input order], 'errors': {input index: message}}
+        """
+        payloads = [_issue_payload(project_key, issue['summary'], issue.get('description', ''),
+                                   issue.get('issue_type', 'Task'), issue.get('fields', {}))
+                    for issue in issues]
+        chunks = [(start, payloads[start:start + BULK_CREATE_SIZE])
+                  for start in range(0, len(payloads), BULK_CREATE_SIZE)]
+        created: List[Optional[Dict]] = [None] * len(payloads)
+        errors: Dict[int, str] = {}
+        
+        def create_chunk(chunk):
+            start, chunk_payloads = chunk
+            try:
+                return self._make_request("POST", "issue/bulk", data={"issueUpdates": chunk_payloads})
+            except Exception as e:
+                return {'errors': [{'failedElementNumber': i, 'elementErrors': {'errorMessages': [str(e)]}}
+                                   for i in range(len(chunk_payloads))]}
+        
+        if chunks:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+                for (start, chunk_payloads), response in zip(chunks, executor.map(create_chunk, chunks)):
+                    _bulk_create_result(start, len(chunk_payloads), response, created, errors)
+        return {'created': created, 'errors': errors}
+    
     def update_issue(self, issue_key: str, fields: Dict) -> Dict:
         """Update an existing issue."""
         data = {"fields": fields}
         return self._make_request("PUT", f"issue/{issue_key}", data=data)
     
-    def search_issues(self, jql: str, max_results: int = 50, expand: str = None) -> List[Dict]:
+    def iter_issue_pages(self, jql: str, fields: Any = None, page_size: int = DEFAULT_PAGE_SIZE,
+                         expand: str = None, profile: Optional[str] = None) -> Iterator[List[Dict]]:
+        """
+        Yield pages of issues matching a JQL query, following nextPageToken lazily.
+        
+        The next page is requested only when the caller asks for it, so a consumer
+        that processes and drops each page keeps memory flat regardless of result size.
+        
+        Args:
+            jql: JQL query
+            fields: Fields to request, as a list or comma-separated string
+            page_size: Issues requested per page
+            expand: Expansions to request
+            profile: Named projection from FIELD_PROFILES ('metrics', 'roadmap', 'full');
+                used when fields/expand are not given, defaulting to 'full'
+        """
+        next_token = None
+        while True:
+            response = self._make_request("GET", _search_endpoint(jql, page_size, expand, next_token, fields, profile))
+            # The /search/jql endpoint returns: {'issues': [...], 'nextPageToken': ..., 'isLast': ...}
+            if not isinstance(response, dict):
+                return
+            issues = response.get("issues", [])
+            if issues:
+                yield issues
+            next_token = response.get('nextPageToken') if not response.get('isLast', True) else None
+            if not next_token:
+                return
+    
+    def iter_issues(self, jql: str, fields: Any = None, page_size: int = DEFAULT_PAGE_SIZE,
+                    expand: str = None, profile: Optional[str] = None) -> Iterator[Dict]:
+        """Yield issues matching a JQL query one at a time, fetching a page at a time."""
+        for page in self.iter_issue_pages(jql, fields=fields, page_size=page_size,
+                                          expand=expand, profile=profile):
+            yield from page
+    
+    def search_issues(self, jql: str, max_results: int = 50, expand: str = None,
+                      profile: str = 'full') -> List[Dict]:
         """Search issues using JQL (Jira Query Language)."""
-        # Use the new /search/jql endpoint (required as of Jira API v3)
-        import urllib.parse
-        jql_encoded = urllib.parse.quote(jql)
+        page_size = min(max_results, DEFAULT_PAGE_SIZE)
+        issues = self.iter_issues(jql, page_size=page_size, expand=expand, profile=profile)
+        return list(islice(issues, max_results))
+    
+    def get_issues(self, keys: Iterable[str], fields: Any = "*all", expand: str = None,
+                   max_workers: int = BULK_FETCH_WORKERS) -> Dict[str, Dict]:
+        """
+        Fetch many issues by key with a handful of `key in (...)` searches run concurrently.
         
-        # Request essential fields for the search
-        fields = "key,summary,issuetype,status,assignee,created,updated,priority,description,duedate"
-        endpoint = f"search/jql?jql={jql_encoded}&maxResults={max_results}&fields={fields}"
+        If Jira rejects a batch (e.g. one key does not exist), that batch falls back
+        to per-key requests so the failure is isolated to the offending keys.
         
-        if expand:
-            endpoint += f"&expand={expand}"
-        else:
-            # Get essential expanded fields
-            endpoint += "&expand=names,schema"
+        Args:
+            keys: Issue keys (normalized to upper case; duplicates are fetched once)
+            fields: Fields to request, as a list or comma-separated string (default: all)
+            expand: Expansions to request
+            max_workers: Batches fetched concurrently
         
-        response = self._make_request("GET", endpoint)
+        Returns:
+            {'issues': {key: issue}, 'errors': {key: error message}}
+        """
+        batches, errors = _key_batches(keys, fields, expand)
+        issues = {}
         
-        # The /search/jql endpoint returns: {'issues': [...], 'nextPageToken': ..., 'isLast': ...}
-        if isinstance(response, dict):
-            issues = response.get("issues", [])
-            # Handle pagination if needed
-            if not response.get('isLast', True) and len(issues) < max_results:
-                # Fetch more pages if needed (up to max_results)
-                next_token = response.get('nextPageToken')
-                while next_token and len(issues) < max_results:
-                    page_endpoint = f"search/jql?jql={jql_encoded}&maxResults={max_results}&nextPageToken={next_token}&fields={fields}"
-                    if expand:
-                        page_endpoint += f"&expand={expand}"
-                    else:
-                        page_endpoint += "&expand=names,schema"
-                    page_response = self._make_request("GET", page_endpoint)
-                    if isinstance(page_response, dict):
-                        issues.extend(page_response.get("issues", []))
-                        next_token = page_response.get('nextPageToken') if not page_response.get('isLast', True) else None
-                    else:
-                        break
-            return issues
-        return []
+        def fetch_batch(batch):
+            try:
+                found = {issue.get('key'): issue for issue in
+                         self.iter_issues(f"key in ({','.join(batch)})", fields=fields,
+                                          page_size=len(batch), expand=expand)}
+                return found, {}
+            except Exception:
+                found, failed = {}, {}
+                for key in batch:
+                    try:
+                        found[key] = self._make_request("GET", f"issue/{key}{_issue_query(fields, expand)}")
+                    except Exception as e:
+                        failed[key] = str(e)
+                return found, failed
+        
+        if batches:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(batches))) as executor:
+                for batch, (found, failed) in zip(batches, executor.map(fetch_batch, batches)):
+                    errors.update(failed)
+                    for key in batch:
+                        if key in found:
+                            issues[key] = found[key]
+                        elif key not in failed:
+                            errors[key] = "Issue not found or not visible"
+        return {'issues': issues, 'errors': errors}
+    
+    def search_users(self, query: str) -> List[Dict]:
+        """Find users by display name or email."""
+        response = self._make_request("GET", f"user/search?query={urllib.parse.quote(query)}")
+        return response if isinstance(response, list) else []
+    
+    def count_issues(self, jql: str) -> int:
+        """Approximate number of issues matching a JQL query, without fetching any issue bodies."""
+        response = self._make_request("POST", "search/approximate-count", data={"jql": jql}, idempotent=True)
+        return int(response.get("count", 0))
+    
+    def iter_changelogs(self, issue_ids_or_keys: Iterable[str],
+                        field_ids: Iterable[str] = ('status',)) -> Iterator[Dict]:
+        """
+        Stream issue changelogs with Jira's bulk changelog endpoint.
+        
+        Issues are requested 1000 at a time and each batch is paged with
+        nextPageToken, so changelogs are never fetched one issue at a time.
+        
+        Args:
+            issue_ids_or_keys: Issues whose changelogs to fetch
+            field_ids: Only return changes to these fields
+        
+        Yields:
+            {'issueId': ..., 'changeHistories': [...]} entries (histories of one
+            issue can be split across several entries)
+        """
+        issues = list(issue_ids_or_keys)
+        for start in range(0, len(issues), CHANGELOG_BATCH_SIZE):
+            body = {
+                "issueIdsOrKeys": issues[start:start + CHANGELOG_BATCH_SIZE],
+                "fieldIds": list(field_ids),
+                "maxResults": CHANGELOG_BATCH_SIZE
+            }
+            while True:
+                response = self._make_request("POST", "changelog/bulkfetch", data=body, idempotent=True)
+                yield from response.get("issueChangeLogs", [])
+                next_token = response.get("nextPageToken")
+                if not next_token:
+                    break
+                body = {**body, "nextPageToken": next_token}
+    
+    def get_project_statuses(self, project_key: str) -> List[Dict]:
+        """Get the issue types of a project, each with the statuses of its workflow."""
+        response = self._make_request("GET", f"project/{project_key}/statuses")
+        return response if isinstance(response, list) else []
     
     def get_issue_with_comments(self, issue_key: str) -> Dict:
         """Get issue details including comments."""
-        return self._make_request("GET", f"issue/{issue_key}?expand=renderedFields,names,schema,transitions,operations,editmeta,changelog,versionedRepresentations")
+        return self._make_request("GET", f"issue/{issue_key}?expand={ISSUE_DETAIL_EXPAND}")
     
     def add_comment(self, issue_key: str, comment: str) -> Dict:
         """Add a comment to an issue."""
-        data = {
-            "body": {
-                "type": "doc",
-                "version": 1,
-                "content": [
-                    {
-                        "type": "paragraph",
-                        "content": [{"type": "text", "text": comment}]
-                    }
-                ]
-            }
-        }
+        data = {"body": _adf_document(comment)}
         return self._make_request("POST", f"issue/{issue_key}/comment", data=data)
     
     def get_projects(self) -> List[Dict]:
@@ -188,3 +586,341 @@ class JiraClient:
         response = self._make_request("GET", f"issue/{issue_key}/transitions")
         return response.get("transitions", [])
 
+
+
+class AsyncJiraClient:
+    """Asyncio counterpart to JiraClient built on aiohttp.
+    
+    Exposes the same methods as JiraClient as coroutines. In-flight requests are
+    capped per Jira host by a semaphore shared by every client on the same event
+    loop, so one worker can fan out across many projects and issue keys without
+    overrunning Jira.
+    """
+    
+    def __init__(self, base_url: str, email: str, api_token: str,
+                 max_concurrency: int = 10, max_retries: int = 3,
+                 backoff_factor: float = 0.5, timeout: float = 30.0,
+                 rate_limiter: Optional[TokenBucket] = None,
+                 cache_bytes: int = DEFAULT_CACHE_BYTES):
+        """
+        Initialize async Jira client.
+        
+        Args:
+            base_url: Jira instance URL (e.g., 'https://your-domain.atlassian.net')
+            email: Your Jira email address
+            api_token: Jira API token
+            max_concurrency: Maximum in-flight requests to this Jira host
+            max_retries: Retries for idempotent requests on 429/5xx and connection errors
+            backoff_factor: Base delay in seconds for exponential backoff (doubled per retry)
+            timeout: Per-request timeout in seconds
+            rate_limiter: Shared token bucket taken from before every request (and retry)
+            cache_bytes: Memory bound for the conditional GET response cache (0 disables it)
+        """
+        if not AIOHTTP_AVAILABLE:
+            raise ImportError("aiohttp package not installed. Install with: pip install aiohttp")
+        self.base_url = base_url.rstrip('/')
+        self.email = email
+        self.api_token = api_token
+        self.rate_limiter = rate_limiter
+        self.response_cache = ResponseCache(cache_bytes) if cache_bytes else None
+        self.auth = aiohttp.BasicAuth(email, api_token)
+        self.headers = {
+            "Accept": "application/json",
+            "Content-Type": "application/json"
+        }
+        self.host = urllib.parse.urlsplit(self.base_url).netloc
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.timeout = timeout
+        self._session = None
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
+    async def close(self):
+        """Close the underlying HTTP session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+    
+    def _get_session(self) -> "aiohttp.ClientSession":
+        """Create the HTTP session lazily, inside the running event loop."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit_per_host=self.max_concurrency)
+            self._session = aiohttp.ClientSession(
+                auth=self.auth,
+                headers=self.headers,
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return self._session
+    
+    def _host_semaphore(self) -> asyncio.Semaphore:
+        """Semaphore shared by all clients talking to this host on the running loop."""
+        loop_semaphores = _HOST_SEMAPHORES.setdefault(asyncio.get_running_loop(), {})
+        if self.host not in loop_semaphores:
+            loop_semaphores[self.host] = asyncio.Semaphore(self.max_concurrency)
+        return loop_semaphores[self.host]
+    
+    async def _make_request(self, method: str, endpoint: str, data: Optional[Dict] = None,
+                            idempotent: Optional[bool] = None) -> Any:
+        """
+        Make HTTP request to Jira API, retrying idempotent requests on throttling and 5xx.
+        
+        GETs are revalidated against the response cache; a 304 returns the cached body.
+        Successful writes invalidate cached responses of the resource they touched.
+        Read-only POST endpoints pass idempotent=True to get retries and skip invalidation.
+        """
+        url = f"{self.base_url}/rest/api/3/{endpoint}"
+        retryable = method.upper() in IDEMPOTENT_METHODS if idempotent is None else idempotent
+        cache = self.response_cache if method.upper() == "GET" else None
+        session = self._get_session()
+        semaphore = self._host_semaphore()
+        attempt = 0
+        conditional = True
+        while True:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async()
+            headers = cache.conditional_headers(url) if cache is not None and conditional else None
+            # The semaphore is held only while a request is on the wire, never during backoff
+            delay = None
+            evicted = False
+            async with semaphore:
+                try:
+                    async with session.request(method, url, json=data, headers=headers) as response:
+                        if retryable and response.status in RETRY_STATUS_CODES and attempt < self.max_retries:
+                            delay = _backoff_delay(attempt, self.backoff_factor,
+                                                   response.headers.get("Retry-After"))
+                        elif cache is not None and response.status == 304:
+                            try:
+                                return cache.revalidated(url)
+                            except KeyError:
+                                # Evicted since the validators were sent; ask again unconditionally
+                                conditional = False
+                                evicted = True
+                                delay = 0
+                        else:
+                            response.raise_for_status()
+                            raw = await response.read()
+                            body = json.loads(raw) if raw else {}
+                            if cache is not None:
+                                cache.store(url, response.headers, body, len(raw))
+                            elif not retryable and self.response_cache is not None and _resource_marker(endpoint):
+                                self.response_cache.invalidate(_resource_marker(endpoint))
+                            return body
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                    if not retryable or attempt >= self.max_retries:
+                        raise Exception(f"Jira API request failed: {str(e)}")
+                    delay = _backoff_delay(attempt, self.backoff_factor)
+                except aiohttp.ClientError as e:
+                    raise Exception(f"Jira API request failed: {str(e)}")
+            await asyncio.sleep(delay)
+            if not evicted:
+                attempt += 1
+    
+    async def get_issue(self, issue_key: str) -> Dict:
+        """Get details of a specific issue."""
+        return await self._make_request("GET", f"issue/{issue_key}")
+    
+    async def get_current_user(self) -> Dict:
+        """Get the authenticated user (including their time zone, used to interpret JQL dates)."""
+        return await self._make_request("GET", "myself")
+    
+    async def create_issue(self, project_key: str, summary: str, description: str,
+                           issue_type: str = "Task", **kwargs) -> Dict:
+        """Create a new Jira issue."""
+        data = _issue_payload(project_key, summary, description, issue_type, kwargs)
+        return await self._make_request("POST", "issue", data=data)
+    
+    async def create_issues_bulk(self, project_key: str, issues: List[Dict]) -> Dict[str, Any]:
+        """
+        Create many issues with Jira's bulk-create endpoint, 50 per request, chunks concurrently.
+        
+        Returns:
+            {'created': [issue ref or None, in input order], 'errors': {input index: message}}
+        """
+        payloads = [_issue_payload(project_key, issue['summary'], issue.get('description', ''),
+                                   issue.get('issue_type', 'Task'), issue.get('fields', {}))
+                    for issue in issues]
+        chunks = [(start, payloads[start:start + BULK_CREATE_SIZE])
+                  for start in range(0, len(payloads), BULK_CREATE_SIZE)]
+        created: List[Optional[Dict]] = [None] * len(payloads)
+        errors: Dict[int, str] = {}
+        responses = await asyncio.gather(*[
+            self._make_request("POST", "issue/bulk", data={"issueUpdates": chunk_payloads})
+            for _, chunk_payloads in chunks
+        ], return_exceptions=True)
+        for (start, chunk_payloads), response in zip(chunks, responses):
+            if isinstance(response, Exception):
+                response = {'errors': [{'failedElementNumber': i, 'elementErrors': {'errorMessages': [str(response)]}}
+                                       for i in range(len(chunk_payloads))]}
+            _bulk_create_result(start, len(chunk_payloads), response, created, errors)
+        return {'created': created, 'errors': errors}
+    
+    async def update_issue(self, issue_key: str, fields: Dict) -> Dict:
+        """Update an existing issue."""
+        data = {"fields": fields}
+        return await self._make_request("PUT", f"issue/{issue_key}", data=data)
+    
+    async def iter_issue_pages(self, jql: str, fields: Any = None, page_size: int = DEFAULT_PAGE_SIZE,
+                               expand: str = None, profile: Optional[str] = None) -> AsyncIterator[List[Dict]]:
+        """Yield pages of issues matching a JQL query, following nextPageToken lazily."""
+        next_token = None
+        while True:
+            response = await self._make_request("GET", _search_endpoint(jql, page_size, expand, next_token, fields, profile))
+            if not isinstance(response, dict):
+                return
+            issues = response.get("issues", [])
+            if issues:
+                yield issues
+            next_token = response.get('nextPageToken') if not response.get('isLast', True) else None
+            if not next_token:
+                return
+    
+    async def iter_issues(self, jql: str, fields: Any = None, page_size: int = DEFAULT_PAGE_SIZE,
+                          expand: str = None, profile: Optional[str] = None) -> AsyncIterator[Dict]:
+        """Yield issues matching a JQL query one at a time, fetching a page at a time."""
+        async for page in self.iter_issue_pages(jql, fields=fields, page_size=page_size,
+                                             expand=expand, profile=profile):
+            for issue in page:
+                yield issue
+    
+    async def search_issues(self, jql: str, max_results: int = 50, expand: str = None,
+                            profile: str = 'full') -> List[Dict]:
+        """Search issues using JQL (Jira Query Language)."""
+        issues = []
+        page_size = min(max_results, DEFAULT_PAGE_SIZE)
+        async for issue in self.iter_issues(jql, page_size=page_size, expand=expand, profile=profile):
+            issues.append(issue)
+            if len(issues) >= max_results:
+                break
+        return issues
+    
+    async def get_issues(self, keys: Iterable[str], fields: Any = "*all", expand: str = None) -> Dict[str, Dict]:
+        """
+        Fetch many issues by key with a handful of `key in (...)` searches run concurrently.
+        
+        Returns:
+            {'issues': {key: issue}, 'errors': {key: error message}}
+        """
+        batches, errors = _key_batches(keys, fields, expand)
+        issues = {}
+        
+        async def fetch_batch(batch):
+            try:
+                found = {}
+                async for issue in self.iter_issues(f"key in ({','.join(batch)})", fields=fields,
+                                                    page_size=len(batch), expand=expand):
+                    found[issue.get('key')] = issue
+                return found, {}
+            except Exception:
+                found, failed = {}, {}
+                results = await asyncio.gather(*[
+                    self._make_request("GET", f"issue/{key}{_issue_query(fields, expand)}") for key in batch
+                ], return_exceptions=True)
+                for key, result in zip(batch, results):
+                    if isinstance(result, Exception):
+                        failed[key] = str(result)
+                    else:
+                        found[key] = result
+                return found, failed
+        
+        results = await asyncio.gather(*[fetch_batch(batch) for batch in batches])
+        for batch, (found, failed) in zip(batches, results):
+            errors.update(failed)
+            for key in batch:
+                if key in found:
+                    issues[key] = found[key]
+                elif key not in failed:
+                    errors[key] = "Issue not found or not visible"
+        return {'issues': issues, 'errors': errors}
+    
+    async def search_users(self, query: str) -> List[Dict]:
+        """Find users by display name or email."""
+        response = await self._make_request("GET", f"user/search?query={urllib.parse.quote(query)}")
+        return response if isinstance(response, list) else []
+    
+    async def count_issues(self, jql: str) -> int:
+        """Approximate number of issues matching a JQL query, without fetching any issue bodies."""
+        response = await self._make_request("POST", "search/approximate-count", data={"jql": jql}, idempotent=True)
+        return int(response.get("count", 0))
+    
+    async def iter_changelogs(self, issue_ids_or_keys: Iterable[str],
+                              field_ids: Iterable[str] = ('status',)) -> AsyncIterator[Dict]:
+        """Stream issue changelogs with Jira's bulk changelog endpoint (see JiraClient.iter_changelogs)."""
+        issues = list(issue_ids_or_keys)
+        for start in range(0, len(issues), CHANGELOG_BATCH_SIZE):
+            body = {
+                "issueIdsOrKeys": issues[start:start + CHANGELOG_BATCH_SIZE],
+                "fieldIds": list(field_ids),
+                "maxResults": CHANGELOG_BATCH_SIZE
+            }
+            while True:
+                response = await self._make_request("POST", "changelog/bulkfetch", data=body, idempotent=True)
+                for entry in response.get("issueChangeLogs", []):
+                    yield entry
+                next_token = response.get("nextPageToken")
+                if not next_token:
+                    break
+                body = {**body, "nextPageToken": next_token}
+    
+    async def get_project_statuses(self, project_key: str) -> List[Dict]:
+        """Get the issue types of a project, each with the statuses of its workflow."""
+        response = await self._make_request("GET", f"project/{project_key}/statuses")
+        return response if isinstance(response, list) else []
+    
+    async def get_issue_with_comments(self, issue_key: str) -> Dict:
+        """Get issue details including comments."""
+        return await self._make_request("GET", f"issue/{issue_key}?expand={ISSUE_DETAIL_EXPAND}")
+    
+    async def add_comment(self, issue_key: str, comment: str) -> Dict:
+        """Add a comment to an issue."""
+        data = {"body": _adf_document(comment)}
+        return await self._make_request("POST", f"issue/{issue_key}/comment", data=data)
+    
+    async def get_projects(self) -> List[Dict]:
+        """Get all accessible projects."""
+        # Try /project endpoint first (simpler, returns list directly)
+        try:
+            response = await self._make_request("GET", "project")
+            if isinstance(response, list):
+                return response
+        except Exception:
+            pass
+        
+        # Fallback to /project/search; the total is known after the first page,
+        # so the remaining pages are fetched concurrently
+        try:
+            response = await self._make_request("GET", "project/search")
+            if isinstance(response, dict):
+                projects = list(response.get('values', []))
+                total = response.get('total', len(projects))
+                page_size = len(projects)
+                if page_size and total > page_size and not response.get('isLast', True):
+                    pages = await asyncio.gather(*[
+                        self._make_request("GET", f"project/search?startAt={start_at}")
+                        for start_at in range(page_size, total, page_size)
+                    ])
+                    for page in pages:
+                        if isinstance(page, dict):
+                            projects.extend(page.get('values', []))
+                return projects
+        except Exception:
+            pass
+        
+        # If both fail, return empty list
+        return []
+    
+    async def transition_issue(self, issue_key: str, transition_id: str) -> Dict:
+        """Transition an issue to a different status."""
+        data = {"transition": {"id": transition_id}}
+        return await self._make_request("POST", f"issue/{issue_key}/transitions", data=data)
+    
+    async def get_issue_transitions(self, issue_key: str) -> List[Dict]:
+        """Get available transitions for an issue."""
+        response = await self._make_request("GET", f"issue/{issue_key}/transitions")
+        return response.get("transitions", [])
@@ -2,192 +2,605 @@
 Jira Data Fetcher - Fetches project data including epics, stories, and tasks.
 """
 from jira_client import JiraClient
-from typing import Dict, List, Optional, Any
-from datetime import datetime
+from issue_store import IssueStore
+from project_metrics import ProjectMetrics
+from issue_frame import IssueFrame, IssueFrameBuilder
+from epic_index import EpicIndex
+from dependency_graph import DependencyGraph, blocked_by_keys
+from issue_record import Issue
+from singleflight import SingleFlight
+from typing import Dict, List, Optional, Any, Tuple, Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
 import re
+import threading
+import time
+
+# Concurrent created-date shards used when fetching a whole project
+DEFAULT_SHARD_COUNT = 8
+# Page size for key-only listings (Jira allows larger pages when only keys are requested)
+KEY_SWEEP_PAGE_SIZE = 1000
+# Field profiles ordered by how much they include; a stored project can serve any narrower profile
+PROFILE_RANK = {'metrics': 0, 'roadmap': 1, 'full': 2}
+# Version of jira_client.FIELD_PROFILES; stores synced with an older version are fully reloaded once.
+# Bump it whenever a profile gains fields that categorized issues rely on (2: parent, epic link, issue links)
+FIELDS_VERSION = 2
+# Concurrent approximate-count queries for count-only answers
+COUNT_WORKERS = 8
+# Seconds a cached project catalog is trusted before it is listed again
+DEFAULT_PROJECT_CACHE_TTL = 300.0
+# A lookup miss reloads a catalog at most this often (catches newly created projects)
+MISS_REFRESH_INTERVAL = 30.0
+# Delta syncs fetch issues updated since the previous sync started, minus this margin (seconds),
+# so changes made while a sync ran, or not yet visible in Jira's search index, are picked up next time
+WATERMARK_MARGIN = 300.0
+# Concurrent identical project fetches, across all fetchers in the process, share one load
+_project_fetches = SingleFlight()
+# Data derived from stored projects, keyed by (store identity, project key) and shared by
+# every fetcher in the process on the same database; see JiraDataFetcher._sync_snapshot
+_store_snapshots: Dict[Tuple[str, str], '_ProjectSnapshot'] = {}
+# One lock per stored project serializes its syncs within the process
+_store_sync_locks: Dict[Tuple[str, str], threading.Lock] = {}
+_store_snapshots_lock = threading.Lock()
+
+
+
+def _type_bucket(issue_type: str) -> Optional[str]:
+    """Bucket ('epics', 'stories', 'tasks') for an issue type name, or None for other types."""
+    issue_type = issue_type.lower()
+    if 'epic' in issue_type:
+        return 'epics'
+    elif 'story' in issue_type:
+        return 'stories'
+    elif 'task' in issue_type or 'subtask' in issue_type:
+        return 'tasks'
+    return None
+
+
+class _ProjectSnapshot:
+    """A stored project's frame, metrics, epic roll-ups and dependencies as of a store sync generation."""
+    
+    __slots__ = ('generation', 'frame', 'metrics', 'epic_index', 'dependencies', 'stored_issues')
+    
+    def __init__(self, generation: int, frame: IssueFrame, metrics: ProjectMetrics, epic_index: EpicIndex,
+                 dependencies: DependencyGraph, stored_issues: int):
+        self.generation = generation
+        self.frame = frame
+        self.metrics = metrics
+        self.epic_index = epic_index
+        self.dependencies = dependencies
+        self.stored_issues = stored_issues
+
+
+def _jql_quote(value: str) -> str:
+    """Escape a value for use inside a double-quoted JQL string."""
+    return value.replace('\\', '\\\\').replace('"', '\\"')
+
+
+class ProjectCatalog:
+    """TTL-cached catalog of accessible Jira projects, indexed by project key."""
+    
+    def __init__(self, jira_client: JiraClient, ttl: float = DEFAULT_PROJECT_CACHE_TTL):
+        """
+        Initialize project catalog.
+        
+        Args:
+            jira_client: Initialized JiraClient instance
+            ttl: Seconds before the catalog is listed from Jira again
+        """
+        self.jira = jira_client
+        self.ttl = ttl
+        self._projects: Dict[str, Dict] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+    
+    def invalidate(self):
+        """Drop the cached catalog so the next lookup lists projects again."""
+        with self._lock:
+            self._loaded_at = None
+    
+    def _load(self, max_age: float) -> Dict[str, Dict]:
+        """Return the catalog, listing projects from Jira if it is older than max_age."""
+        with self._lock:
+            if self._loaded_at is None or time.monotonic() - self._loaded_at >= max_age:
+                projects = self.jira.get_projects()
+                self._projects = {p.get('key'): p for p in projects if p.get('key')}
+                self._loaded_at = time.monotonic()
+            return self._projects
+    
+    @property
+    def available(self) -> bool:
+        """Whether the project listing returned anything (it can fail on limited permissions)."""
+        return bool(self._load(self.ttl))
+    
+    def keys(self) -> List[str]:
+        """All known project keys."""
+        return list(self._load(self.ttl))
+    
+    def get(self, project_key: str) -> Optional[Dict]:
+        """Project details by key, or None if the key is unknown."""
+        project = self._load(self.ttl).get(project_key)
+        if project is None:
+            project = self._load(MISS_REFRESH_INTERVAL).get(project_key)
+        return project
+    
+    def __contains__(self, project_key: str) -> bool:
+        return self.get(project_key) is not None
 
 
 class JiraDataFetcher:
     """Fetches and processes Jira project data."""
     
-    def __init__(self, jira_client: JiraClient):
+    def __init__(self, jira_client: JiraClient, issue_store: Optional[IssueStore] = None,
+                 project_cache_ttl: float = DEFAULT_PROJECT_CACHE_TTL):
         """
         Initialize Jira data fetcher.
         
         Args:
             jira_client: Initialized JiraClient instance
+            issue_store: Optional local store; when set, full-project fetches become
+                delta syncs after the first load
+            project_cache_ttl: Seconds the project catalog is cached
         """
         self.jira = jira_client
+        self.store = issue_store
+        self.projects = ProjectCatalog(jira_client, ttl=project_cache_ttl)
+        self._user_tz = None
     
-    def get_project_issues(self, project_key: str) -> Dict[str, Any]:
+    def get_project_issues(self, project_key: str, max_results: Optional[int] = None,
+                           shard_count: int = DEFAULT_SHARD_COUNT,
+                           profile: str = 'full') -> Dict[str, Any]:
         """
         Get all issues for a project, categorized by type.
         
         Args:
             project_key: Jira project key (e.g., 'PROJ')
+            max_results: Stop after this many issues; None fetches the whole project
+                by splitting it into `created` date shards fetched concurrently
+            shard_count: Number of concurrent shards used for a full-project fetch
+            profile: Field profile to request (see jira_client.FIELD_PROFILES); use
+                'metrics' for summaries and charts, 'roadmap' when epics are listed,
+                and 'full' only when descriptions are needed
         
         Returns:
-            Dictionary with epics, stories, tasks, and metrics
-        """
-        # First, verify the project exists by trying to get project info
-        try:
-            projects = self.jira.get_projects()
-            project_keys = [p.get('key', '') for p in projects]
-            if project_key not in project_keys:
-                available_projects = ', '.join(project_keys[:10])  # Show first 10
-                raise Exception(
-                    f"Project '{project_key}' not found. "
-                    f"Available projects: {available_projects}"
-                    + (f" (and {len(project_keys) - 10} more)" if len(project_keys) > 10 else "")
-                )
-        except Exception as e:
-            # If project listing fails, continue anyway - might be a permission issue
-            pass
+            Dictionary with the columnar IssueFrame of epics, stories and tasks
+            (no per-issue records are kept), metrics, the EpicIndex of rolled-up
+            epic progress, the DependencyGraph of blocking links and fetch statistics
         
-        # Search for all issues in the project
+        Concurrent calls for the same project and data version (Jira site and
+        account, profile, limit, day, since overdue flags depend on it, and for
+        store-backed fetches the store and its sync generation) from any fetcher
+        in the process share one in-flight load and its result. Returned
+        objects are never updated afterwards; later loads build new ones.
+        """
+        self._check_project(project_key)
+        if self.store is not None and max_results is None:
+            store_version = (self.store.identity, self.store.get_generation(project_key))
+        else:
+            store_version = None
+        data_version = (profile, max_results, datetime.now().date().isoformat(), store_version)
+        return _project_fetches.do(
+            (self.jira.base_url, self.jira.email, project_key, data_version),
+            self._load_project_issues, project_key, max_results, shard_count, profile
+        )
+    
+    def _load_project_issues(self, project_key: str, max_results: Optional[int],
+                             shard_count: int, profile: str) -> Dict[str, Any]:
+        """Fetch and categorize a project's issues (see get_project_issues)."""
+        started = time.perf_counter()
+        bytes_before = self.jira.bytes_received
         jql = f"project = {project_key}"
-        all_issues = self.jira.search_issues(jql, max_results=500)
-        
-        epics = []
-        stories = []
-        tasks = []
-        
-        for issue in all_issues:
-            fields = issue.get('fields', {})
-            issue_type = fields.get('issuetype', {}).get('name', '').lower()
-            assignee = fields.get('assignee')
-            assignee_name = assignee.get('displayName', 'Unassigned') if assignee else 'Unassigned'
-            status = fields.get('status', {}).get('name', 'Unknown')
-            
-            issue_data = {
-                'key': issue.get('key'),
-                'summary': fields.get('summary', ''),
-                'status': status,
-                'assignee': assignee_name,
-                'created': fields.get('created', ''),
-                'updated': fields.get('updated', ''),
-                'priority': fields.get('priority', {}).get('name', 'Medium'),
-                'due_date': fields.get('duedate', ''),
-                'description': self._extract_text_from_content(fields.get('description')),
-                'url': f"{self.jira.base_url}/browse/{issue.get('key')}"
-            }
+        sync_stats = None
+        
+        if self.store is not None and max_results is None:
+            # Bring the local store up to date; frame and roll-ups are derived from it
+            snapshot, shard_stats, sync_stats = self._sync_snapshot(project_key, shard_count, profile)
+            frame, metrics = snapshot.frame, snapshot.metrics
+            epic_index, dependencies = snapshot.epic_index, snapshot.dependencies
+            unique_issues = snapshot.stored_issues
+        else:
+            if max_results is None:
+                shard_jqls = self._shard_jqls(jql, shard_count)
+            else:
+                shard_jqls = [jql]
             
-            if 'epic' in issue_type:
-                epic_name = fields.get('customfield_10011', '')  # Epic Name field
-                issue_data['epic_name'] = epic_name
-                epics.append(issue_data)
-            elif 'story' in issue_type:
-                stories.append(issue_data)
-            elif 'task' in issue_type or 'subtask' in issue_type:
-                tasks.append(issue_data)
-        
-        # Calculate metrics
-        metrics = self._calculate_metrics(epics, stories, tasks)
+            # Columns, metrics, epic roll-ups and links are collected while issues are
+            # categorized; each Issue record is dropped as soon as it has been counted
+            frame_builder = IssueFrameBuilder()
+            dependencies = DependencyGraph()
+            metrics = ProjectMetrics()
+            epic_index = EpicIndex()
+            # Each worker categorizes its own pages as they stream in
+            categorize = lambda page: [self._categorize_issue(issue) for issue in page]
+            shard_results, shard_stats = self._run_shards(shard_jqls, max_results, profile, categorize)
+            seen_keys = set()
+            for shard_issues in shard_results:
+                for bucket, issue_data in shard_issues:
+                    # Shard boundaries can overlap (and issues can be created mid-fetch)
+                    if issue_data['key'] in seen_keys:
+                        continue
+                    seen_keys.add(issue_data['key'])
+                    epic_index.add(issue_data)
+                    dependencies.add(issue_data)
+                    if bucket:
+                        metrics.add(bucket, issue_data)
+                        frame_builder.add(bucket, issue_data)
+            unique_issues = len(seen_keys)
+            frame = frame_builder.build()
         
         return {
             'project_key': project_key,
-            'epics': epics,
-            'stories': stories,
-            'tasks': tasks,
-            'metrics': metrics,
-            'total_issues': len(epics) + len(stories) + len(tasks)
+            'frame': frame,
+            'metrics': metrics.to_dict(),
+            'epic_index': epic_index,
+            'dependencies': dependencies,
+            'total_issues': len(frame),
+            'profile': profile,
+            'fetch_stats': {
+                'mode': 'full' if max_results is None else 'capped',
+                'sync': sync_stats,
+                'shards': shard_stats,
+                'issues_fetched': sum(shard['issues'] for shard in shard_stats),
+                'unique_issues': unique_issues,
+                'bytes_transferred': self.jira.bytes_received - bytes_before,
+                'seconds': round(time.perf_counter() - started, 3)
+            }
         }
     
-    def _calculate_metrics(self, epics: List[Dict], stories: List[Dict], tasks: List[Dict]) -> Dict[str, Any]:
-        """Calculate project metrics."""
-        all_issues = epics + stories + tasks
-        
-        # Status breakdown
-        status_counts = {}
-        for issue in all_issues:
-            status = issue.get('status', 'Unknown')
-            status_counts[status] = status_counts.get(status, 0) + 1
-        
-        # Assignee breakdown
-        assignee_counts = {}
-        for issue in all_issues:
-            assignee = issue.get('assignee', 'Unassigned')
-            assignee_counts[assignee] = assignee_counts.get(assignee, 0) + 1
-        
-        # Count by type
-        type_counts = {
-            'epics': len(epics),
-            'stories': len(stories),
-            'tasks': len(tasks)
+    def _sync_snapshot(self, project_key: str, shard_count: int,
+                       profile: str) -> Tuple['_ProjectSnapshot', List[Dict], Dict]:
+        """
+        Sync a stored project and return its derived data with shard and sync statistics.
+        
+        The snapshot cached for this store and project is reused only while the
+        store's sync generation still equals the one it was derived at, so writes
+        by other sessions on the same database are never missed. A delta sync that
+        this call alone wrote is applied to it in O(changed issues); anything else
+        (first load, full reload, a generation moved by someone else, a new day)
+        re-derives everything from the store.
+        """
+        snapshot_key = (self.store.identity, project_key)
+        with _store_snapshots_lock:
+            sync_lock = _store_sync_locks.setdefault(snapshot_key, threading.Lock())
+        with sync_lock:
+            generation = self.store.get_generation(project_key)
+            snapshot = _store_snapshots.get(snapshot_key)
+            if snapshot is not None and (snapshot.generation != generation
+                                         or snapshot.metrics.today != datetime.now().date()):
+                snapshot = None
+            changes = {} if snapshot is not None else None
+            shard_stats, sync_stats = self._sync_store(project_key, shard_count, profile, changes)
+            
+            if sync_stats['generation'] != generation:
+                if (snapshot is not None and sync_stats['mode'] == 'delta'
+                        and sync_stats['generation'] == generation + 1):
+                    snapshot = self._apply_changes(snapshot, changes, sync_stats['generation'])
+                else:
+                    snapshot = None
+            if snapshot is None:
+                snapshot = self._build_snapshot(project_key, sync_stats['generation'])
+            _store_snapshots[snapshot_key] = snapshot
+        return snapshot, shard_stats, sync_stats
+    
+    def _build_snapshot(self, project_key: str, generation: int) -> '_ProjectSnapshot':
+        """Derive frame, metrics, epic roll-ups and dependencies from every stored issue."""
+        frame_builder = IssueFrameBuilder()
+        metrics = ProjectMetrics()
+        epic_index = EpicIndex()
+        dependencies = DependencyGraph()
+        stored_issues = 0
+        for issue in self.store.iter_issues(project_key):
+            bucket, issue_data = self._categorize_issue(issue)
+            stored_issues += 1
+            epic_index.add(issue_data)
+            dependencies.add(issue_data)
+            if bucket:
+                metrics.add(bucket, issue_data)
+                frame_builder.add(bucket, issue_data)
+        return _ProjectSnapshot(generation, frame_builder.build(), metrics, epic_index,
+                                dependencies, stored_issues)
+    
+    def _apply_changes(self, snapshot: '_ProjectSnapshot', changes: Dict[str, List[Optional[Dict]]],
+                       generation: int) -> '_ProjectSnapshot':
+        """
+        New snapshot with the issues changed by one delta sync (see _sync_store) applied.
+        
+        The given snapshot may already have been returned to callers, so it is
+        copied rather than updated in place.
+        """
+        frame_builder = IssueFrameBuilder()
+        metrics = snapshot.metrics.copy()
+        epic_index = snapshot.epic_index.copy()
+        dependencies = snapshot.dependencies.copy()
+        stored_issues = snapshot.stored_issues
+        for old, new in changes.values():
+            old_issue = self._categorize_issue(old) if old else None
+            new_issue = self._categorize_issue(new) if new else None
+            stored_issues += (new is not None) - (old is not None)
+            metrics.apply_delta(old_issue, new_issue)
+            epic_index.apply_delta(old_issue[1] if old_issue else None, new_issue[1] if new_issue else None)
+            dependencies.apply_delta(old_issue[1] if old_issue else None, new_issue[1] if new_issue else None)
+            if new_issue is not None and new_issue[0]:
+                frame_builder.add(*new_issue)
+        frame = snapshot.frame.apply_delta(changes, frame_builder.build())
+        return _ProjectSnapshot(generation, frame, metrics, epic_index, dependencies, stored_issues)
+    
+    def _check_project(self, project_key: str):
+        """
+        Verify the project exists against the cached catalog; if listing fails
+        (e.g. limited permissions) continue anyway.
+        """
+        if self.projects.available and project_key not in self.projects:
+            project_keys = self.projects.keys()
+            available_projects = ', '.join(project_keys[:10])  # Show first 10
+            raise Exception(
+                f"Project '{project_key}' not found. "
+                f"Available projects: {available_projects}"
+                + (f" (and {len(project_keys) - 10} more)" if len(project_keys) > 10 else "")
+            )
+    
+    def count_project_issues(self, project_key: str) -> Dict[str, Any]:
+        """
+        Count a project's issues by status and type without fetching any issues.
+        
+        Uses Jira's approximate-count search: one small query per status and per
+        issue type (taken from the project's workflow statuses), run concurrently,
+        so the answer costs about one round trip.
+        
+        Args:
+            project_key: Jira project key (e.g., 'PROJ')
+        
+        Returns:
+            Dictionary with total, status_counts, issue_type_counts, type_counts and overdue_count
+        """
+        self._check_project(project_key)
+        jql = f"project = {project_key}"
+        issue_types = self.jira.get_project_statuses(project_key)
+        type_names = sorted({t.get('name') for t in issue_types if t.get('name')})
+        status_names = sorted({status.get('name') for t in issue_types
+                               for status in t.get('statuses', []) if status.get('name')})
+        
+        queries = {
+            ('total', None): jql,
+            # Due before today, matching ProjectMetrics' overdue check
+            ('overdue', None): f'{jql} AND duedate < startOfDay() AND statusCategory != Done'
         }
+        for status in status_names:
+            queries[('status', status)] = f'{jql} AND status = "{_jql_quote(status)}"'
+        for type_name in type_names:
+            queries[('type', type_name)] = f'{jql} AND issuetype = "{_jql_quote(type_name)}"'
+        with ThreadPoolExecutor(max_workers=min(COUNT_WORKERS, len(queries))) as executor:
+            counts = dict(zip(queries, executor.map(self.jira.count_issues, queries.values())))
         
-        # Count by status and assignee (for charts)
-        status_assignee_matrix = {}
-        for issue in all_issues:
-            status = issue.get('status', 'Unknown')
-            assignee = issue.get('assignee', 'Unassigned')
-            key = f"{assignee}|{status}"
-            status_assignee_matrix[key] = status_assignee_matrix.get(key, 0) + 1
-        
-        # Overdue issues
-        overdue_count = 0
-        today = datetime.now().date()
-        for issue in all_issues:
-            due_date_str = issue.get('due_date')
-            if due_date_str:
-                try:
-                    due_date = datetime.fromisoformat(due_date_str.replace('Z', '+00:00')).date()
-                    if due_date < today and issue.get('status') not in ['Done', 'Closed', 'Resolved']:
-                        overdue_count += 1
-                except:
-                    pass
+        status_counts = {name: counts[('status', name)] for name in status_names if counts[('status', name)]}
+        issue_type_counts = {name: counts[('type', name)] for name in type_names if counts[('type', name)]}
+        type_counts = {'epics': 0, 'stories': 0, 'tasks': 0}
+        for name, count in issue_type_counts.items():
+            bucket = _type_bucket(name)
+            if bucket:
+                type_counts[bucket] += count
         
         return {
+            'project_key': project_key,
+            'total': counts[('total', None)],
             'status_counts': status_counts,
-            'assignee_counts': assignee_counts,
+            'issue_type_counts': issue_type_counts,
             'type_counts': type_counts,
-            'status_assignee_matrix': status_assignee_matrix,
-            'overdue_count': overdue_count,
-            'total_issues': len(all_issues)
+            'overdue_count': counts[('overdue', None)],
+            'approximate': True
         }
     
-    def _extract_text_from_content(self, content: Any) -> str:
-        """Extract plain text from Jira's content format."""
-        if not content:
-            return ""
-        if isinstance(content, str):
-            return content
-        if isinstance(content, dict):
-            if 'content' in content:
-                return self._extract_text_from_content(content['content'])
-            if 'text' in content:
-                return content['text']
-        if isinstance(content, list):
-            texts = []
-            for item in content:
-                if isinstance(item, dict):
-                    if item.get('type') == 'text':
-                        texts.append(item.get('text', ''))
-                    elif item.get('type') == 'paragraph':
-                        texts.append(self._extract_text_from_content(item.get('content', [])))
-                elif isinstance(item, str):
-                    texts.append(item)
-            return ' '.join(texts)
-        return str(content) if content else ""
+    def _sync_store(self, project_key: str, shard_count: int, profile: str,
+                    changes: Optional[Dict[str, List[Optional[Dict]]]] = None) -> Tuple[List[Dict], Dict]:
+        """
+        Sync a project into the issue store.
+        
+        The first load (or a request for a wider field profile than what is stored,
+        or a store synced with an older FIELDS_VERSION) runs the sharded full fetch. Later calls only fetch issues updated since the
+        previous sync started (less WATERMARK_MARGIN), so issues changed while a
+        sync was running are not skipped. Every `sweep_interval` seconds a key-only
+        listing reconciles issues that were deleted or moved out of the project.
+        
+        Any sync that writes issues bumps the store's sync generation, even when
+        it fails part way.
+        
+        Args:
+            changes: If given, a delta sync records each issue it changes as
+                key -> [stored raw issue before the sync (None if new), raw issue
+                after it (None if deleted)]
+        
+        Returns:
+            (shard statistics, sync statistics with the mode, deleted count and
+            the store's sync generation afterwards)
+        """
+        jql = f"project = {project_key}"
+        state = self.store.get_sync_state(project_key)
+        now = time.time()
+        written = False
+        
+        def upsert(page):
+            nonlocal written
+            written = True
+            self.store.upsert_issues(project_key, page)
+            return []
+        
+        try:
+            if (state is None or state['fields_version'] < FIELDS_VERSION
+                    or PROFILE_RANK.get(state['profile'], -1) < PROFILE_RANK.get(profile, 0)):
+                written = True
+                self.store.clear_project(project_key)
+                _, shard_stats = self._run_shards(self._shard_jqls(jql, shard_count), None, profile, upsert)
+                self.store.set_sync_state(project_key, profile, now, now, now - WATERMARK_MARGIN, FIELDS_VERSION)
+                mode, deleted = 'full', []
+            else:
+                # Keep the stored profile so every stored row carries the same fields
+                watermark = self.store.get_watermark(project_key)
+                if watermark is not None:
+                    delta_jql = f'{jql} AND updated >= "{self._jql_datetime(watermark)}"'
+                else:
+                    delta_jql = jql
+                changes_lock = threading.Lock()
+                
+                def upsert_delta(page):
+                    # The watermark margin re-fetches recently synced issues; only write real changes
+                    stored = self.store.get_issues(project_key, [issue.get('key') for issue in page])
+                    page = [issue for issue in page if stored.get(issue.get('key')) != issue]
+                    if not page:
+                        return []
+                    if changes is not None:
+                        with changes_lock:
+                            for issue in page:
+                                # An issue seen twice keeps its first stored version
+                                key = issue.get('key')
+                                changes.setdefault(key, [stored.get(key), None])[1] = issue
+                    return upsert(page)
+                
+                _, shard_stats = self._run_shards([delta_jql], None, state['profile'], upsert_delta)
+                
+                mode, deleted = 'delta', []
+                last_sweep = state['last_sweep']
+                if now - last_sweep >= self.store.sweep_interval:
+                    live_keys = (issue.get('key') for issue in
+                                 self.jira.iter_issues(jql, fields=['key'], page_size=KEY_SWEEP_PAGE_SIZE))
+                    deleted = self.store.delete_missing(project_key, live_keys)
+                    written = written or bool(deleted)
+                    if changes is not None:
+                        for issue in deleted:
+                            changes.setdefault(issue.get('key'), [issue, None])[1] = None
+                    last_sweep = now
+                self.store.set_sync_state(project_key, state['profile'], state['last_full_sync'], last_sweep,
+                                          now - WATERMARK_MARGIN, state['fields_version'])
+        finally:
+            generation = (self.store.bump_generation(project_key) if written
+                          else self.store.get_generation(project_key))
+        return shard_stats, {'mode': mode, 'deleted': len(deleted), 'generation': generation}
+    
+    def _jql_datetime(self, moment: datetime) -> str:
+        """
+        Format a UTC datetime for JQL, which interprets dates in the Jira user's time zone.
+        
+        Jira compares at minute precision, so a minute of overlap is subtracted; if the
+        user's time zone is unknown, the widest UTC offset is subtracted instead.
+        Re-fetching a few unchanged issues is harmless since upserts are idempotent.
+        """
+        if self._user_tz is None:
+            try:
+                self._user_tz = ZoneInfo(self.jira.get_current_user().get('timeZone') or 'UTC')
+            except Exception:
+                self._user_tz = False
+        if self._user_tz:
+            local = moment.astimezone(self._user_tz)
+        else:
+            local = moment - timedelta(hours=14)
+        return (local - timedelta(minutes=1)).strftime('%Y/%m/%d %H:%M')
+    
+    def _run_shards(self, shard_jqls: List[str], max_results: Optional[int], profile: str,
+                    handle_page: Callable[[List[Dict]], List]) -> Tuple[List[List], List[Dict]]:
+        """Fetch shards concurrently; returns per-shard results of handle_page and shard statistics."""
+        results = []
+        shard_stats = []
+        with ThreadPoolExecutor(max_workers=len(shard_jqls)) as executor:
+            futures = [executor.submit(self._fetch_shard, shard_jql, max_results, profile, handle_page)
+                       for shard_jql in shard_jqls]
+            for shard_jql, future in zip(shard_jqls, futures):
+                shard_results, count, seconds = future.result()
+                shard_stats.append({'jql': shard_jql, 'issues': count, 'seconds': round(seconds, 3)})
+                results.append(shard_results)
+        return results, shard_stats
+    
+    def _shard_jqls(self, jql: str, shard_count: int) -> List[str]:
+        """
+        Split a query into contiguous `created` date ranges.
+        
+        The first and last shards are open-ended so that every issue falls into
+        some shard even if the bounds lookup is stale or time zones differ.
+        """
+        bounds = []
+        for order in ('ASC', 'DESC'):
+            first = next(self.jira.iter_issues(f"{jql} ORDER BY created {order}",
+                                               fields=['created'], page_size=1), None)
+            created = first.get('fields', {}).get('created') if first else None
+            if not created:
+                return [jql]
+            bounds.append(datetime.strptime(created[:16], '%Y-%m-%dT%H:%M'))
+        oldest, newest = bounds
+        
+        # JQL dates have minute precision, so never cut shards finer than that
+        span_minutes = int((newest - oldest).total_seconds() // 60) + 1
+        shard_count = max(1, min(shard_count, span_minutes))
+        if shard_count == 1:
+            return [jql]
+        step = (newest - oldest) / shard_count
+        edges = sorted({(oldest + step * i).strftime('%Y/%m/%d %H:%M') for i in range(1, shard_count)})
+        
+        shards = [f'{jql} AND created < "{edges[0]}"']
+        for lower, upper in zip(edges, edges[1:]):
+            shards.append(f'{jql} AND created >= "{lower}" AND created < "{upper}"')
+        shards.append(f'{jql} AND created >= "{edges[-1]}"')
+        return shards
+    
+    def _fetch_shard(self, jql: str, max_results: Optional[int], profile: str,
+                     handle_page: Callable[[List[Dict]], List]) -> Tuple[List, int, float]:
+        """Stream one shard page by page through handle_page; returns (results, issue count, seconds)."""
+        started = time.perf_counter()
+        results = []
+        count = 0
+        for page in self.jira.iter_issue_pages(jql, profile=profile):
+            if max_results is not None:
+                page = page[:max_results - count]
+            count += len(page)
+            results.extend(handle_page(page))
+            if max_results is not None and count >= max_results:
+                break
+        return results, count, time.perf_counter() - started
+    
+    def _categorize_issue(self, issue: Dict) -> Tuple[Optional[str], Issue]:
+        """Convert a raw Jira issue to an Issue record and its bucket ('epics', 'stories', 'tasks' or None)."""
+        # Fields outside the requested profile are simply absent; Jira also sends nulls
+        fields = issue.get('fields', {})
+        issue_type = (fields.get('issuetype') or {}).get('name', '')
+        assignee = fields.get('assignee')
+        assignee_name = assignee.get('displayName', 'Unassigned') if assignee else 'Unassigned'
+        status = (fields.get('status') or {}).get('name', 'Unknown')
+        
+        bucket = _type_bucket(issue_type)
+        issue_data = Issue(
+            key=issue.get('key'),
+            summary=fields.get('summary', ''),
+            status=status,
+            assignee=assignee_name,
+            created=fields.get('created') or '',
+            updated=fields.get('updated') or '',
+            priority=(fields.get('priority') or {}).get('name', 'Medium'),
+            due_date=fields.get('duedate') or '',
+            url=f"{self.jira.base_url}/browse/{issue.get('key')}",
+            # Decoded to text only if something reads issue_data['description']
+            raw_description=fields.get('description'),
+            # Epic Link on company-managed projects, parent elsewhere
+            parent_key=fields.get('customfield_10014') or (fields.get('parent') or {}).get('key'),
+            blocked_by=blocked_by_keys(fields.get('issuelinks')),
+            # Epic Name field
+            epic_name=(fields.get('customfield_10011') or '') if bucket == 'epics' else None
+        )
+        return bucket, issue_data
     
     def generate_status_summary(self, project_data: Dict[str, Any]) -> str:
         """Generate a status summary for the project."""
         metrics = project_data.get('metrics', {})
-        epics = project_data.get('epics', [])
-        stories = project_data.get('stories', [])
-        tasks = project_data.get('tasks', [])
+        type_counts = metrics.get('type_counts', {})
         
-        # Calculate total from actual lists if metrics is missing total_issues
+        # Calculate total from the type counts if metrics is missing total_issues
         total_from_metrics = metrics.get('total_issues', 0)
-        total_from_lists = len(epics) + len(stories) + len(tasks)
-        total_issues = total_from_metrics if total_from_metrics > 0 else total_from_lists
+        total_from_types = sum(type_counts.values())
+        total_issues = total_from_metrics if total_from_metrics > 0 else total_from_types
         
         summary_parts = [
             f"**Project: {project_data.get('project_key')}**\n",
             f"Total Issues: {total_issues}",
-            f"  - Epics: {len(epics)}",
-            f"  - Stories: {len(stories)}",
-            f"  - Tasks: {len(tasks)}",
+            f"  - Epics: {type_counts.get('epics', 0)}",
+            f"  - Stories: {type_counts.get('stories', 0)}",
+            f"  - Tasks: {type_counts.get('tasks', 0)}",
             f"\n**Status Breakdown:**"
         ]
         
@@ -199,42 +612,104 @@ class JiraDataFetcher:
         
         return '\n'.join(summary_parts)
     
+    def generate_count_summary(self, counts: Dict[str, Any]) -> str:
+        """Generate a status summary from count_project_issues output."""
+        type_counts = counts.get('type_counts', {})
+        summary_parts = [
+            f"**Project: {counts.get('project_key')}**\n",
+            f"Total Issues: {counts.get('total', 0)}",
+            f"  - Epics: {type_counts.get('epics', 0)}",
+            f"  - Stories: {type_counts.get('stories', 0)}",
+            f"  - Tasks: {type_counts.get('tasks', 0)}"
+        ]
+        other_types = {name: count for name, count in counts.get('issue_type_counts', {}).items()
+                       if not _type_bucket(name)}
+        for name, count in other_types.items():
+            summary_parts.append(f"  - {name}: {count}")
+        
+        summary_parts.append("\n**Status Breakdown:**")
+        for status, count in counts.get('status_counts', {}).items():
+            summary_parts.append(f"  - {status}: {count}")
+        
+        if counts.get('overdue_count', 0) > 0:
+            summary_parts.append(f"\n⚠️ **Overdue Issues: {counts['overdue_count']}**")
+        
+        if counts.get('approximate'):
+            summary_parts.append("\n_Counts are approximate and may lag recent changes by a few seconds._")
+        return '\n'.join(summary_parts)
+    
     def generate_roadmap(self, project_data: Dict[str, Any]) -> str:
         """Generate a roadmap summary with risk assessment."""
-        epics = project_data.get('epics', [])
+        frame = project_data.get('frame')
+        epics = frame.epics(limit=10) if frame is not None else []
         
         if not epics:
             return "No epics found for this project."
         
         roadmap_parts = ["**Roadmap:**\n"]
         
-        for epic in epics[:10]:  # Top 10 epics
+        epic_index = project_data.get('epic_index')
+        dependencies = project_data.get('dependencies')
+        
+        for epic in epics:  # Top 10 epics
             epic_name = epic.get('epic_name', epic.get('summary', 'Unknown'))
             status = epic.get('status', 'Unknown')
             assignee = epic.get('assignee', 'Unassigned')
+            progress = epic_index.progress(epic.get('key')) if epic_index is not None else None
+            has_children = bool(progress and progress['children'])
             
             roadmap_parts.append(f"**{epic.get('key')}**: {epic_name}")
             roadmap_parts.append(f"  - Status: {status}")
             roadmap_parts.append(f"  - Assignee: {assignee}")
+            if has_children:
+                roadmap_parts.append(
+                    f"  - Progress: {progress['completion']}% ({progress['done']}/{progress['children']} done, "
+                    f"{progress['open']} open)"
+                )
+            analysis = None
+            if dependencies is not None:
+                child_keys = epic_index.children.get(epic.get('key'), []) if epic_index is not None else []
+                analysis = dependencies.epic_analysis(epic.get('key'), child_keys, epic.get('due_date'))
+                if len(analysis['critical_path']) > 1:
+                    roadmap_parts.append(f"  - Critical path: {' → '.join(analysis['critical_path'])}")
+                if analysis['slack_days'] is not None and status not in ['Done', 'Closed']:
+                    roadmap_parts.append(f"  - Slack: {analysis['slack_days']} day(s)")
             
-            # Risk assessment
+            # Risk assessment, based on the children's progress where the epic has any
             risks = []
             if assignee == 'Unassigned':
                 risks.append("⚠️ Unassigned")
-            if status in ['To Do', 'Backlog']:
+            if status in ['To Do', 'Backlog'] and not (has_children and progress['done']):
                 risks.append("⚠️ Not started")
+            if has_children and progress['overdue']:
+                risks.append(f"🔴 {progress['overdue']} overdue child issue(s)")
+            if has_children and status in ['Done', 'Closed'] and progress['open']:
+                risks.append(f"⚠️ Marked done with {progress['open']} open child issue(s)")
+            if analysis is not None:
+                for blocker in analysis['blocked_by_overdue']:
+                    risks.append(f"🔴 Blocked by overdue {blocker}")
+                for cycle in analysis['cycles']:
+                    risks.append(f"🔴 Dependency cycle: {' ↔ '.join(cycle)}")
+            epic_done = status in ['Done', 'Closed'] and not (has_children and progress['open'])
             due_date = epic.get('due_date')
             if due_date:
                 try:
                     due = datetime.fromisoformat(due_date.replace('Z', '+00:00')).date()
                     today = datetime.now().date()
-                    if due < today and status not in ['Done', 'Closed']:
+                    if due < today and not epic_done:
                         risks.append("🔴 Overdue")
-                    elif (due - today).days < 7:
-                        risks.append("🟡 Due soon")
+                    elif (due - today).days < 7 and not epic_done:
+                        if has_children and progress['completion'] < 80:
+                            risks.append(f"🟡 Due soon, {progress['completion']}% done")
+                        else:
+                            risks.append("🟡 Due soon")
                 except:
                     pass
             
+            if (analysis is not None and analysis['slack_days'] is not None and analysis['slack_days'] < 0
+                    and not epic_done and "🔴 Overdue" not in risks):
+                risks.append(f"🔴 Critical path runs {-analysis['slack_days']} day(s) past due date")
+            
             if risks:
                 roadmap_parts.append(f"  - Risks: {', '.join(risks)}")
             roadmap_parts.append("")
@@ -0,0 +1,184 @@
+"""
+LLM Cache - Content-addressed cache of LLM responses with memory and SQLite tiers.
+"""
+from collections import OrderedDict
+from typing import Dict, Optional, Any, Tuple
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key       TEXT PRIMARY KEY,
+    response  TEXT NOT NULL,
+    size      INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_llm_cache_last_used ON llm_cache (last_used);
+"""
+
+
+def cache_key(provider: str, model: str, prompt: str, system_prompt: Optional[str] = None,
+              **generation_config: Any) -> str:
+    """
+    SHA-256 over everything that determines a response: provider, model, generation
+    config (temperature, token limit, JSON mode...) and the prompts.
+    """
+    payload = json.dumps([provider, model, system_prompt, sorted(generation_config.items()), prompt],
+                         ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class LLMCache:
+    """
+    Two-tier cache of LLM response texts keyed by cache_key().
+
+    The memory tier is an LRU bounded by response bytes. The optional disk tier
+    is a SQLite table bounded by total response bytes; when it grows past the
+    bound, the least recently used entries are evicted down to 90% of it.
+    Disk hits are promoted into memory, so a restarted app serves repeated
+    prompts (e.g. summaries of unchanged meeting notes) without a provider call.
+
+    Open one cache per database file and share it (the app keeps a single
+    process-wide instance); the disk size is re-read from the table on every
+    write, so writes by other processes also count toward the bound.
+    """
+
+    def __init__(self, max_memory_bytes: int = 8 * 1024 * 1024, db_path: Optional[str] = None,
+                 max_disk_bytes: int = 64 * 1024 * 1024):
+        """
+        Initialize LLM cache.
+
+        Args:
+            max_memory_bytes: Upper bound on the summed size of responses kept in memory
+            db_path: SQLite file for the persistent tier (None for memory only)
+            max_disk_bytes: Upper bound on the summed size of responses kept on disk
+        """
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        # key -> (response, size in bytes)
+        self._memory: "OrderedDict[str, Tuple[str, int]]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self.db_path = db_path
+        self._conn = None
+        self._disk_bytes = 0
+        if db_path:
+            self._conn = sqlite3.connect(db_path, check_same_thread=False)
+            with self._lock, self._conn:
+                self._conn.executescript(SCHEMA)
+                self._disk_bytes = self._conn.execute(
+                    "SELECT COALESCE(SUM(size), 0) FROM llm_cache"
+                ).fetchone()[0]
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached response for a key, or None (counted as a miss)."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return entry[0]
+            if self._conn is not None:
+                row = self._conn.execute("SELECT response FROM llm_cache WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    with self._conn:
+                        self._conn.execute("UPDATE llm_cache SET last_used = ? WHERE key = ?",
+                                           (time.time(), key))
+                    self.disk_hits += 1
+                    self._remember(key, row[0], len(row[0].encode('utf-8')))
+                    return row[0]
+            self.misses += 1
+            return None
+
+    def put(self, key: str, response: str):
+        """Store a response in both tiers."""
+        size = len(response.encode('utf-8'))
+        with self._lock:
+            self._remember(key, response, size)
+            if self._conn is None or size > self.max_disk_bytes:
+                return
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, response, size, last_used) VALUES (?, ?, ?, ?)",
+                    (key, response, size, time.time())
+                )
+                # Other processes may write to the same file, so the bound is checked against
+                # the table's real size (one small aggregate per paid provider call)
+                self._disk_bytes = self._conn.execute(
+                    "SELECT COALESCE(SUM(size), 0) FROM llm_cache"
+                ).fetchone()[0]
+                if self._disk_bytes > self.max_disk_bytes:
+                    self._evict_disk(int(self.max_disk_bytes * 0.9))
+
+    def _remember(self, key: str, response: str, size: int):
+        """Put a response in the memory tier, evicting least recently used entries."""
+        if size > self.max_memory_bytes:
+            return
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= previous[1]
+        self._memory[key] = (response, size)
+        self._memory_bytes += size
+        while self._memory_bytes > self.max_memory_bytes:
+            _, (_, evicted_size) = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted_size
+            self.evictions += 1
+
+    def _evict_disk(self, target_bytes: int):
+        """Delete least recently used disk entries until the tier is at most target_bytes."""
+        while self._disk_bytes > target_bytes:
+            rows = self._conn.execute(
+                "SELECT key, size FROM llm_cache ORDER BY last_used LIMIT 100"
+            ).fetchall()
+            if not rows:
+                self._disk_bytes = 0
+                return
+            doomed = []
+            for key, size in rows:
+                if self._disk_bytes <= target_bytes:
+                    break
+                doomed.append((key,))
+                self._disk_bytes -= size
+                self.evictions += 1
+            self._conn.executemany("DELETE FROM llm_cache WHERE key = ?", doomed)
+
+    def clear(self):
+        """Drop all cached responses from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.execute("DELETE FROM llm_cache")
+                self._disk_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current sizes."""
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                'memory_entries': len(self._memory),
+                'memory_bytes': self._memory_bytes,
+                'disk_bytes': self._disk_bytes,
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': round((self.memory_hits + self.disk_hits) / lookups, 3) if lookups else None,
+                'evictions': self.evictions
+            }
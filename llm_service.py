@@ -4,7 +4,14 @@ Supports OpenAI and Google Gemini API with Gemini 2.0.
 """
 import os
 import json
-from typing import Dict, List, Optional, Any
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Any, Iterator, Tuple
+from rate_limiter import TokenBucket
+from llm_cache import LLMCache, cache_key
+from singleflight import SingleFlight
+from adf_converter import adf_to_markdown
 
 # Conditional imports for LLM providers
 try:
@@ -13,12 +20,44 @@ try:
 except ImportError:
     GEMINI_AVAILABLE = False
 
+# Characters of a Jira description / comment included in prompts
+ISSUE_DESCRIPTION_CHARS = 2000
+COMMENT_CHARS = 500
+# Document text sent per summarization request; longer documents are chunked (map) and merged (reduce)
+SUMMARY_CHUNK_CHARS = 12000
+SUMMARY_WORKERS = 4
+# Document summaries remembered by (doc id, modifiedTime, max_length)
+SUMMARY_MEMO_SIZE = 256
+# Calls at or below this temperature are treated as deterministic and served from the response cache
+CACHEABLE_TEMPERATURE = 0.3
+# Concurrent identical cacheable prompts, across all LLMService instances, share one provider call
+_prompt_calls = SingleFlight()
+
+
+def _split_text(text: str, max_chars: int) -> List[str]:
+    """Split text into chunks of at most max_chars, preferring paragraph, then line, then word breaks."""
+    chunks = []
+    while len(text) > max_chars:
+        cut = -1
+        for separator in ('\n\n', '\n', ' '):
+            cut = text.rfind(separator, max_chars // 2, max_chars)
+            if cut != -1:
+                break
+        if cut == -1:
+            cut = max_chars
+        chunks.append(text[:cut])
+        text = text[cut:].lstrip()
+    if text:
+        chunks.append(text)
+    return chunks
+
 
 class LLMService:
     """Service for interacting with Large Language Models."""
     
     def __init__(self, provider: str = "gemini", api_key: Optional[str] = None, 
-                 model: str = "gemini-2.0-flash"):
+                 model: str = "gemini-2.0-flash", rate_limiter: Optional[TokenBucket] = None,
+                 cache: Optional[LLMCache] = None):
         """
         Initialize LLM service.
         
@@ -26,9 +65,15 @@ class LLMService:
             provider: LLM provider ('gemini', 'openai')
             api_key: API key for the provider (if None, reads from env)
             model: Model name to use (default: Gemini 2.0)
+            rate_limiter: Shared token bucket taken from before every provider call
+            cache: Response cache for low-temperature calls (summaries, action items, ticket structures)
         """
         self.provider = provider.lower()
         self.model = model
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self._summaries: "OrderedDict[Tuple, str]" = OrderedDict()
+        self._summaries_lock = threading.Lock()
         
         if self.provider == "gemini":
             if not GEMINI_AVAILABLE:
@@ -50,6 +95,158 @@ class LLMService:
         else:
             raise ValueError(f"Provider {provider} not supported. Use 'gemini' or 'openai'.")
     
+    def _complete(self, prompt: str, system_prompt: Optional[str] = None,
+                  temperature: Optional[float] = None, max_tokens: Optional[int] = None,
+                  json_mode: bool = False) -> str:
+        """
+        Send one prompt to the configured provider and return the response text.
+        
+        Every provider call goes through here (or _stream) so that rate limiting applies to all of them.
+        Options left as None fall back to the provider's defaults. Calls with a
+        temperature of at most CACHEABLE_TEMPERATURE are answered from the
+        response cache when the same prompt and settings were seen before, and
+        identical ones already in flight (from any instance) are waited for
+        instead of being sent again.
+        """
+        key = self._prompt_key(prompt, system_prompt, temperature, max_tokens, json_mode)
+        if key is None:
+            return self._complete_uncached(prompt, system_prompt, temperature, max_tokens, json_mode)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        
+        text = _prompt_calls.do(key, self._complete_uncached,
+                                prompt, system_prompt, temperature, max_tokens, json_mode)
+        self._cache_response(key, text)
+        return text
+    
+    def _complete_uncached(self, prompt: str, system_prompt: Optional[str], temperature: Optional[float],
+                           max_tokens: Optional[int], json_mode: bool) -> str:
+        """Provider call for _complete."""
+        response = self._request(prompt, system_prompt, temperature, max_tokens, json_mode, stream=False)
+        if self.provider == "gemini":
+            return response.text.strip()
+        else:  # OpenAI
+            return response.choices[0].message.content.strip()
+    
+    def _stream(self, prompt: str, system_prompt: Optional[str] = None,
+                temperature: Optional[float] = None, max_tokens: Optional[int] = None) -> Iterator[str]:
+        """
+        Send one prompt to the configured provider and yield the response text as it arrives.
+        
+        Same options and caching as _complete; a cached response is yielded as one chunk.
+        """
+        key = self._prompt_key(prompt, system_prompt, temperature, max_tokens, False)
+        if key is not None and self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                yield cached
+                return
+        
+        response = self._request(prompt, system_prompt, temperature, max_tokens, False, stream=True)
+        chunks = []
+        for chunk in response:
+            if self.provider == "gemini":
+                try:
+                    text = chunk.text
+                except ValueError:
+                    # Chunks without text parts (e.g. only safety ratings)
+                    continue
+            else:  # OpenAI
+                text = chunk.choices[0].delta.content if chunk.choices else None
+            if text:
+                chunks.append(text)
+                yield text
+        if key is not None:
+            self._cache_response(key, ''.join(chunks).strip())
+    
+    def _cache_response(self, key: str, text: str):
+        """
+        Store a response in the cache. Empty responses (blocked or cut off) are not
+        cached, and a cache failure (e.g. a locked database) never fails a call
+        whose response was already paid for.
+        """
+        if self.cache is None or not text:
+            return
+        try:
+            self.cache.put(key, text)
+        except Exception:
+            pass
+    
+    def _prompt_key(self, prompt: str, system_prompt: Optional[str], temperature: Optional[float],
+                    max_tokens: Optional[int], json_mode: bool) -> Optional[str]:
+        """Content hash identifying a deterministic call, or None if the call is not cacheable."""
+        if temperature is None or temperature > CACHEABLE_TEMPERATURE:
+            return None
+        return cache_key(self.provider, self.model, prompt, system_prompt,
+                         temperature=temperature, max_tokens=max_tokens, json_mode=json_mode)
+    
+    def _request(self, prompt: str, system_prompt: Optional[str], temperature: Optional[float],
+                 max_tokens: Optional[int], json_mode: bool, stream: bool) -> Any:
+        """Rate-limited request to the configured provider; returns the provider's response (or chunk stream)."""
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        
+        if self.provider == "gemini":
+            config = {}
+            if temperature is not None:
+                config['temperature'] = temperature
+            if max_tokens is not None:
+                config['max_output_tokens'] = max_tokens
+            if json_mode:
+                # Gemini supports JSON mode
+                config['response_mime_type'] = "application/json"
+            options = {'stream': True} if stream else {}
+            if config:
+                options['generation_config'] = genai.types.GenerationConfig(**config)
+            return self.client.generate_content(prompt, **options)
+        else:  # OpenAI
+            messages = []
+            if system_prompt:
+                messages.append({"role": "system", "content": system_prompt})
+            messages.append({"role": "user", "content": prompt})
+            options = {}
+            if temperature is not None:
+                options['temperature'] = temperature
+            if max_tokens is not None:
+                options['max_tokens'] = max_tokens
+            if json_mode and "gpt-4" in self.model:
+                options['response_format'] = {"type": "json_object"}
+            if stream:
+                options['stream'] = True
+            return self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                **options
+            )
+    
+    def generate_text(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+        """
+        Generate a free-form response with the provider's default settings.
+        
+        Args:
+            prompt: User prompt
+            system_prompt: System instructions (used by OpenAI; Gemini takes the prompt only)
+        
+        Returns:
+            Generated text
+        """
+        return self._complete(prompt, system_prompt=system_prompt)
+    
+    def generate_text_stream(self, prompt: str, system_prompt: Optional[str] = None) -> Iterator[str]:
+        """
+        Streaming variant of generate_text.
+        
+        Args:
+            prompt: User prompt
+            system_prompt: System instructions (used by OpenAI; Gemini takes the prompt only)
+        
+        Returns:
+            Iterator over text chunks as the provider produces them
+        """
+        return self._stream(prompt, system_prompt=system_prompt)
+    
     def generate_summary(self, text: str, max_length: int = 200) -> str:
         """
         Generate a concise summary of the given text using Gemini 2.0.
@@ -70,29 +267,125 @@ Text:
 Summary:"""
         
         try:
-            if self.provider == "gemini":
-                response = self.client.generate_content(
-                    prompt,
-                    generation_config=genai.types.GenerationConfig(
-                        temperature=0.3,
-                        max_output_tokens=500
-                    )
-                )
-                return response.text.strip()
-            else:  # OpenAI
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {"role": "system", "content": "You are a helpful assistant that creates concise, informative summaries."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.3,
-                    max_tokens=500
-                )
-                return response.choices[0].message.content.strip()
+            return self._complete(
+                prompt,
+                system_prompt="You are a helpful assistant that creates concise, informative summaries.",
+                temperature=0.3,
+                max_tokens=500
+            )
         except Exception as e:
             raise Exception(f"Failed to generate summary: {str(e)}")
     
+    def summarize_documents(self, documents: List[Dict[str, Any]], max_length: int = 200,
+                            max_workers: int = SUMMARY_WORKERS,
+                            chunk_chars: int = SUMMARY_CHUNK_CHARS) -> Dict[Tuple[str, str], str]:
+        """
+        Summarize several documents concurrently with map-reduce for long ones.
+        
+        Documents up to chunk_chars are summarized in one request. Longer ones
+        are split into chunks that are summarized in parallel (map), and the
+        partial summaries are then merged into one summary (reduce). All
+        requests of a round, across documents, share one bounded worker pool,
+        so a batch costs about one LLM round trip per round instead of one per
+        document. Summaries are remembered per (doc id, modifiedTime).
+        
+        Args:
+            documents: Documents with 'id', 'content' and 'modified_time' (or
+                'modifiedTime'), e.g. from GoogleDocsReader.find_meeting_notes
+            max_length: Maximum length of each summary in words
+            max_workers: Summarization requests in flight at once
+            chunk_chars: Document text sent per request
+        
+        Returns:
+            {(doc id, modifiedTime): summary}; documents whose summarization
+            failed are left out so callers can fall back to the raw text
+        """
+        summaries = {}
+        # Pieces still to be summarized per document: its text, then partial summaries
+        work = {}
+        for document in documents:
+            key = (document.get('id'), document.get('modified_time') or document.get('modifiedTime'))
+            memo_key = key + (max_length,)
+            if all(key):
+                with self._summaries_lock:
+                    summary = self._summaries.get(memo_key)
+                    if summary is not None:
+                        self._summaries.move_to_end(memo_key)
+                        summaries[key] = summary
+                        continue
+            if document.get('content'):
+                work[key] = [document['content']]
+        
+        rounds = 0
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            while work:
+                futures = {}
+                for key, pieces in work.items():
+                    chunks = _split_text('\n\n'.join(pieces), chunk_chars)
+                    if len(chunks) == 1:
+                        task = self._merge_summaries if rounds else self.generate_summary
+                        futures[key] = [executor.submit(task, chunks[0], max_length)]
+                    else:
+                        futures[key] = [executor.submit(self._summarize_chunk, chunk, index, len(chunks))
+                                        for index, chunk in enumerate(chunks, 1)]
+                next_work = {}
+                for key, key_futures in futures.items():
+                    try:
+                        parts = [future.result() for future in key_futures]
+                    except Exception:
+                        continue
+                    if len(parts) > 1:
+                        next_work[key] = parts
+                        continue
+                    summaries[key] = parts[0]
+                    if all(key):
+                        with self._summaries_lock:
+                            self._summaries[key + (max_length,)] = parts[0]
+                            if len(self._summaries) > SUMMARY_MEMO_SIZE:
+                                self._summaries.popitem(last=False)
+                work = next_work
+                rounds += 1
+        return summaries
+    
+    def _summarize_chunk(self, text: str, index: int, total: int) -> str:
+        """Summarize one part of a long document (map step)."""
+        prompt = f"""The following is part {index} of {total} of a longer document.
+Summarize it in a short paragraph, keeping decisions, status updates, owners, dates and action items.
+
+Text:
+{text}
+
+Summary:"""
+        try:
+            return self._complete(
+                prompt,
+                system_prompt="You are a helpful assistant that creates concise, informative summaries.",
+                temperature=0.3,
+                max_tokens=500
+            )
+        except Exception as e:
+            raise Exception(f"Failed to summarize chunk {index} of {total}: {str(e)}")
+    
+    def _merge_summaries(self, partial_summaries: str, max_length: int) -> str:
+        """Merge the partial summaries of one document into one summary (reduce step)."""
+        prompt = f"""The following are summaries of consecutive parts of one document.
+Combine them into a single concise summary of approximately {max_length} words or less.
+Focus on the key points, current status, and any important details.
+
+Partial summaries:
+{partial_summaries}
+
+Summary:"""
+        try:
+            return self._complete(
+                prompt,
+                system_prompt="You are a helpful assistant that creates concise, informative summaries.",
+                temperature=0.3,
+                max_tokens=500
+            )
+        except Exception as e:
+            raise Exception(f"Failed to merge summaries: {str(e)}")
+    
     def extract_action_items(self, meeting_summary: str) -> List[Dict[str, Any]]:
         """
         Extract action items from a meeting summary.
@@ -154,27 +447,12 @@ Meeting Summary:
 Action Items (JSON only, no additional text):"""
         
         try:
-            if self.provider == "gemini":
-                # Gemini supports JSON mode
-                response = self.client.generate_content(
-                    prompt,
-                    generation_config=genai.types.GenerationConfig(
-                        temperature=0.2,
-                        response_mime_type="application/json"
-                    )
-                )
-                content = response.text.strip()
-            else:  # OpenAI
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {"role": "system", "content": "You are a helpful assistant that extracts action items from meeting summaries. Always return valid JSON."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.2,
-                    response_format={"type": "json_object"} if "gpt-4" in self.model else None
-                )
-                content = response.choices[0].message.content.strip()
+            content = self._complete(
+                prompt,
+                system_prompt="You are a helpful assistant that extracts action items from meeting summaries. Always return valid JSON.",
+                temperature=0.2,
+                json_mode=True
+            )
             
             # Try to parse JSON - handle cases where LLM adds extra text
             if content.startswith("```json"):
@@ -226,7 +504,8 @@ Action Items (JSON only, no additional text):"""
         issue_key = issue_data.get('key', 'Unknown')
         
         summary = fields.get('summary', 'No summary')
-        description = self._extract_text_from_jira_content(fields.get('description', {}))
+        description = adf_to_markdown(fields.get('description'), max_chars=ISSUE_DESCRIPTION_CHARS,
+                                      cache_key=(issue_key, fields.get('updated')))
         status = fields.get('status', {}).get('name', 'Unknown')
         assignee = fields.get('assignee', {}).get('displayName', 'Unassigned')
         reporter = fields.get('reporter', {}).get('displayName', 'Unknown')
@@ -235,7 +514,8 @@ Action Items (JSON only, no additional text):"""
         # Get recent comments
         recent_comments = []
         for comment in comments[-3:]:  # Last 3 comments
-            comment_text = self._extract_text_from_jira_content(comment.get('body', {}))
+            comment_text = adf_to_markdown(comment.get('body'), max_chars=COMMENT_CHARS,
+                                           cache_key=(issue_key, comment.get('id'), comment.get('updated')))
             comment_author = comment.get('author', {}).get('displayName', 'Unknown')
             recent_comments.append(f"{comment_author}: {comment_text}")
         
@@ -266,26 +546,12 @@ Issue Information:
 Status Summary:"""
         
         try:
-            if self.provider == "gemini":
-                response = self.client.generate_content(
-                    prompt,
-                    generation_config=genai.types.GenerationConfig(
-                        temperature=0.3,
-                        max_output_tokens=800
-                    )
-                )
-                return response.text.strip()
-            else:  # OpenAI
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {"role": "system", "content": "You are a project management assistant that creates clear, actionable status summaries for Jira issues."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.3,
-                    max_tokens=800
-                )
-                return response.choices[0].message.content.strip()
+            return self._complete(
+                prompt,
+                system_prompt="You are a project management assistant that creates clear, actionable status summaries for Jira issues.",
+                temperature=0.3,
+                max_tokens=800
+            )
         except Exception as e:
             raise Exception(f"Failed to generate issue summary: {str(e)}")
     
@@ -343,26 +609,12 @@ Return a JSON object with this structure:
 Suggested Structure (JSON only):"""
         
         try:
-            if self.provider == "gemini":
-                response = self.client.generate_content(
-                    prompt,
-                    generation_config=genai.types.GenerationConfig(
-                        temperature=0.3,
-                        response_mime_type="application/json"
-                    )
-                )
-                content = response.text.strip()
-            else:  # OpenAI
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {"role": "system", "content": "You are a project management assistant that structures action items into well-organized Jira tickets. Always return valid JSON."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.3,
-                    response_format={"type": "json_object"} if "gpt-4" in self.model else None
-                )
-                content = response.choices[0].message.content.strip()
+            content = self._complete(
+                prompt,
+                system_prompt="You are a project management assistant that structures action items into well-organized Jira tickets. Always return valid JSON.",
+                temperature=0.3,
+                json_mode=True
+            )
             
             # Clean up JSON response
             if content.startswith("```json"):
@@ -373,21 +625,3 @@ Suggested Structure (JSON only):"""
             return json.loads(content)
         except Exception as e:
             raise Exception(f"Failed to suggest ticket structure: {str(e)}")
-    
-    def _extract_text_from_jira_content(self, content: Any) -> str:
-        """Extract plain text from Jira's content format."""
-        if isinstance(content, str):
-            return content
-        if isinstance(content, dict):
-            if 'content' in content:
-                return self._extract_text_from_jira_content(content['content'])
-            if 'text' in content:
-                return content['text']
-        if isinstance(content, list):
-            return ' '.join([
-                self._extract_text_from_jira_content(item) 
-                for item in content 
-                if item.get('type') == 'text' or item.get('type') == 'paragraph'
-            ])
-        return str(content) if content else ""
-
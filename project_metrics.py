@@ -0,0 +1,163 @@
+"""
+Project Metrics - Single-pass aggregation of categorized Jira issues.
+"""
+from typing import Dict, List, Optional, Any, Tuple, Iterable
+from datetime import date, datetime
+from functools import lru_cache
+
+
+# Statuses that never count as overdue
+DONE_STATUSES = frozenset(('Done', 'Closed', 'Resolved'))
+
+
+@lru_cache(maxsize=4096)
+def parse_due_date(value: str) -> Optional[date]:
+    """Parse a Jira due date ('2024-03-01' or a full timestamp); each distinct string is parsed once."""
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).date()
+    except (ValueError, AttributeError):
+        return None
+
+
+def _decrement(counts: Dict[str, int], name: str):
+    """Decrease a count, dropping the entry when it reaches zero."""
+    remaining = counts[name] - 1
+    if remaining:
+        counts[name] = remaining
+    else:
+        del counts[name]
+
+
+class ProjectMetrics:
+    """
+    Accumulates every project aggregate (status, assignee, assignee x status,
+    type and overdue counts) in one pass as categorized issues are added.
+
+    Feed issues with add() while categorizing them, then read the result with
+    to_dict(); the assignee x status counts double as chart input. Once built,
+    apply_delta() keeps the aggregates current in O(changed issues) as issues
+    are updated, created or deleted. Overdue counts are relative to `today`,
+    so metrics must be rebuilt when the date changes.
+    """
+
+    def __init__(self, today: Optional[date] = None):
+        """
+        Initialize empty metrics.
+
+        Args:
+            today: Reference date for overdue checks (default: today)
+        """
+        self.today = today or datetime.now().date()
+        self.status_counts: Dict[str, int] = {}
+        self.assignee_counts: Dict[str, int] = {}
+        self.type_counts: Dict[str, int] = {'epics': 0, 'stories': 0, 'tasks': 0}
+        # assignee -> status -> count
+        self.assignee_status: Dict[str, Dict[str, int]] = {}
+        self.overdue_count = 0
+        self.total_issues = 0
+
+    def copy(self) -> 'ProjectMetrics':
+        """Independent copy, so one version can be updated while another is being read."""
+        metrics = ProjectMetrics(self.today)
+        metrics.status_counts = dict(self.status_counts)
+        metrics.assignee_counts = dict(self.assignee_counts)
+        metrics.type_counts = dict(self.type_counts)
+        metrics.assignee_status = {assignee: dict(by_status)
+                                   for assignee, by_status in self.assignee_status.items()}
+        metrics.overdue_count = self.overdue_count
+        metrics.total_issues = self.total_issues
+        return metrics
+
+    def add(self, bucket: str, issue: Dict[str, Any]):
+        """
+        Count one categorized issue.
+
+        Args:
+            bucket: 'epics', 'stories' or 'tasks'
+            issue: Issue data as produced by JiraDataFetcher._categorize_issue
+        """
+        status = issue.get('status', 'Unknown')
+        assignee = issue.get('assignee', 'Unassigned')
+        self.total_issues += 1
+        self.type_counts[bucket] += 1
+        self.status_counts[status] = self.status_counts.get(status, 0) + 1
+        self.assignee_counts[assignee] = self.assignee_counts.get(assignee, 0) + 1
+        by_status = self.assignee_status.get(assignee)
+        if by_status is None:
+            by_status = self.assignee_status[assignee] = {}
+        by_status[status] = by_status.get(status, 0) + 1
+
+        if self._is_overdue(issue, status):
+            self.overdue_count += 1
+
+    def remove(self, bucket: str, issue: Dict[str, Any]):
+        """Uncount an issue previously passed to add(); aggregates that reach zero are dropped."""
+        status = issue.get('status', 'Unknown')
+        assignee = issue.get('assignee', 'Unassigned')
+        self.total_issues -= 1
+        self.type_counts[bucket] -= 1
+        _decrement(self.status_counts, status)
+        _decrement(self.assignee_counts, assignee)
+        by_status = self.assignee_status[assignee]
+        _decrement(by_status, status)
+        if not by_status:
+            del self.assignee_status[assignee]
+        if self._is_overdue(issue, status):
+            self.overdue_count -= 1
+
+    def apply_delta(self, old: Optional[Tuple[Optional[str], Dict[str, Any]]],
+                    new: Optional[Tuple[Optional[str], Dict[str, Any]]]):
+        """
+        Update the aggregates for one changed issue.
+
+        Args:
+            old: (bucket, issue) as previously counted, or None for a newly created issue
+            new: (bucket, issue) as it is now, or None for a deleted issue; a None
+                bucket (an issue type outside epics/stories/tasks) counts as absent
+        """
+        if old is not None and old[0]:
+            self.remove(*old)
+        if new is not None and new[0]:
+            self.add(*new)
+
+    def verify(self, issues: Iterable[Tuple[Optional[str], Dict[str, Any]]]) -> List[str]:
+        """
+        Compare against a full recompute, for testing incrementally maintained metrics.
+
+        Args:
+            issues: (bucket, issue) pairs of every current issue, as produced by
+                JiraDataFetcher._categorize_issue
+
+        Returns:
+            Names of the aggregates that differ (empty when consistent)
+        """
+        expected = ProjectMetrics(self.today)
+        for bucket, issue in issues:
+            if bucket:
+                expected.add(bucket, issue)
+        expected, actual = expected.to_dict(), self.to_dict()
+        return [name for name in expected if expected[name] != actual[name]]
+
+    def _is_overdue(self, issue: Dict[str, Any], status: str) -> bool:
+        due_date_str = issue.get('due_date')
+        if not due_date_str or status in DONE_STATUSES:
+            return False
+        due_date = parse_due_date(due_date_str)
+        return due_date is not None and due_date < self.today
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Metrics in the shape returned by JiraDataFetcher.get_project_issues (copies, safe to keep)."""
+        return {
+            'status_counts': dict(self.status_counts),
+            'assignee_counts': dict(self.assignee_counts),
+            'type_counts': dict(self.type_counts),
+            'status_assignee_matrix': {
+                f"{assignee}|{status}": count
+                for assignee, by_status in self.assignee_status.items()
+                for status, count in by_status.items()
+            },
+            'assignee_status': {assignee: dict(by_status)
+                                for assignee, by_status in self.assignee_status.items()},
+            'overdue_count': self.overdue_count,
+            'total_issues': self.total_issues
+        }
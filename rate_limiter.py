@@ -0,0 +1,137 @@
+"""
+Rate Limiter - Token buckets shared by the Jira, Google Drive and LLM clients.
+"""
+from typing import Dict, Optional, Any
+import asyncio
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Thread-safe and asyncio-safe token bucket.
+
+    Callers reserve tokens under a short lock and then sleep outside it
+    (time.sleep for threads, asyncio.sleep for coroutines), so waiting never
+    blocks other callers or the event loop. Reservations may drive the bucket
+    negative, which queues later callers fairly behind earlier ones.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None, name: str = ''):
+        """
+        Initialize token bucket.
+
+        Args:
+            rate: Tokens added per second (sustained requests per second)
+            capacity: Maximum burst size (default: one second worth of tokens, at least 1)
+            name: Provider name used in statistics
+        """
+        if rate <= 0:
+            raise ValueError("Rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.name = name
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        # Wait statistics
+        self._requests = 0
+        self._waited_requests = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def _reserve(self, tokens: float) -> float:
+        """Take tokens now and return how long the caller must wait before using them."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            self._requests += 1
+            if wait > 0:
+                self._waited_requests += 1
+                self._total_wait += wait
+                self._max_wait = max(self._max_wait, wait)
+            return wait
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Block the calling thread until tokens are available; returns seconds waited."""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, tokens: float = 1.0) -> float:
+        """Wait without blocking the event loop until tokens are available; returns seconds waited."""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Wait-time statistics.
+
+        A high waited_ratio means the provider is quota-bound (requests queue on
+        the bucket) rather than latency-bound.
+        """
+        with self._lock:
+            requests = self._requests
+            return {
+                'name': self.name,
+                'rate': self.rate,
+                'capacity': self.capacity,
+                'requests': requests,
+                'waited_requests': self._waited_requests,
+                'waited_ratio': self._waited_requests / requests if requests else 0.0,
+                'total_wait_seconds': round(self._total_wait, 3),
+                'avg_wait_seconds': round(self._total_wait / requests, 4) if requests else 0.0,
+                'max_wait_seconds': round(self._max_wait, 3)
+            }
+
+
+# Process-wide buckets, one per provider, so every client of a provider shares its quota
+_limiters: Dict[str, TokenBucket] = {}
+_limiters_lock = threading.Lock()
+
+
+def configure_rate_limiters(rate_limits: Dict[str, Dict[str, float]]) -> Dict[str, TokenBucket]:
+    """
+    Create or update the shared per-provider buckets.
+
+    Args:
+        rate_limits: Mapping of provider ('jira', 'google_drive', 'llm') to
+            {'rate': requests per second, 'burst': bucket capacity}; a rate of 0
+            disables limiting for that provider
+
+    Returns:
+        The configured buckets by provider
+    """
+    with _limiters_lock:
+        for provider, settings in rate_limits.items():
+            rate = settings.get('rate') or 0
+            if rate <= 0:
+                _limiters.pop(provider, None)
+                continue
+            bucket = _limiters.get(provider)
+            if bucket is None:
+                _limiters[provider] = TokenBucket(rate, settings.get('burst'), name=provider)
+            else:
+                with bucket._lock:
+                    bucket.rate = rate
+                    bucket.capacity = settings.get('burst') or max(1.0, rate)
+        return dict(_limiters)
+
+
+def get_rate_limiter(provider: str) -> Optional[TokenBucket]:
+    """Shared bucket for a provider, or None if it is not rate limited."""
+    with _limiters_lock:
+        return _limiters.get(provider)
+
+
+def rate_limiter_stats() -> Dict[str, Dict[str, Any]]:
+    """Wait-time statistics for every configured provider."""
+    with _limiters_lock:
+        limiters = dict(_limiters)
+    return {provider: bucket.stats() for provider, bucket in limiters.items()}
@@ -0,0 +1,110 @@
+"""
+Response Cache - Memory-bounded LRU of HTTP GET bodies with their validators.
+"""
+from collections import OrderedDict
+from typing import Dict, Optional, Any, Tuple
+import re
+import threading
+
+
+class ResponseCache:
+    """
+    LRU cache of parsed GET response bodies keyed by URL, bounded by total body bytes.
+
+    Only responses that carry an ETag or Last-Modified validator are stored, so
+    every hit is revalidated with a conditional request: an unchanged resource
+    costs a bodyless 304 instead of a download and a JSON parse.
+
+    Cached bodies are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024, max_entry_fraction: float = 0.25):
+        """
+        Initialize response cache.
+
+        Args:
+            max_bytes: Upper bound on the summed size of cached response bodies
+            max_entry_fraction: Bodies larger than this fraction of max_bytes are never cached
+        """
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = int(max_bytes * max_entry_fraction)
+        # url -> (etag, last_modified, body, size)
+        self._entries: "OrderedDict[str, Tuple[Optional[str], Optional[str], Any, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Validator headers to send for a URL, empty if nothing is cached."""
+        with self._lock:
+            entry = self._entries.get(url)
+        if entry is None:
+            return {}
+        etag, last_modified, _, _ = entry
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        return headers
+
+    def revalidated(self, url: str) -> Any:
+        """Body for a URL the server answered 304 Not Modified; marks it most recently used."""
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None:
+                raise KeyError(url)
+            self._entries.move_to_end(url)
+            self.hits += 1
+            return entry[2]
+
+    def store(self, url: str, headers: Any, body: Any, size: int):
+        """Cache a 200 response body if it has validators and fits the entry bound."""
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        with self._lock:
+            self.misses += 1
+            self._discard(url)
+            if not (etag or last_modified) or size > self.max_entry_bytes:
+                return
+            self._entries[url] = (etag, last_modified, body, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes and self._entries:
+                _, (_, _, _, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def invalidate(self, marker: str):
+        """
+        Drop every cached URL of the resource marker names (e.g. '/issue/PROJ-1' after
+        a write). The marker must end at a path or query boundary, so PROJ-10 is kept.
+        """
+        pattern = re.compile(re.escape(marker) + r'(?=[/?]|$)')
+        with self._lock:
+            for url in [url for url in self._entries if pattern.search(url)]:
+                self._discard(url)
+
+    def clear(self):
+        """Drop all cached responses."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _discard(self, url: str):
+        entry = self._entries.pop(url, None)
+        if entry is not None:
+            self._bytes -= entry[3]
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size."""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
@@ -0,0 +1,79 @@
+"""
+Single Flight - Coalesces concurrent identical calls into one in-flight call.
+"""
+from typing import Dict, Any, Callable, Hashable
+import threading
+
+
+class _Call:
+    """One in-flight call and its outcome."""
+
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Process-wide request coalescing by key.
+
+    The first caller for a key (the leader) runs the call; callers arriving
+    with the same key while it is in flight wait for it and receive the same
+    result, or the same exception. Nothing is cached: once the call finishes
+    the key is forgotten and the next caller starts a new call, so keys only
+    need to identify what a call would return right now (e.g. project key
+    plus the fetch profile), not how long the result stays valid.
+
+    Results are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Run fn(*args, **kwargs), or wait for the identical call already in flight.
+
+        Args:
+            key: Identifies the call; equal keys must mean equal results
+            fn: Function to run if no call with this key is in flight
+
+        Returns:
+            The result of the (possibly shared) call
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> Dict[str, int]:
+        """Calls run, calls served by sharing another caller's result, and calls in flight."""
+        with self._lock:
+            return {'calls': self.calls, 'shared': self.shared, 'in_flight': len(self._calls)}
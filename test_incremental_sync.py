@@ -0,0 +1,185 @@
+"""
+Tests for delta syncs of store-backed projects: the frame, metrics and epic
+roll-ups updated incrementally must match a full load of the same issues.
+
+Run with: python -m pytest -q test_incremental_sync.py
+"""
+from typing import Dict, List, Optional
+
+import jira_data_fetcher
+from jira_data_fetcher import JiraDataFetcher
+from issue_store import IssueStore
+from epic_index import EpicIndex
+
+
+def _issue(number: int, issue_type: str = 'Story', status: str = 'To Do',
+           parent: Optional[str] = None) -> Dict:
+    fields = {
+        'summary': f'Issue {number}',
+        'issuetype': {'name': issue_type},
+        'status': {'name': status},
+        'assignee': {'displayName': f'User {number % 3}'},
+        'priority': {'name': 'Medium'},
+        'created': '2024-01-01T10:00:00.000+0000',
+        'updated': '2024-01-01T10:00:00.000+0000',
+        'duedate': '2024-02-01' if number % 4 == 0 else None
+    }
+    if parent:
+        fields['parent'] = {'key': parent}
+    return {'key': f'P-{number}', 'fields': fields}
+
+
+class FakeJira:
+    """In-process stand-in for JiraClient covering what store-backed fetches use."""
+
+    def __init__(self, issues: List[Dict]):
+        self.base_url = 'https://example.atlassian.net'
+        self.email = 'test@example.com'
+        self.bytes_received = 0
+        self.issues = {issue['key']: issue for issue in issues}
+        # Keys returned by the next delta query (issues "updated since the watermark")
+        self.changed = set()
+
+    def get_projects(self) -> List[Dict]:
+        return []
+
+    def get_current_user(self) -> Dict:
+        return {'timeZone': 'UTC'}
+
+    def update(self, issue: Dict):
+        self.issues[issue['key']] = issue
+        self.changed.add(issue['key'])
+
+    def delete(self, key: str):
+        del self.issues[key]
+
+    def iter_issue_pages(self, jql: str, profile: Optional[str] = None, **kwargs):
+        if 'updated >=' in jql:
+            page = [self.issues[key] for key in sorted(self.changed) if key in self.issues]
+            self.changed = set()
+        else:
+            page = list(self.issues.values())
+        yield page
+
+    def iter_issues(self, jql: str, fields=None, page_size: int = 100, **kwargs):
+        # Shard bounds lookups (ORDER BY) find nothing, so full loads use a single query
+        if 'ORDER BY' in jql:
+            return iter(())
+        return iter(list(self.issues.values()))
+
+
+def _project(count: int = 30) -> List[Dict]:
+    issues = []
+    for number in range(count):
+        if number % 10 == 0:
+            issues.append(_issue(number, 'Epic'))
+        else:
+            issues.append(_issue(number, 'Task' if number % 2 else 'Story',
+                                 parent=f'P-{number - number % 10}'))
+    return issues
+
+
+def _synced(jira: FakeJira) -> JiraDataFetcher:
+    fetcher = JiraDataFetcher(jira, IssueStore(':memory:', sweep_interval=0))
+    assert fetcher.get_project_issues('P')['fetch_stats']['sync']['mode'] == 'full'
+    return fetcher
+
+
+def _assert_matches_full_load(jira: FakeJira, data: Dict):
+    full = JiraDataFetcher(jira, IssueStore(':memory:')).get_project_issues('P')
+    assert data['metrics'] == full['metrics']
+    assert sorted(data['frame'].df['key']) == sorted(full['frame'].df['key'])
+    assert data['frame'].df['status'].dtype == 'category'
+
+
+def test_deletion_only_delta():
+    jira = FakeJira(_project())
+    fetcher = _synced(jira)
+    jira.delete('P-3')
+    jira.delete('P-10')
+
+    data = fetcher.get_project_issues('P')
+
+    assert data['fetch_stats']['sync']['mode'] == 'delta'
+    assert data['fetch_stats']['sync']['deleted'] == 2
+    _assert_matches_full_load(jira, data)
+
+
+def test_non_bucket_only_delta():
+    jira = FakeJira(_project())
+    fetcher = _synced(jira)
+    jira.update(_issue(30, 'Bug'))
+    jira.update(_issue(31, 'Bug', status='Done'))
+
+    data = fetcher.get_project_issues('P')
+
+    assert data['fetch_stats']['sync']['mode'] == 'delta'
+    assert 'P-30' not in set(data['frame'].df['key'])
+    _assert_matches_full_load(jira, data)
+
+
+def test_issue_changed_into_bug():
+    jira = FakeJira(_project())
+    fetcher = _synced(jira)
+    jira.update(_issue(5, 'Bug'))
+
+    _assert_matches_full_load(jira, fetcher.get_project_issues('P'))
+
+
+def test_incremental_metrics_verify_after_add_change_delete():
+    jira = FakeJira(_project())
+    fetcher = _synced(jira)
+    snapshot_key = (fetcher.store.identity, 'P')
+
+    def check():
+        data = fetcher.get_project_issues('P')
+        assert data['fetch_stats']['sync']['mode'] == 'delta'
+        metrics = jira_data_fetcher._store_snapshots[snapshot_key].metrics
+        issues = [fetcher._categorize_issue(issue) for issue in jira.issues.values()]
+        assert metrics.verify(issues) == []
+        assert data['metrics'] == metrics.to_dict()
+
+    # Added, changed, then deleted issues
+    jira.update(_issue(40, 'Task', parent='P-0'))
+    check()
+    jira.update(_issue(7, 'Task', status='Done', parent='P-0'))
+    jira.update(_issue(12, 'Story', status='In Progress'))
+    check()
+    jira.delete('P-8')
+    jira.delete('P-20')
+    check()
+
+
+def test_verify_reports_drift():
+    jira = FakeJira(_project())
+    fetcher = _synced(jira)
+    metrics = jira_data_fetcher._store_snapshots[(fetcher.store.identity, 'P')].metrics.copy()
+    metrics.add('tasks', fetcher._categorize_issue(_issue(99, 'Task'))[1])
+
+    issues = [fetcher._categorize_issue(issue) for issue in jira.issues.values()]
+    assert 'type_counts' in metrics.verify(issues)
+
+
+def test_incremental_epic_rollups_match_full_build():
+    jira = FakeJira(_project())
+    fetcher = _synced(jira)
+
+    # Added child, child moved to another epic, child closed then moved, child and epic deleted
+    jira.update(_issue(41, 'Story', parent='P-20'))
+    jira.update(_issue(3, 'Task', parent='P-10'))
+    jira.update(_issue(14, 'Story', status='Done', parent='P-10'))
+    jira.delete('P-25')
+    data = fetcher.get_project_issues('P')
+    jira.update(_issue(14, 'Story', status='Done', parent='P-20'))
+    jira.delete('P-0')
+    data = fetcher.get_project_issues('P')
+    assert data['fetch_stats']['sync']['mode'] == 'delta'
+
+    issues = [fetcher._categorize_issue(issue)[1] for issue in jira.issues.values()]
+    full = EpicIndex.from_issues(issues, today=data['epic_index'].today)
+    incremental = data['epic_index']
+    assert {parent: sorted(keys) for parent, keys in incremental.children.items()} == \
+        {parent: sorted(keys) for parent, keys in full.children.items()}
+    for parent_key in ('P-0', 'P-10', 'P-20'):
+        assert incremental.progress(parent_key) == full.progress(parent_key)
+    assert incremental.progress('P-20')['done'] == 1
@@ -0,0 +1,183 @@
+"""
+Ticket Creator - Create the Jira tickets suggested from meeting notes in bulk.
+"""
+from typing import Dict, List, Optional, Any, Callable
+import hashlib
+from jira_client import JiraClient
+
+
+# Label prefix that marks a ticket created by Helios; the suffix is the ticket's idempotency key
+IDEMPOTENCY_LABEL_PREFIX = 'helios-'
+# Labels per pre-check search, keeps the JQL well under URL length limits
+LABEL_LOOKUP_BATCH = 100
+PRIORITY_NAMES = {'high': 'High', 'medium': 'Medium', 'low': 'Low'}
+
+
+def _idempotency_label(project_key: str, source_id: str, path: str, summary: str) -> str:
+    """Stable label for one suggested ticket, derived from where it came from."""
+    digest = hashlib.sha256(f"{project_key}|{source_id}|{path}|{summary}".encode('utf-8')).hexdigest()
+    return f"{IDEMPOTENCY_LABEL_PREFIX}{digest[:16]}"
+
+
+class TicketCreator:
+    """
+    Creates a ticket structure from LLMService.suggest_ticket_structure in two bulk phases.
+
+    Parent and standalone tickets are created first (issue/bulk, 50 per request,
+    chunks in parallel); subtasks follow in a second bulk phase once their
+    parents' keys are known.
+
+    Jira has no idempotency keys for issue creation, so every ticket carries a
+    deterministic 'helios-<hash>' label. Before each phase the labels are looked
+    up and tickets that already exist are reused instead of recreated, which
+    makes re-running the same structure (e.g. after a partial failure) safe.
+    Jira's search index lags behind creation, so labels this creator has
+    already created are remembered and never searched for; keep one instance
+    per session for retries.
+    """
+
+    def __init__(self, jira_client: JiraClient, subtask_type: str = 'Subtask'):
+        """
+        Initialize ticket creator.
+
+        Args:
+            jira_client: Initialized JiraClient instance
+            subtask_type: Name of the sub-task issue type ('Subtask' or 'Sub-task' depending on the project)
+        """
+        self.jira = jira_client
+        self.subtask_type = subtask_type
+        # display name -> accountId (None if not found), shared across runs
+        self._account_ids: Dict[str, Optional[str]] = {}
+        # idempotency label -> key of every ticket created by earlier bulk responses
+        self._created: Dict[str, str] = {}
+
+    def create_from_structure(self, project_key: str, structure: Dict[str, Any], source_id: str = '',
+                              progress_callback: Optional[Callable[[int, int, str], None]] = None) -> Dict[str, Any]:
+        """
+        Create all tickets of a suggested structure.
+
+        Args:
+            project_key: Project to create the tickets in
+            structure: Output of LLMService.suggest_ticket_structure
+            source_id: Identifier of the source (e.g. document ID), part of each idempotency key
+            progress_callback: Called as (done, total, message) after each phase step
+
+        Returns:
+            Dictionary with 'created' and 'existing' ticket lists ({key, summary, label, parent})
+            and 'errors' ({summary, error})
+        """
+        parents = structure.get('parent_tickets', []) or []
+        standalone = structure.get('standalone_tickets', []) or []
+        total = len(parents) + len(standalone) + sum(len(p.get('subtasks', []) or []) for p in parents)
+        result = {'created': [], 'existing': [], 'errors': []}
+        done = 0
+
+        def report(count: int, message: str):
+            nonlocal done
+            done += count
+            if progress_callback:
+                progress_callback(done, total, message)
+
+        # Phase 1: parents and standalone tickets
+        top_level = []
+        for index, ticket in enumerate(parents):
+            top_level.append((f"parent/{index}", ticket, ticket.get('issue_type') or 'Story', None))
+        for index, ticket in enumerate(standalone):
+            top_level.append((f"standalone/{index}", ticket, ticket.get('issue_type') or 'Task', None))
+        keys = self._create_phase(project_key, source_id, top_level, result, report)
+
+        # Phase 2: subtasks of parents that exist
+        subtasks = []
+        for index, ticket in enumerate(parents):
+            parent_path = f"parent/{index}"
+            for sub_index, subtask in enumerate(ticket.get('subtasks', []) or []):
+                if parent_path not in keys:
+                    result['errors'].append({'summary': subtask.get('summary', ''),
+                                             'error': 'Parent ticket was not created'})
+                    report(1, 'Skipped subtask without parent')
+                    continue
+                subtasks.append((f"{parent_path}/sub/{sub_index}", subtask, self.subtask_type, keys[parent_path]))
+        self._create_phase(project_key, source_id, subtasks, result, report)
+        return result
+
+    def _create_phase(self, project_key: str, source_id: str, tickets: List[tuple],
+                      result: Dict[str, List], report: Callable[[int, str], None]) -> Dict[str, str]:
+        """Create one phase of (path, ticket, issue_type, parent_key) tuples; returns path -> issue key."""
+        if not tickets:
+            return {}
+        labels = {path: _idempotency_label(project_key, source_id, path, ticket.get('summary', ''))
+                  for path, ticket, _, _ in tickets}
+        existing = {label: self._created[label] for label in labels.values() if label in self._created}
+        existing.update(self._find_existing(project_key, [label for label in labels.values()
+                                                          if label not in existing]))
+        keys = {}
+        to_create = []
+        for path, ticket, issue_type, parent_key in tickets:
+            label = labels[path]
+            entry = {'summary': ticket.get('summary', ''), 'label': label, 'parent': parent_key}
+            if label in existing:
+                keys[path] = existing[label]
+                result['existing'].append({**entry, 'key': existing[label]})
+            else:
+                to_create.append((path, entry, self._issue_spec(ticket, issue_type, label, parent_key)))
+        if len(to_create) < len(tickets):
+            report(len(tickets) - len(to_create), 'Skipped tickets that already exist')
+        if not to_create:
+            return keys
+
+        response = self.jira.create_issues_bulk(project_key, [spec for _, _, spec in to_create])
+        for index, (path, entry, _) in enumerate(to_create):
+            created = response['created'][index]
+            if created:
+                keys[path] = self._created[entry['label']] = created['key']
+                result['created'].append({**entry, 'key': created['key']})
+            else:
+                result['errors'].append({'summary': entry['summary'],
+                                         'error': response['errors'].get(index, 'Unknown error')})
+        report(len(to_create), f"Created {len(to_create) - len(response['errors'])} of {len(to_create)} tickets")
+        return keys
+
+    def _issue_spec(self, ticket: Dict, issue_type: str, label: str, parent_key: Optional[str]) -> Dict:
+        """Turn one suggested ticket into a create_issues_bulk entry."""
+        fields: Dict[str, Any] = {'labels': [label]}
+        priority = PRIORITY_NAMES.get(str(ticket.get('priority') or '').lower())
+        if priority:
+            fields['priority'] = {'name': priority}
+        account_id = self._resolve_assignee(ticket.get('assignee'))
+        if account_id:
+            fields['assignee'] = {'accountId': account_id}
+        if parent_key:
+            fields['parent'] = {'key': parent_key}
+        return {
+            'summary': ticket.get('summary', '')[:255],
+            'description': ticket.get('description', ''),
+            'issue_type': issue_type,
+            'fields': fields
+        }
+
+    def _find_existing(self, project_key: str, labels: List[str]) -> Dict[str, str]:
+        """Map idempotency labels to the keys of tickets that already carry them."""
+        wanted = set(labels)
+        found = {}
+        for start in range(0, len(labels), LABEL_LOOKUP_BATCH):
+            batch = labels[start:start + LABEL_LOOKUP_BATCH]
+            quoted = ', '.join(f'"{label}"' for label in batch)
+            jql = f'project = "{project_key}" AND labels in ({quoted})'
+            for issue in self.jira.iter_issues(jql, fields=['labels']):
+                for label in issue.get('fields', {}).get('labels', []) or []:
+                    if label in wanted:
+                        found.setdefault(label, issue['key'])
+        return found
+
+    def _resolve_assignee(self, name: Optional[str]) -> Optional[str]:
+        """Account ID for a suggested assignee name, cached; None if unknown."""
+        if not name or str(name).strip().lower() in ('null', 'none', 'unassigned'):
+            return None
+        name = str(name).strip()
+        if name not in self._account_ids:
+            try:
+                users = self.jira.search_users(name)
+            except Exception:
+                users = []
+            self._account_ids[name] = users[0].get('accountId') if users else None
+        return self._account_ids[name]